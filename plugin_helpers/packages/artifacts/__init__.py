@@ -0,0 +1,3 @@
+# ../artifacts/__init__.py
+
+"""The artifacts package provides the stages used to build release files."""
@@ -0,0 +1,548 @@
+# ../artifacts/archives.py
+
+"""Writes a release to several archive formats while reading files once.
+
+Each archive is written by its own thread.  Every source file is read a
+single time, and its chunks are passed to each of the threads, so adding
+formats adds compression work but no additional reads.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import tarfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor, wait
+from io import BytesIO
+from os import SEEK_CUR, fstat, stat_result
+from queue import Queue
+from stat import S_IMODE
+from struct import pack, unpack
+from time import localtime
+from typing import NamedTuple
+from zipfile import (
+    ZIP64_LIMIT,
+    ZIP_DEFLATED,
+    ZIP_STORED,
+    BadZipFile,
+    LargeZipFile,
+    ZipInfo,
+)
+
+# Site-package
+from path import Path
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the supported archive formats with the tarfile mode for each
+ARCHIVE_FORMATS = {
+    "zip": None,
+    "tar.gz": "w:gz",
+    "tar.bz2": "w:bz2",
+    "tar.xz": "w:xz",
+}
+
+# Store the chunk size to read files with
+_CHUNK_SIZE = 1024 * 1024
+
+# Store the number of chunks each writer can fall behind the reader
+_QUEUE_SIZE = 16
+
+# Store the signature, layout, and size of a zip member's local header
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+_LOCAL_HEADER_FORMAT = "<4s2B4HL2L2H"
+_LOCAL_HEADER_SIZE = 30
+
+# Store the signature and layout of a member's central directory entry
+_CENTRAL_SIGNATURE = b"PK\x01\x02"
+_CENTRAL_FORMAT = "<4s4B4HL2L5H2L"
+
+# Store the signatures and layouts of the records ending the archive
+_END_SIGNATURE = b"PK\x05\x06"
+_END_FORMAT = "<4s4H2LH"
+_ZIP64_END_SIGNATURE = b"PK\x06\x06"
+_ZIP64_END_FORMAT = "<4sQ2H2L4Q"
+_ZIP64_END_SIZE = 44
+_ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+_ZIP64_LOCATOR_FORMAT = "<4sLQL"
+
+# Store the id of the extra field holding a member's 64-bit values
+_ZIP64_EXTRA = 0x0001
+
+# Store the value of 32-bit fields whose values are in the zip64 records
+_ZIP64_MARKER = 0xFFFFFFFF
+_ZIP64_COUNT_MARKER = 0xFFFF
+
+# Store the versions needed to extract members, with and without zip64
+_VERSION = 20
+_ZIP64_VERSION = 45
+
+# Store the flag marking a member's name as UTF-8
+_UTF8_FLAG = 0x800
+
+# Store the MS-DOS attribute zip files use to mark directories
+_MSDOS_DIRECTORY = 0x10
+
+# Store the event that marks the end of the release
+_END = object()
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _Member(NamedTuple):
+    """Stores a member passed to the writers.
+
+    The chunks of a file's contents follow it when size is not None.
+    compressed is None or the CRC and deflated contents of the file.
+    """
+
+    name: str
+    file_stat: stat_result
+    size: int | None = None
+    compressed: tuple | None = None
+
+    def is_dir(self):
+        """Return whether the member is a directory."""
+        return self.name.endswith("/")
+
+
+class ReleaseArchives:
+    """Writes the same members to each of the given archive paths.
+
+    Each path's format is taken from its extension, which must be one of
+    ARCHIVE_FORMATS.  Use as a context manager, which waits for every
+    archive to finish and raises the first error any writer had.
+    """
+
+    def __init__(self, paths):
+        """Store the archives to write."""
+        self.paths = [Path(x) for x in paths]
+        self.names = set()
+        self.needs_contents = any(
+            get_archive_format(x) != "zip" for x in self.paths
+        )
+        self.bytes_read = 0
+        self._queues = []
+        self._futures = []
+        self._executor = None
+
+    def __enter__(self):
+        """Start a writer thread for each archive."""
+        self._executor = ThreadPoolExecutor(max_workers=len(self.paths))
+        for path in self.paths:
+            archive_format = get_archive_format(path)
+            queue = Queue(maxsize=_QUEUE_SIZE)
+            self._queues.append(queue)
+            self._futures.append(
+                self._executor.submit(
+                    _run_writer, archive_format, path, _Events(queue),
+                ),
+            )
+        return self
+
+    def __exit__(self, exc_type, *args):
+        """Wait for every archive to be written."""
+        self._put(_END)
+        self._executor.shutdown()
+
+        # Let the original error surface over any the writers then raised
+        if exc_type is not None:
+            wait(self._futures)
+            return
+        for future in self._futures:
+            future.result()
+
+    def add_directory(self, name, path):
+        """Add a directory entry, using the given directory's attributes."""
+        if name in self.names:
+            return
+        self.names.add(name)
+        self._put(_Member(name, Path(path).stat()))
+
+    def add_file(self, name, path, contents=None, compressed=None):
+        """Add the file, or the given contents in place of the file's.
+
+        compressed can be the CRC and deflated contents of the file, which
+        zip archives then store without compressing the file again.  The
+        file is then only read if there are other archive formats.
+        """
+        self.names.add(name)
+
+        # Can the file be added without reading it?
+        if compressed is not None and not self.needs_contents:
+            self._put(_Member(name, Path(path).stat(), compressed=compressed))
+            return
+
+        # Are the file's contents already known?
+        if contents is not None:
+            self._put(
+                _Member(name, Path(path).stat(), len(contents), compressed),
+            )
+            if contents:
+                self._put(contents)
+            return
+
+        # Read the file once, passing each chunk to every archive
+        with Path(path).open("rb") as open_file:
+            file_stat = fstat(open_file.fileno())
+            size = file_stat.st_size
+            self._put(_Member(name, file_stat, size, compressed))
+            remaining = size
+            while remaining:
+                chunk = open_file.read(min(remaining, _CHUNK_SIZE))
+                if not chunk:
+                    msg = f'"{path}" changed while it was being read'
+                    raise OSError(msg)
+                self._put(chunk)
+                remaining -= len(chunk)
+
+        self.bytes_read += size
+
+    def _put(self, event):
+        """Pass the given event to every archive's writer."""
+        for queue in self._queues:
+            queue.put(event)
+
+
+class ZipWriter:
+    """Writes a zip archive, including members that are already compressed.
+
+    zipfile can only add a member by compressing it itself, so members are
+    written here, with ZipInfo only describing them.  Use as a context
+    manager, which writes the central directory once every member was added.
+    """
+
+    def __init__(self, path):
+        """Store the archive to write."""
+        self.path = Path(path)
+        self.infos = {}
+        self.comment = b""
+        self._file = None
+
+    def __enter__(self):
+        """Open the archive."""
+        self._file = self.path.open("wb")
+        return self
+
+    def __exit__(self, exc_type, *args):
+        """Write the central directory, unless a member failed, and close."""
+        try:
+            if exc_type is None:
+                self._write_central_directory()
+        finally:
+            self._file.close()
+
+    def tell(self):
+        """Return the offset the next member will be written at."""
+        return self._file.tell()
+
+    def writestr(self, info, data):
+        """Add the given bytes as a member."""
+        info.file_size = len(data)
+        self.write_stream(info, BytesIO(data))
+
+    def write_stream(self, info, open_file):
+        """Add the contents read from the open file as a member.
+
+        The contents are compressed with info.compress_type, which must be
+        ZIP_STORED or ZIP_DEFLATED, and info.file_size must be their size.
+        """
+        if info.compress_type not in (ZIP_STORED, ZIP_DEFLATED):
+            msg = f'Unsupported compression for "{info.filename}"'
+            raise ValueError(msg)
+        compressor = None
+        if info.compress_type == ZIP_DEFLATED:
+            compressor = zlib.compressobj(
+                zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS,
+            )
+
+        # Write the header, which is rewritten once the CRC is known
+        zip64 = info.file_size > ZIP64_LIMIT
+        info.CRC = info.compress_size = 0
+        self._write_header(info, zip64=zip64)
+        start = self._file.tell()
+
+        # Write the contents, compressing them if needed
+        crc = size = 0
+        while chunk := open_file.read(_CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            self._file.write(
+                chunk if compressor is None else compressor.compress(chunk),
+            )
+        if compressor is not None:
+            self._file.write(compressor.flush())
+        end = self._file.tell()
+
+        if size != info.file_size:
+            msg = f'"{info.filename}" changed while it was being written'
+            raise OSError(msg)
+        info.CRC = crc
+        info.compress_size = end - start
+        if not zip64 and info.compress_size > ZIP64_LIMIT:
+            msg = f'"{info.filename}" compressed to more than 2 GiB'
+            raise LargeZipFile(msg)
+
+        # Rewrite the header with the CRC and compressed size
+        self._file.seek(info.header_offset)
+        self._write_header(info, zip64=zip64)
+        self._file.seek(end)
+
+    def write_compressed(self, info, crc, data):
+        """Add data already compressed with info.compress_type as a member.
+
+        info.file_size must be the size of the uncompressed data.
+        """
+        info.CRC = crc
+        info.compress_size = len(data)
+        self._write_header(
+            info, zip64=max(info.file_size, info.compress_size) > ZIP64_LIMIT,
+        )
+        self._file.write(data)
+
+    def _write_header(self, info, *, zip64):
+        """Write the member's local header at the current offset."""
+        info.header_offset = self._file.tell()
+        self.infos[info.filename] = info
+        name, flags = _encode_name(info.filename)
+        sizes, extra = (info.compress_size, info.file_size), b""
+        if zip64:
+            sizes = (_ZIP64_MARKER, _ZIP64_MARKER)
+            extra = pack(
+                "<2H2Q", _ZIP64_EXTRA, 16, info.file_size, info.compress_size,
+            )
+        self._file.write(
+            pack(
+                _LOCAL_HEADER_FORMAT, _LOCAL_HEADER_SIGNATURE,
+                _ZIP64_VERSION if zip64 else _VERSION, 0, flags,
+                info.compress_type, *_get_dos_time(info.date_time), info.CRC,
+                *sizes, len(name), len(extra),
+            ) + name + extra,
+        )
+
+    def _write_central_directory(self):
+        """Write the central directory and the records that end the zip."""
+        start = self._file.tell()
+        for info in self.infos.values():
+            name, flags = _encode_name(info.filename)
+
+            # Move the values too large for their fields to the extra field
+            values = (info.file_size, info.compress_size, info.header_offset)
+            large = [x for x in values if x > ZIP64_LIMIT]
+            extra = pack(
+                f"<2H{len(large)}Q", _ZIP64_EXTRA, 8 * len(large), *large,
+            ) if large else b""
+            file_size, compress_size, header_offset = (
+                _ZIP64_MARKER if x > ZIP64_LIMIT else x for x in values
+            )
+
+            version = _ZIP64_VERSION if large else _VERSION
+            self._file.write(
+                pack(
+                    _CENTRAL_FORMAT, _CENTRAL_SIGNATURE, version,
+                    info.create_system, version, 0, flags, info.compress_type,
+                    *_get_dos_time(info.date_time), info.CRC, compress_size,
+                    file_size, len(name), len(extra), 0, 0, 0,
+                    info.external_attr, header_offset,
+                ) + name + extra,
+            )
+        end = self._file.tell()
+
+        # Does the central directory need the zip64 records?
+        count, size, offset = len(self.infos), end - start, start
+        if (
+            count > _ZIP64_COUNT_MARKER
+            or max(size, offset) > ZIP64_LIMIT
+        ):
+            self._file.write(
+                pack(
+                    _ZIP64_END_FORMAT, _ZIP64_END_SIGNATURE, _ZIP64_END_SIZE,
+                    _ZIP64_VERSION, _ZIP64_VERSION, 0, 0, count, count, size,
+                    offset,
+                ) + pack(
+                    _ZIP64_LOCATOR_FORMAT, _ZIP64_LOCATOR_SIGNATURE, 0, end, 1,
+                ),
+            )
+            count = min(count, _ZIP64_COUNT_MARKER)
+            size, offset = min(size, _ZIP64_MARKER), min(offset, _ZIP64_MARKER)
+
+        self._file.write(
+            pack(
+                _END_FORMAT, _END_SIGNATURE, 0, 0, count, count, size, offset,
+                len(self.comment),
+            ) + self.comment,
+        )
+
+
+class _Events:
+    """Iterates over the events passed to a writer."""
+
+    def __init__(self, queue):
+        """Store the queue to take events from."""
+        self.queue = queue
+        self.finished = False
+
+    def __iter__(self):
+        """Return the events, stopping at the end of the release."""
+        return self
+
+    def __next__(self):
+        """Return the next event."""
+        event = self.queue.get()
+        if event is _END:
+            self.finished = True
+            raise StopIteration
+        return event
+
+
+class _ChunkReader:
+    """A file object that reads a member's chunks from a writer's events."""
+
+    def __init__(self, events, size):
+        """Store the events and the number of bytes they hold."""
+        self.events = events
+        self.remaining = size
+        self.chunk = b""
+        self.position = 0
+
+    def read(self, size=-1):
+        """Return the given number of bytes, unless the member ends first."""
+        if size < 0:
+            size = self.remaining + len(self.chunk) - self.position
+
+        pieces = []
+        while size:
+
+            # Get the member's next chunk once the current one is used up
+            if self.position == len(self.chunk):
+                if not self.remaining:
+                    break
+                try:
+                    self.chunk = next(self.events)
+                except StopIteration:
+                    msg = "member ended early"
+                    raise EOFError(msg) from None
+                self.remaining -= len(self.chunk)
+                self.position = 0
+
+            piece = self.chunk[self.position:self.position + size]
+            self.position += len(piece)
+            size -= len(piece)
+            pieces.append(piece)
+
+        return b"".join(pieces)
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_archive_format(path):
+    """Return the format of the archive at the given path."""
+    for archive_format in ARCHIVE_FORMATS:
+        if str(path).endswith("." + archive_format):
+            return archive_format
+    msg = f'Unsupported archive format for "{path}"'
+    raise ValueError(msg)
+
+
+def read_compressed(open_file, header_offset, compress_size):
+    """Return a member's compressed data, given its local header's offset."""
+    open_file.seek(header_offset)
+    header = open_file.read(_LOCAL_HEADER_SIZE)
+    if header[:4] != _LOCAL_HEADER_SIGNATURE:
+        msg = f"No member found at offset {header_offset}"
+        raise BadZipFile(msg)
+
+    # Skip the member's name and extra field
+    name_length, extra_length = unpack("<HH", header[26:30])
+    open_file.seek(name_length + extra_length, SEEK_CUR)
+    return open_file.read(compress_size)
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _encode_name(name):
+    """Return the member's encoded name and the flags it needs."""
+    try:
+        return name.encode("ascii"), 0
+    except UnicodeEncodeError:
+        return name.encode(), _UTF8_FLAG
+
+
+def _get_dos_time(date_time):
+    """Return the MS-DOS time and date zip headers store."""
+    year, month, day, hour, minute, second = date_time
+    return (
+        hour << 11 | minute << 5 | second // 2,
+        (year - 1980) << 9 | month << 5 | day,
+    )
+
+
+def _run_writer(archive_format, path, events):
+    """Write the archive, always taking every event given to it."""
+    try:
+        if archive_format == "zip":
+            _write_zip(path, events)
+        else:
+            _write_tar(path, events, ARCHIVE_FORMATS[archive_format])
+
+    # Keep taking events after an error, so the reader is never blocked
+    finally:
+        if not events.finished:
+            for _event in events:
+                pass
+
+
+def _write_zip(path, events):
+    """Write the events to a zip archive."""
+    with ZipWriter(path) as zip_file:
+        for member in events:
+            info = ZipInfo(
+                member.name, localtime(member.file_stat.st_mtime)[:6],
+            )
+            info.external_attr = (member.file_stat.st_mode & 0xFFFF) << 16
+
+            # Is this a directory entry?
+            if member.is_dir():
+                info.external_attr |= _MSDOS_DIRECTORY
+                zip_file.writestr(info, b"")
+                continue
+
+            # Get the file's contents, which can follow compressed files
+            reader = _ChunkReader(events, member.size or 0)
+            info.compress_type = ZIP_DEFLATED
+
+            # Was the file already compressed?
+            if member.compressed is not None:
+                info.file_size = member.file_stat.st_size
+                zip_file.write_compressed(info, *member.compressed)
+                while reader.read(_CHUNK_SIZE):
+                    pass
+                continue
+
+            # Stream the file's chunks into the archive
+            info.file_size = member.size
+            zip_file.write_stream(info, reader)
+
+
+def _write_tar(path, events, mode):
+    """Write the events to a compressed tar archive."""
+    with tarfile.open(path, mode) as tar_file:
+        for member in events:
+            info = tarfile.TarInfo(member.name)
+            info.mode = S_IMODE(member.file_stat.st_mode)
+            info.mtime = int(member.file_stat.st_mtime)
+
+            # Is this a directory entry?
+            if member.is_dir():
+                info.type = tarfile.DIRTYPE
+                tar_file.addfile(info)
+                continue
+
+            # Stream the file's chunks into the archive
+            info.size = member.size
+            tar_file.addfile(info, _ChunkReader(events, member.size))
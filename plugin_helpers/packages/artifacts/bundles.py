@@ -0,0 +1,193 @@
+# ../artifacts/bundles.py
+
+"""Combines plugin releases into a single bundle with an index of members.
+
+Members are copied from each release without being decompressed, and a
+member shared by several plugins (such as a directory entry, or the same
+file at the same path) is only stored once.  The bundle's last member is a
+JSON index mapping each plugin to the offsets of its members, and the
+bundle's comment holds the index's offset and size.  A single plugin can
+then be extracted by seeking straight to its members, without reading the
+bundle's central directory.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import zlib
+from json import dumps, loads
+from os import SEEK_END
+from struct import unpack
+from time import localtime
+from zipfile import ZIP_DEFLATED, ZIP_STORED, BadZipFile, ZipFile, ZipInfo
+
+# Package
+from artifacts.archives import ZipWriter, read_compressed
+from common.functions import get_temp_path, move_into_place
+
+# Site-package
+from path import Path
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the name of the bundle's index member
+INDEX_NAME = "plugin_bundle.json"
+
+# Store the start of the bundle's comment, which is followed by the index's
+#   offset and size
+_COMMENT_PREFIX = b"plugin_bundle_index="
+
+# Store the signature of the end of central directory record
+_END_SIGNATURE = b"PK\x05\x06"
+
+# Store the size of the end of central directory record, without comment
+_END_SIZE = 22
+
+# Store the maximum length of a zip comment
+_MAX_COMMENT_LENGTH = 0xFFFF
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def write_bundle(bundle_path, releases):
+    """Write the bundle and return a list of the problems found.
+
+    releases maps each plugin name to its version and release zip.  Each
+    plugin's index entry lists its members as [name, header offset,
+    compressed size, size, CRC, compression type].
+    """
+    problems = []
+    plugins = {}
+    with ZipWriter(bundle_path) as bundle:
+        for plugin_name, (version, zip_path) in releases.items():
+            members = []
+            with ZipFile(zip_path) as release, Path(zip_path).open(
+                "rb",
+            ) as open_file:
+                for info in release.infolist():
+
+                    # Is the member not yet in the bundle?
+                    stored = bundle.infos.get(info.filename)
+                    if stored is None:
+                        stored = ZipInfo(info.filename, info.date_time)
+                        stored.external_attr = info.external_attr
+                        stored.compress_type = info.compress_type
+                        stored.file_size = info.file_size
+                        bundle.write_compressed(
+                            stored, info.CRC, read_compressed(
+                                open_file, info.header_offset,
+                                info.compress_size,
+                            ),
+                        )
+
+                    # Does another plugin have a different file at this path?
+                    elif (stored.CRC, stored.file_size) != (
+                        info.CRC, info.file_size,
+                    ):
+                        problems.append(
+                            f'"{info.filename}" in {plugin_name} differs from '
+                            "the file of another plugin at the same path",
+                        )
+                        continue
+
+                    members.append([
+                        stored.filename, stored.header_offset,
+                        stored.compress_size, stored.file_size, stored.CRC,
+                        stored.compress_type,
+                    ])
+
+            plugins[plugin_name] = {"version": version, "members": members}
+
+        # Add the index and store its offset and size in the bundle's comment
+        info = ZipInfo(INDEX_NAME, localtime()[:6])
+        bundle.writestr(
+            info, dumps({"plugins": plugins}, separators=(",", ":")).encode(),
+        )
+        bundle.comment = (
+            _COMMENT_PREFIX
+            + f"{info.header_offset},{info.compress_size}".encode()
+        )
+
+    return problems
+
+
+def read_bundle_index(open_file):
+    """Return the index of the given open bundle."""
+    # Find the end of central directory record, which ends with the comment
+    size = open_file.seek(0, SEEK_END)
+    tail_size = min(size, _END_SIZE + _MAX_COMMENT_LENGTH)
+    open_file.seek(size - tail_size)
+    tail = open_file.read(tail_size)
+    position = tail.rfind(_END_SIGNATURE)
+    if position == -1:
+        msg = "Not a zip file"
+        raise BadZipFile(msg)
+
+    # Get the index's offset and size from the comment
+    comment_length = unpack("<H", tail[position + 20:position + 22])[0]
+    comment = tail[position + _END_SIZE:position + _END_SIZE + comment_length]
+    if not comment.startswith(_COMMENT_PREFIX):
+        msg = "Not a plugin bundle"
+        raise BadZipFile(msg)
+    try:
+        offset, compress_size = map(
+            int, comment.removeprefix(_COMMENT_PREFIX).split(b","),
+        )
+    except ValueError:
+        msg = "Invalid plugin bundle comment"
+        raise BadZipFile(msg) from None
+
+    # Read the index, which is not compressed
+    return loads(read_compressed(open_file, offset, compress_size))
+
+
+def extract_plugin(bundle_path, plugin_name, dest):
+    """Extract the plugin's members from the bundle into the destination.
+
+    Returns the version of the plugin that was extracted.
+    """
+    dest = Path(dest)
+    with Path(bundle_path).open("rb") as open_file:
+        plugin = read_bundle_index(open_file)["plugins"].get(plugin_name)
+        if plugin is None:
+            msg = f'"{plugin_name}" is not in the bundle'
+            raise KeyError(msg)
+
+        for name, offset, compress_size, size, crc, compress_type in (
+            plugin["members"]
+        ):
+
+            # Is the member outside of the destination?
+            parts = name.rstrip("/").split("/")
+            if name.startswith("/") or ".." in parts:
+                continue
+
+            path = dest.joinpath(*parts)
+
+            # Is the member a directory?
+            if name.endswith("/"):
+                path.makedirs_p()
+                continue
+
+            # Read the member straight from its offset
+            data = read_compressed(open_file, offset, compress_size)
+            if compress_type == ZIP_DEFLATED:
+                data = zlib.decompress(data, -zlib.MAX_WBITS)
+            elif compress_type != ZIP_STORED:
+                msg = f'Unsupported compression for "{name}"'
+                raise BadZipFile(msg)
+
+            if len(data) != size or zlib.crc32(data) != crc:
+                msg = f'"{name}" does not match its size and CRC'
+                raise BadZipFile(msg)
+
+            # Write to a temporary name and move it into place
+            path.parent.makedirs_p()
+            temp = get_temp_path(path)
+            temp.write_bytes(data)
+            move_into_place(temp, path)
+
+    return plugin["version"]
@@ -0,0 +1,100 @@
+# ../artifacts/bytecode.py
+
+"""Compiles a release's Python files to bytecode for a target interpreter."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from json import dumps, loads
+from os import cpu_count
+from subprocess import run
+from sys import executable
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the supported ways the server can tell if bytecode is out of date
+INVALIDATION_MODES = (
+    "checked-hash",
+    "unchecked-hash",
+    "timestamp",
+)
+
+# Store the script the target interpreter executes to compile its files
+#   Each job is the source file, the member name of the source file, and
+#   the directory to write the member's __pycache__ directory in.
+#   Bytecode is always written to the name the server imports without
+#   optimization, so optimize=2 strips docstrings from what is loaded.
+_COMPILE_SCRIPT = """
+import json, py_compile, sys
+from pathlib import Path, PurePosixPath
+optimize, mode, jobs = json.load(sys.stdin)
+tag = sys.implementation.cache_tag
+compiled = []
+for source, member, output in jobs:
+    member = PurePosixPath(member)
+    pyc = member.parent / "__pycache__" / f"{member.stem}.{tag}.pyc"
+    cfile = Path(output, *pyc.parts)
+    py_compile.compile(
+        source, cfile=str(cfile), dfile=str(member), doraise=True,
+        optimize=optimize,
+        invalidation_mode=py_compile.PycInvalidationMode[mode],
+    )
+    compiled.append([str(pyc), str(cfile)])
+json.dump(compiled, sys.stdout)
+"""
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def compile_bytecode(
+    sources, output_path, python=None, *, optimize=0, mode="checked-hash",
+):
+    """Compile the given sources and return their bytecode members.
+
+    sources is a list of (source file, member name) pairs.  Compiling is
+    split across one target interpreter process per CPU.  The return value
+    is a list of (member name, compiled file) pairs, or None if any of the
+    sources could not be compiled.
+    """
+    jobs = [
+        (str(source), member, str(output_path)) for source, member in sources
+    ]
+    workers = min(len(jobs), cpu_count() or 1)
+    if not workers:
+        return []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(
+            executor.map(
+                partial(
+                    _compile_jobs, python or executable, optimize,
+                    mode.replace("-", "_").upper(),
+                ),
+                [jobs[x::workers] for x in range(workers)],
+            ),
+        )
+
+    if None in results:
+        return None
+    return [tuple(x) for result in results for x in result]
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _compile_jobs(python, optimize, mode, jobs):
+    """Compile the given jobs in the target interpreter."""
+    process = run(
+        [python, "-c", _COMPILE_SCRIPT],
+        input=dumps([optimize, mode, jobs]), capture_output=True, text=True,
+        check=False,
+    )
+    if process.returncode:
+        print(process.stderr)
+        return None
+    return loads(process.stdout)
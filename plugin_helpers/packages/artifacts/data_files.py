@@ -0,0 +1,238 @@
+# ../artifacts/data_files.py
+
+"""Validates and minifies the data files included in releases.
+
+Every data file is parsed with the strictest parser for its type, so a
+malformed file fails the release instead of failing on a live server.
+JSON and XML files can also be minified, which shrinks the release and the
+time servers spend parsing the files.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import re
+from itertools import repeat
+from json import dumps, loads
+from typing import NamedTuple
+from xml.etree.ElementTree import ParseError, fromstring, tostring
+
+# Package
+from common.pools import map_in_processes
+
+# Site-package
+from configobj import ConfigObj, ConfigObjError
+from path import Path
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the extensions of the data files that are validated
+DATA_EXTENSIONS = ("ini", "json", "vdf", "xml")
+
+# Store the expression used to split VDF (KeyValues) files into tokens
+_vdf_token = re.compile(
+    r'(?P<space>\s+)|(?P<comment>//[^\n]*)|"(?P<quoted>(?:[^"\\\n]|\\.)*)"'
+    r'|(?P<brace>[{}])|(?P<condition>\[[^\]\n]*\])|(?P<word>[^\s"{}\[\]]+)',
+)
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class DataFile(NamedTuple):
+    """Stores the result of validating a data file."""
+
+    name: str
+    problem: str | None
+    minified: bytes | None
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def check_data_files(files, *, minify=False):
+    """Return the DataFile of each of the given data files.
+
+    files maps each member name to the file's path.  Large sets of files
+    are parsed in parallel, one process per CPU.
+    """
+    names = list(files)
+    paths = [Path(files[x]) for x in names]
+    return map_in_processes(
+        _check_data_file, names, paths, list(repeat(minify, len(names))),
+        size=sum(x.size for x in paths),
+    )
+
+
+def check_data_file(name, path, *, minify=False):
+    """Parse the data file and return its DataFile.
+
+    When minify is True and the file is JSON or XML, the minified contents
+    are included if they are smaller than the file.
+    """
+    contents = Path(path).read_bytes()
+    extension = name.rsplit(".", 1)[-1].lower()
+    try:
+        data = _parsers[extension](contents)
+    except (ConfigObjError, ParseError, UnicodeDecodeError, ValueError) as e:
+        return DataFile(name, f'"{name}" is not valid: {e}', None)
+
+    # Should the file be minified?
+    minifier = _minifiers.get(extension)
+    if not minify or minifier is None:
+        return DataFile(name, None, None)
+
+    minified = minifier(data, contents)
+    if minified is not None and len(minified) >= len(contents):
+        minified = None
+    return DataFile(name, None, minified)
+
+
+def parse_vdf(text):
+    """Return the nested sections of the given VDF (KeyValues) text.
+
+    Raises ValueError for unbalanced braces, unterminated strings, and keys
+    without values.  Keys that appear more than once keep their last value.
+    """
+    stack = [{}]
+    key = None
+    position = 0
+    while position < len(text):
+        match = _vdf_token.match(text, position)
+        line = text.count("\n", 0, position) + 1
+        if match is None:
+            problem = "unterminated string" if text[position] == '"' else (
+                "unexpected character"
+            )
+            msg = f"{problem} on line {line}"
+            raise ValueError(msg)
+        position = match.end()
+
+        # Are comments, whitespace, and platform conditions to be skipped?
+        if match.lastgroup in ("space", "comment", "condition"):
+            continue
+
+        # Is this the start of a section?
+        if match.group("brace") == "{":
+            if key is None:
+                msg = f"section without a name on line {line}"
+                raise ValueError(msg)
+            section = {}
+            stack[-1][key] = section
+            stack.append(section)
+            key = None
+
+        # Is this the end of a section?
+        elif match.group("brace") == "}":
+            if key is not None:
+                msg = f'key "{key}" without a value on line {line}'
+                raise ValueError(msg)
+            if len(stack) == 1:
+                msg = f'unexpected "}}" on line {line}'
+                raise ValueError(msg)
+            stack.pop()
+
+        # Is this a key?
+        elif key is None:
+            key = match.group(match.lastgroup)
+
+        # Is this the key's value?
+        else:
+            stack[-1][key] = match.group(match.lastgroup)
+            key = None
+
+    if key is not None:
+        msg = f'key "{key}" without a value at the end of the file'
+        raise ValueError(msg)
+    if len(stack) > 1:
+        msg = f'{len(stack) - 1} sections are missing their "}}"'
+        raise ValueError(msg)
+    return stack[0]
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _check_data_file(name, path, minify):
+    """Call check_data_file, as process pools cannot pass keywords."""
+    return check_data_file(name, path, minify=minify)
+
+
+def _parse_ini(contents):
+    """Parse the ConfigObj file, raising on any error."""
+    return ConfigObj(
+        contents.decode("utf-8-sig").splitlines(), raise_errors=True,
+    )
+
+
+def _parse_json(contents):
+    """Parse the JSON file, raising on duplicate keys and NaN or Infinity."""
+    return loads(
+        contents.decode("utf-8"),
+        object_pairs_hook=_reject_duplicate_keys,
+        parse_constant=_reject_constant,
+    )
+
+
+def _parse_vdf(contents):
+    """Parse the VDF file, raising on any error."""
+    return parse_vdf(contents.decode("utf-8-sig"))
+
+
+def _minify_json(data, _contents):
+    """Return the JSON data without any whitespace."""
+    return dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _minify_xml(root, contents):
+    """Return the XML without whitespace between elements or comments."""
+    # Are document type declarations or namespaces, which ElementTree
+    #   cannot write back unchanged, used?
+    if b"<!DOCTYPE" in contents or b"xmlns" in contents:
+        return None
+
+    # Remove the whitespace between elements (comments are not parsed)
+    #   Whitespace within elements without children is their value.
+    for element in root.iter():
+        if (
+            element.text is not None and not element.text.strip()
+            and len(element)
+        ):
+            element.text = None
+        if element.tail is not None and not element.tail.strip():
+            element.tail = None
+    return tostring(root, encoding="utf-8", xml_declaration=True)
+
+
+def _reject_duplicate_keys(pairs):
+    """Return the JSON object's pairs as a dictionary, unless keys repeat."""
+    data = dict(pairs)
+    if len(data) != len(pairs):
+        keys = [x for x, _ in pairs]
+        duplicates = sorted({x for x in keys if keys.count(x) > 1})
+        msg = f"duplicate keys {', '.join(duplicates)}"
+        raise ValueError(msg)
+    return data
+
+
+def _reject_constant(name):
+    """Raise for NaN and Infinity, which are not valid JSON."""
+    msg = f"{name} is not valid JSON"
+    raise ValueError(msg)
+
+
+# Store the parser for each data file extension
+_parsers = {
+    "ini": _parse_ini,
+    "json": _parse_json,
+    "vdf": _parse_vdf,
+    "xml": fromstring,
+}
+
+# Store the minifier for each data file extension that can be minified
+_minifiers = {
+    "json": _minify_json,
+    "xml": _minify_xml,
+}
@@ -0,0 +1,182 @@
+# ../artifacts/fastdl.py
+
+"""Mirrors the downloadable assets of released plugins into a FastDL tree.
+
+Servers send clients their custom materials, models, and sounds through
+FastDL, which serves a bzip2 compressed copy of each file at the same path
+with .bz2 added.  Files are compressed in parallel threads, and the
+manifest in the FastDL directory records the hash each copy was compressed
+from, so files whose contents did not change are never compressed again.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import bz2
+from json import dumps, loads
+from shutil import copyfileobj
+from typing import NamedTuple
+
+# Package
+from common.asset_store import ASSET_DIRECTORIES
+from common.functions import get_temp_path, move_into_place
+from common.locks import directory_lock
+from common.pools import map_in_threads
+
+# Site-package
+from path import Path
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the name of the manifest within the FastDL directory
+MANIFEST_NAME = "fastdl_manifest.json"
+
+# Store the compression level, as files are compressed once and served often
+_COMPRESS_LEVEL = 9
+
+# Store the chunk size to use when compressing files
+_CHUNK_SIZE = 1024 * 1024
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class FastDLResult(NamedTuple):
+    """Stores what updating a plugin's FastDL files did."""
+
+    compressed: int
+    unchanged: int
+    removed: int
+    size: int
+    compressed_size: int
+    conflicts: tuple
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def is_downloadable(name):
+    """Return whether the plugin's file is served to clients by FastDL."""
+    return name.split("/", 1)[0] in ASSET_DIRECTORIES and "/" in name
+
+
+def update_fastdl(fastdl_dir, plugin_name, plugin_path, files):
+    """Compress the plugin's changed files into the FastDL directory.
+
+    files maps each downloadable file (relative to the plugin) to the hash
+    of its contents.  Copies of the plugin's files that it no longer has
+    are removed, unless another plugin has the same file.  Files another
+    plugin has at the same path with different contents are left as they
+    are, and returned as conflicts.
+    """
+    fastdl_dir = Path(fastdl_dir)
+    with directory_lock(fastdl_dir):
+        manifest = load_manifest(fastdl_dir)
+        entries = manifest["files"]
+
+        # Get the files another plugin has with different contents
+        conflicts = tuple(sorted(
+            x for x, y in files.items()
+            if set(entries.get(x, {}).get("plugins", ())) - {plugin_name}
+            and entries[x]["hash"] != y
+        ))
+        files = {x: y for x, y in files.items() if x not in conflicts}
+
+        # Get the files whose contents changed since they were compressed
+        changed = [
+            x for x, y in files.items()
+            if entries.get(x, {}).get("hash") != y
+            or not fastdl_dir.joinpath(*f"{x}.bz2".split("/")).is_file()
+        ]
+
+        # Compress the changed files in parallel, as bz2 releases the GIL
+        sizes = map_in_threads(
+            compress_file,
+            [plugin_path.joinpath(*x.split("/")) for x in changed],
+            [fastdl_dir.joinpath(*f"{x}.bz2".split("/")) for x in changed],
+        )
+
+        for name, (size, compressed_size) in zip(changed, sizes, strict=True):
+            entries[name] = {
+                "plugins": entries.get(name, {}).get("plugins", []),
+                "hash": files[name],
+                "size": size,
+                "compressed_size": compressed_size,
+                "ratio": round(compressed_size / size, 4) if size else 1,
+            }
+
+        # Store which plugins have each of the files
+        for name in files:
+            if plugin_name not in entries[name]["plugins"]:
+                entries[name]["plugins"].append(plugin_name)
+
+        # Remove the copies of files no plugin has any longer
+        removed = []
+        for name, entry in list(entries.items()):
+            if name in files or plugin_name not in entry["plugins"]:
+                continue
+            entry["plugins"].remove(plugin_name)
+            if not entry["plugins"]:
+                fastdl_dir.joinpath(*f"{name}.bz2".split("/")).remove_p()
+                del entries[name]
+                removed.append(name)
+
+        _save_manifest(fastdl_dir, manifest)
+
+    return FastDLResult(
+        len(changed), len(files) - len(changed), len(removed),
+        sum(entries[x]["size"] for x in files),
+        sum(entries[x]["compressed_size"] for x in files), conflicts,
+    )
+
+
+def compress_file(source, destination):
+    """Write the bzip2 compressed file and return its size before and after.
+
+    The file is written to a temporary name and renamed once complete, so
+    clients never download a partly written file.
+    """
+    destination = Path(destination)
+    destination.parent.makedirs_p()
+    temp = get_temp_path(destination)
+    with (
+        Path(source).open("rb") as source_file,
+        bz2.open(temp, "wb", compresslevel=_COMPRESS_LEVEL) as open_file,
+    ):
+        copyfileobj(source_file, open_file, _CHUNK_SIZE)
+    move_into_place(temp, destination)
+    return Path(source).size, destination.size
+
+
+def load_manifest(fastdl_dir):
+    """Return the manifest of the files within the FastDL directory."""
+    manifest_path = Path(fastdl_dir) / MANIFEST_NAME
+    if manifest_path.is_file():
+        try:
+            return loads(manifest_path.read_text())
+        except ValueError:
+            pass
+    return {"files": {}}
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _save_manifest(fastdl_dir, manifest):
+    """Write the manifest, with the totals of every file, atomically."""
+    entries = manifest["files"]
+    manifest["size"] = sum(x["size"] for x in entries.values())
+    manifest["compressed_size"] = sum(
+        x["compressed_size"] for x in entries.values()
+    )
+    manifest["ratio"] = round(
+        manifest["compressed_size"] / manifest["size"], 4,
+    ) if manifest["size"] else 1
+
+    fastdl_dir.makedirs_p()
+    manifest_path = fastdl_dir / MANIFEST_NAME
+    temp = get_temp_path(manifest_path)
+    temp.write_text(dumps(manifest, indent=1, sort_keys=True))
+    move_into_place(temp, manifest_path)
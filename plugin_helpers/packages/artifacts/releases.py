@@ -0,0 +1,857 @@
+# ../artifacts/releases.py
+
+"""Creates a release for a plugin with its current version number."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from pathlib import PurePosixPath
+from tempfile import TemporaryDirectory
+from zipfile import ZIP_DEFLATED, ZipFile
+
+# Package
+from artifacts.archives import (
+    ARCHIVE_FORMATS,
+    ReleaseArchives,
+    read_compressed,
+)
+from artifacts.bytecode import INVALIDATION_MODES, compile_bytecode
+from artifacts.data_files import DATA_EXTENSIONS, check_data_files
+from artifacts.fastdl import is_downloadable, update_fastdl
+from artifacts.size_report import (
+    check_size_budgets,
+    format_size,
+    format_size_report,
+    get_size_report,
+    parse_size,
+)
+from artifacts.source_assets import (
+    ASSET_EXTENSIONS,
+    analyze_assets,
+    find_asset_problems,
+    format_texture_report,
+    get_wasted_bytes,
+)
+from artifacts.translations import compact_translation_file, index_plugin
+from artifacts.verification import verify_release
+from common.asset_store import (
+    get_blob_path,
+    get_compressed_blob,
+    update_store,
+)
+from common.constants import (
+    FASTDL_DIR,
+    SEMANTIC_VERSIONING_COUNT,
+    START_DIR,
+    allowed_filetypes,
+    exception_filetypes,
+    other_filetypes,
+    plugin_list,
+)
+from common.file_index import (
+    get_consumer_data,
+    get_dirty_files,
+    mark_clean,
+    refresh_index,
+)
+from common.functions import (
+    clear_screen,
+    get_plugin_flag,
+    get_plugin_list,
+    get_plugin_setting,
+    get_plugin_version,
+    get_release_path,
+    get_repo_files,
+    get_temp_path,
+    hash_file,
+    move_into_place,
+)
+from common.locks import plugin_lock, plugin_locked
+from common.metrics import measured, span
+from common.pools import map_in_threads
+
+# Site-package
+from configobj import ConfigObj
+from git import GitCommandError, Repo
+from path import Path
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+_info_path = "addons/source-python/plugins/gungame/plugins/custom/"
+
+_version_updates = {
+    1: "MAJOR",
+    2: "MINOR",
+    3: "PATCH",
+    4: None,
+}
+
+
+# =============================================================================
+# >> MAIN FUNCTION
+# =============================================================================
+@measured("release")
+@plugin_locked
+def create_release(plugin_name=None):
+    """Verify the plugin name and create the current release.
+
+    Returns whether the release was created.
+    """
+    # Was no plugin name provided?
+    if plugin_name not in plugin_list:
+        print(
+            f'Invalid plugin name "{plugin_name}"',
+        )
+        return False
+
+    # Get the plugin's base path
+    plugin_path = START_DIR / plugin_name
+
+    # Does the plugin not exist?
+    if not plugin_path.isdir():
+        print(
+            f'Plugin "{plugin_name}" not found.',
+        )
+        return False
+
+    # Get the files committed to the plugin's repository
+    repo_files = get_repo_files(plugin_path)
+    if repo_files is None:
+        return False
+
+    # Get the plugin's current version
+    version = get_plugin_version(plugin_name)
+
+    # Get the archives to write, which always start with the zip file
+    archive_paths = _get_archive_paths(plugin_name, version)
+    if archive_paths is None:
+        return False
+    zip_path = archive_paths[0]
+
+    # Write the archives to temporary names until the release is complete
+    temp_paths = [get_temp_path(x) for x in archive_paths]
+
+    # Get the committed files that should be included in the release
+    release_files = _find_release_files(plugin_name, plugin_path, repo_files)
+
+    # Were any of the included data files invalid?
+    with span("data_files") as phase:
+        data_files = _check_data_files(plugin_name, plugin_path, release_files)
+        phase.add(files=len(data_files))
+    problems = [x.problem for x in data_files if x.problem is not None]
+    if problems:
+        print(
+            f"Failed to create {plugin_name} version {version} release:\n"
+            + "\n".join(f"\t{problem}" for problem in problems),
+        )
+        return False
+
+    # Get the minified data files to write in place of the plugin's files
+    rewritten = {
+        x.name: x.minified for x in data_files if x.minified is not None
+    }
+
+    # Should the plugin's translation files be compacted?
+    if get_plugin_flag(plugin_name, "compact_translations"):
+        with span("translations"):
+            rewritten.update(
+                _compact_translations(plugin_name, plugin_path, release_files),
+            )
+
+    # Create the zip file
+    size_report, bytecode_files = _write_release(
+        temp_paths, plugin_name, plugin_path, release_files, rewritten,
+    )
+
+    # Print the release's sizes
+    print(
+        f"{plugin_name} version {version} release size:\n"
+        + format_size_report(size_report) + "\n",
+    )
+
+    # Did the release exceed any of its size budgets?
+    problems = check_size_budgets(
+        size_report, get_plugin_setting(plugin_name, "size_budgets", {}),
+    )
+
+    # Did the bytecode fail to compile?
+    if bytecode_files is None:
+        problems.append("Python files could not be compiled to bytecode")
+
+    # Should the release be verified against the repository?
+    elif not problems and get_plugin_flag(plugin_name, "verify_release"):
+        with span("verify"):
+            problems = verify_release(
+                temp_paths[0], plugin_path, release_files, bytecode_files,
+                rewritten=rewritten,
+            )
+
+    # Were there any problems with the release?
+    if problems:
+        for temp in temp_paths:
+            temp.remove_p()
+        print(
+            f"Failed to create {plugin_name} version {version} release:\n"
+            + "\n".join(f"\t{problem}" for problem in problems),
+        )
+
+    # Move the archives into place, the zip last, as it marks the release as
+    #   existing, then print a message that everything was successful
+    else:
+        for temp, archive_path in zip(
+            temp_paths[::-1], archive_paths[::-1], strict=True,
+        ):
+            move_into_place(temp, archive_path)
+        print(
+            f"Successfully created {plugin_name} version {version} release:\n"
+            + "".join(f'\t"{x}"\n' for x in archive_paths) + "\n",
+        )
+
+        # Record the release, so the next one can reuse its unchanged members
+        if get_plugin_flag(plugin_name, "use_file_index"):
+            mark_clean(
+                "release", plugin_name, archive=str(zip_path),
+                rewritten=sorted(rewritten),
+            )
+
+        # Mirror the plugin's materials, models, and sounds for FastDL
+        _update_fastdl(plugin_name, plugin_path, repo_files)
+
+    return not problems
+
+
+def release_plugin(plugin_name):
+    """Create the plugin's release, then push its version.
+
+    The version is only pushed once the release passed all of its checks,
+    so a failed release never publishes a version without its archives.
+    Returns whether the release was created and pushed.
+    """
+    if not create_release(plugin_name):
+        return False
+    with plugin_lock(plugin_name):
+        return _push_version(plugin_name)
+
+
+@plugin_locked
+def prepare_release(plugin_name, journal):
+    """Update the plugin's version, unless already done.
+
+    Returns whether the plugin is ready to be released.
+    """
+    # Was the new version written before the batch was interrupted?
+    if journal.is_interrupted(plugin_name, "version"):
+        _resume_version(plugin_name, journal)
+
+    # Does the plugin's version still need to be updated?
+    if not journal.is_done(plugin_name, "version") and not (
+        _validate_diff(plugin_name)
+        and _check_release_contents(plugin_name)
+        and _update_version(plugin_name, journal)
+    ):
+        return False
+
+    # Was the release interrupted while its archives were being written?
+    zip_path = get_release_path(
+        plugin_name, journal.get_data(plugin_name, "version")["version"],
+    )
+    if (
+        journal.is_interrupted(plugin_name, release_plugin.__name__)
+        and zip_path.parent.is_dir()
+    ):
+        for temp in zip_path.parent.files(f".tmp.*.{zip_path.stem}.*"):
+            temp.remove_p()
+
+    # Was the release created before the batch was interrupted?
+    if (
+        not journal.is_done(plugin_name, release_plugin.__name__)
+        and zip_path.is_file()
+    ):
+        print(f'Release already exists for "{plugin_name}" at "{zip_path}".')
+        if not _push_version(plugin_name):
+            return False
+        journal.complete(plugin_name, release_plugin.__name__)
+
+    return True
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _validate_diff(plugin_name):
+    """Validate that the plugin does not have outstanding changes."""
+    plugin_repo = START_DIR / plugin_name
+    repo = Repo(plugin_repo)
+    if str(repo.active_branch) != "master":
+        print(
+            f'"{plugin_name}" is not on "master" branch. '
+            f'On branch "{repo.active_branch}"',
+        )
+        return False
+    with span("diff"):
+        has_changes = bool(repo.index.diff(None))
+    if has_changes:
+        print(f'"{plugin_name}" has uncommitted changes')
+        return False
+    return True
+
+
+def _push_version(plugin_name):
+    """Push the plugin's commits that its remote does not have yet."""
+    repo = Repo(START_DIR / plugin_name)
+
+    # Does the remote already have every commit?
+    tracking = repo.active_branch.tracking_branch()
+    if tracking is not None and not any(
+        repo.iter_commits(f"{tracking}..{repo.active_branch}"),
+    ):
+        return True
+
+    try:
+        with span("push"):
+            repo.remotes.origin.push().raise_if_error()
+    except (GitCommandError, AttributeError) as error:
+        print(f'Failed to push "{plugin_name}":\n\t{error}')
+        return False
+    return True
+
+
+def _check_release_contents(plugin_name):
+    """Return whether the files the release would include are valid.
+
+    This runs before the version is updated, so an invalid file never
+    leaves a new version without its release.
+    """
+    plugin_path = START_DIR / plugin_name
+    repo_files = get_repo_files(plugin_path)
+    if repo_files is None:
+        return False
+
+    # Were any of the included data files invalid?
+    release_files = _find_release_files(plugin_name, plugin_path, repo_files)
+    with span("data_files") as phase:
+        data_files = _check_data_files(plugin_name, plugin_path, release_files)
+        phase.add(files=len(data_files))
+    problems = [x.problem for x in data_files if x.problem is not None]
+
+    # Should the included materials and models be analyzed?
+    if get_plugin_flag(plugin_name, "check_assets"):
+        problems.extend(
+            _check_assets(plugin_name, plugin_path, release_files),
+        )
+    if problems:
+        print(
+            f"Not releasing {plugin_name}, as its files are invalid:\n"
+            + "\n".join(f"\t{problem}" for problem in problems),
+        )
+        return False
+    return True
+
+
+def _get_version_update_type(plugin_name, previous=None):
+    """Retrieve input on which part of the version should be updated."""
+    message = ""
+    if previous is not None:
+        clear_screen()
+        message += f'Invalid value given "{previous}"\n\n'
+
+    message += (
+        f"Which type of version update should {plugin_name} have?\n\n"
+    )
+    for number, choice in sorted(_version_updates.items()):
+        message += f"\t({number}) {choice}\n"
+
+    value = input(message + "\n").strip()
+    if not value.isdigit():
+        return _get_version_update_type(plugin_name, value)
+
+    value = int(value)
+    if value not in _version_updates:
+        return _get_version_update_type(plugin_name, value)
+
+    return value
+
+
+def _update_version(plugin_name, journal):
+    """Update version info and commit."""
+    plugin_repo = START_DIR / plugin_name
+    info_file = plugin_repo / _info_path / plugin_name / "info.ini"
+    if not info_file.isfile():
+        print(f'No info.ini file found for "{plugin_name}"')
+        return False
+
+    info = ConfigObj(info_file)
+    version = info.get("version")
+    if version is None:
+        print(f'"version" not found in {plugin_name}\'s info.ini')
+        return False
+
+    try:
+        version = [int(x) for x in version.split(".")]
+    except ValueError:
+        print(f'Invalid "version" in {plugin_name}\'s info.ini: "{version}"')
+        return False
+
+    if len(version) != SEMANTIC_VERSIONING_COUNT:
+        print(f'Invalid "version" in {plugin_name}\'s info.ini: "{version}"')
+        return False
+
+    update_type = _get_version_update_type(plugin_name)
+    committed = _version_updates.get(update_type) is not None
+    if committed:
+        _commit_new_version(plugin_repo, info, version, update_type, journal)
+
+    # Was the current version already released?
+    elif get_release_path(plugin_name, info["version"]).is_file():
+        print(
+            f'Release already exists for "{plugin_name}" version '
+            f'"{info["version"]}", so its version must be updated.',
+        )
+        return False
+
+    journal.complete(
+        plugin_name, "version", committed=committed, version=info["version"],
+    )
+    return True
+
+
+def _commit_new_version(plugin_repo, info, version, update_type, journal):
+    """Commit the new version, recording it in the journal first."""
+    version[update_type - 1] += 1
+    version[update_type:] = [0] * (3 - update_type)
+
+    version = ".".join(map(str, version))
+    message = f"{_version_updates[update_type]} version update ({version})"
+    journal.plan(plugin_repo.name, "version", version=version, message=message)
+    info["version"] = version
+    info.write()
+    _commit_info_file(plugin_repo, info.filename, message)
+
+
+def _resume_version(plugin_name, journal):
+    """Commit the new version written before the batch was interrupted."""
+    data = journal.get_data(plugin_name, "version")
+
+    # Was the batch interrupted before the new version was written?
+    if get_plugin_version(plugin_name) != data["version"]:
+        return
+
+    # Was the batch interrupted before the new version was committed?
+    plugin_repo = START_DIR / plugin_name
+    if Repo(plugin_repo).is_dirty():
+        _commit_info_file(
+            plugin_repo,
+            plugin_repo / _info_path / plugin_name / "info.ini",
+            data["message"],
+        )
+
+    journal.complete(
+        plugin_name, "version", committed=True, version=data["version"],
+    )
+
+
+def _commit_info_file(plugin_repo, info_file, message):
+    """Commit the plugin's info.ini file with the given message."""
+    repo = Repo(plugin_repo)
+    with span("commit"):
+        repo.index.add([str(info_file).replace(plugin_repo, "")[1:]])
+        repo.index.commit(message)
+
+
+def _get_archive_paths(plugin_name, version):
+    """Return the paths of the release's archives, starting with the zip."""
+    # Was no version information found?
+    if version is None:
+        print(f'No version found for "{plugin_name}".')
+        return None
+
+    # Get the zip file location
+    zip_path = get_release_path(plugin_name, version)
+
+    # Get the directory to save the release in
+    save_path = zip_path.parent
+
+    # Create the directory if it doesn't exist
+    if not save_path.isdir():
+        save_path.makedirs_p()
+
+    # Does the release already exist?
+    if zip_path.isfile():
+        print(
+            f'Release already exists for "{plugin_name}" version "{version}".',
+        )
+        return None
+
+    # Get the archives to write
+    archive_formats = get_plugin_list(plugin_name, "archive_formats")
+    invalid = set(archive_formats).difference(ARCHIVE_FORMATS)
+    if invalid:
+        print(
+            f'Invalid archive_formats "{", ".join(sorted(invalid))}" for '
+            f'plugin "{plugin_name}"',
+        )
+        return None
+    return [zip_path] + [
+        save_path / f"{zip_path.stem}.{x}"
+        for x in dict.fromkeys(archive_formats) if x != "zip"
+    ]
+
+
+def _find_release_files(plugin_name, plugin_path, repo_files):
+    """Return the committed files the release includes that still exist."""
+    with span("find_files") as phase:
+        if get_plugin_flag(plugin_name, "use_file_index"):
+            plugin_files = refresh_index(plugin_name)
+            release_files = [
+                x for x in _get_release_files(repo_files) if x in plugin_files
+            ]
+        else:
+            release_files = [
+                x for x in _get_release_files(repo_files)
+                if plugin_path.joinpath(*x.split("/")).is_file()
+            ]
+        phase.add(files=len(release_files))
+    return release_files
+
+
+def _get_release_files(repo_files):
+    """Return the committed files that should be added to the zip."""
+    release_files = []
+    for allowed_dictionary in (allowed_filetypes, other_filetypes):
+
+        # Loop through all allowed directories
+        for allowed_path in allowed_dictionary:
+
+            # Loop through all committed files within the directory
+            prefix = allowed_path.rstrip("/") + "/"
+            release_files.extend(
+                _find_files(
+                    (x for x in repo_files if x.startswith(prefix)),
+                    allowed_path,
+                    allowed_dictionary,
+                ),
+            )
+
+    return release_files
+
+
+def _find_files(generator, allowed_path, allowed_dictionary):
+    """Yield files that should be added to the zip."""
+    # Loop through the files from the given generator
+    for file in generator:
+        file_path = PurePosixPath(file)
+
+        # Is the current file not allowed?
+        if file_path.suffix[1:] not in allowed_dictionary[allowed_path]:
+            continue
+
+        # Does the given directory have exceptions?
+        if allowed_path in exception_filetypes:
+
+            # Loop through the directory's exceptions
+            for exception in exception_filetypes[allowed_path]:
+
+                # Is this file not allowed?
+                if exception in file_path.name:
+                    break
+
+            # Is the file not an exception?
+            else:
+                yield file
+
+        # Is the file allowed?
+        else:
+            yield file
+
+
+def _check_data_files(plugin_name, plugin_path, release_files):
+    """Return the DataFile of each of the release's data files."""
+    return check_data_files(
+        {
+            x: plugin_path.joinpath(*x.split("/")) for x in release_files
+            if x.rsplit(".", 1)[-1] in DATA_EXTENSIONS
+        },
+        minify=get_plugin_flag(plugin_name, "minify_data"),
+    )
+
+
+def _check_assets(plugin_name, plugin_path, release_files):
+    """Print the release's textures and return its material/model problems."""
+    with span("assets") as phase:
+        assets = analyze_assets(
+            {
+                x: plugin_path.joinpath(*x.split("/")) for x in release_files
+                if x.rsplit(".", 1)[-1].lower() in ASSET_EXTENSIONS
+            },
+        )
+        phase.add(files=len(assets))
+    if assets:
+        print(
+            f"{plugin_name} textures, by the bytes a compressed format would "
+            "save:\n" + format_texture_report(assets),
+        )
+    problems = find_asset_problems(
+        assets, get_plugin_list(plugin_name, "external_assets"),
+    )
+
+    # Do the textures waste more than the plugin allows?
+    budget = get_plugin_setting(plugin_name, "texture_waste_budget", "")
+    if budget:
+        limit = parse_size(budget)
+        wasted = get_wasted_bytes(assets)
+        if limit is None:
+            problems.append(f'Invalid texture_waste_budget "{budget}"')
+        elif wasted > limit:
+            problems.append(
+                f"Textures waste {format_size(wasted)}, which exceeds the "
+                f"texture_waste_budget of {format_size(limit)}",
+            )
+    return problems
+
+
+def _update_fastdl(plugin_name, plugin_path, repo_files):
+    """Compress the plugin's committed assets into FASTDL_DIR, if set.
+
+    Files are recorded with the hash of the contents that were compressed,
+    which can differ from the committed contents, so a file changed since
+    it was compressed is always compressed again.
+    """
+    if FASTDL_DIR is None:
+        return
+
+    with span("fastdl") as phase:
+
+        # Get the hashes of the files that are compressed
+        names = [
+            x for x in repo_files
+            if is_downloadable(x)
+            and plugin_path.joinpath(*x.split("/")).is_file()
+        ]
+        if get_plugin_flag(plugin_name, "use_file_index"):
+            hashes = refresh_index(plugin_name)
+        else:
+            hashes = dict(
+                zip(
+                    names,
+                    map_in_threads(
+                        hash_file,
+                        [plugin_path.joinpath(*x.split("/")) for x in names],
+                    ),
+                    strict=True,
+                ),
+            )
+
+        result = update_fastdl(
+            FASTDL_DIR, plugin_name, plugin_path,
+            {x: hashes[x] for x in names if x in hashes},
+        )
+        phase.add(files=result.compressed, bytes_written=result.compressed_size)
+
+    # Did other plugins have different files at the same paths?
+    if result.conflicts:
+        print(
+            f"{plugin_name} FastDL files left as they are, as other plugins "
+            "have different files at the same paths:\n"
+            + "".join(f'\t"{x}"\n' for x in result.conflicts),
+        )
+
+    ratio = result.compressed_size / result.size if result.size else 1
+    print(
+        f'Updated {plugin_name} FastDL files in "{FASTDL_DIR}":\n'
+        f"\t{result.compressed} compressed, {result.unchanged} unchanged, "
+        f"{result.removed} removed\n"
+        f"\t{format_size(result.size)} compressed to "
+        f"{format_size(result.compressed_size)} ({ratio:.1%})\n",
+    )
+
+
+def _compact_translations(plugin_name, plugin_path, release_files):
+    """Return the plugin's translation files without their unused keys."""
+    translations = index_plugin(
+        plugin_path, plugin_name,
+        get_plugin_list(plugin_name, "translation_keep"),
+    )
+    if translations.unused:
+        print(
+            f"Removed {len(translations.unused)} unused translation keys: "
+            + ", ".join(sorted(translations.unused)) + "\n",
+        )
+    return {
+        x.name: compact_translation_file(x, translations.unused)
+        for x in translations.files
+        if x.name in release_files
+    }
+
+
+def _write_release(
+    archive_paths, plugin_name, plugin_path, release_files, rewritten,
+):
+    """Write the release's archives and return its size report and bytecode.
+
+    The zip must be the first of the archive paths.  rewritten maps the
+    members to write with different contents than the plugin's files (such
+    as compacted translations and minified data files) to their contents.
+    """
+    # Should assets be added from their stored copies?
+    assets = {}
+    if get_plugin_flag(plugin_name, "asset_store"):
+        assets = update_store([plugin_name])[plugin_name]
+
+    # Get the previous release's members for files unchanged since then
+    previous, reusable = None, {}
+    if get_plugin_flag(plugin_name, "use_file_index"):
+        previous, reusable = _get_reusable_members(plugin_name)
+
+    with span("compress") as phase:
+        with ReleaseArchives(archive_paths) as archives:
+
+            # Loop through all files to include
+            for relative_file_path in release_files:
+
+                # Is the file an asset with a stored copy?
+                asset = assets.get(relative_file_path)
+                if asset is not None:
+
+                    # Add the stored copy, which is only ever compressed once
+                    _add_file(
+                        archives, get_blob_path(asset.digest),
+                        relative_file_path, plugin_path,
+                        compressed=get_compressed_blob(asset.digest),
+                    )
+                    continue
+
+                # Is the file unchanged since the previous release?
+                info = reusable.get(relative_file_path)
+                if info is not None and relative_file_path not in rewritten:
+
+                    # Add the previous release's member without compressing
+                    _add_file(
+                        archives,
+                        plugin_path.joinpath(*relative_file_path.split("/")),
+                        relative_file_path, plugin_path,
+                        compressed=(info.CRC, _read_member(previous, info)),
+                    )
+                    continue
+
+                # Add the file, or the contents to use in its place
+                _add_file(
+                    archives,
+                    plugin_path.joinpath(*relative_file_path.split("/")),
+                    relative_file_path, plugin_path,
+                    contents=rewritten.get(relative_file_path),
+                )
+
+            # Should the plugin's Python files be compiled to bytecode?
+            bytecode_files = []
+            if get_plugin_flag(plugin_name, "compile_bytecode"):
+                with span("bytecode"):
+                    bytecode_files = _add_bytecode(
+                        archives, plugin_name, plugin_path, release_files,
+                    )
+
+        # Get the size of the release from the zip's listing
+        with ZipFile(archive_paths[0]) as zip_file:
+            size_report = get_size_report(release_files, zip_file)
+
+        phase.add(
+            files=len(release_files),
+            bytes_read=archives.bytes_read,
+            bytes_written=sum(x.size for x in archive_paths),
+        )
+
+    return size_report, bytecode_files
+
+
+def _get_reusable_members(plugin_name):
+    """Return the previous release and its members for unchanged files.
+
+    Members with contents that differ from the plugin's files, and members
+    that are not deflated, are never reused.
+    """
+    dirty = get_dirty_files("release", plugin_name)
+    data = get_consumer_data("release", plugin_name)
+
+    # Does the previous release no longer exist?
+    previous = Path(data.get("archive", ""))
+    if not data.get("archive") or not previous.is_file():
+        return None, {}
+
+    skipped = dirty.changed.union(data.get("rewritten", []))
+    with ZipFile(previous) as zip_file:
+        return previous, {
+            x.filename: x for x in zip_file.infolist()
+            if not x.is_dir() and x.filename not in skipped
+            and x.compress_type == ZIP_DEFLATED
+        }
+
+
+def _read_member(zip_path, info):
+    """Return the compressed data of the given member of the zip."""
+    with zip_path.open("rb") as open_file:
+        return read_compressed(
+            open_file, info.header_offset, info.compress_size,
+        )
+
+
+def _add_bytecode(archives, plugin_name, plugin_path, release_files):
+    """Add bytecode for the plugin's Python files and return the members."""
+    optimize = get_plugin_setting(plugin_name, "bytecode_optimize", "0")
+    mode = get_plugin_setting(
+        plugin_name, "bytecode_invalidation", INVALIDATION_MODES[0],
+    )
+    if optimize not in ("0", "1", "2") or mode not in INVALIDATION_MODES:
+        print(
+            f'Invalid bytecode_optimize "{optimize}" or bytecode_invalidation '
+            f'"{mode}" for plugin "{plugin_name}"',
+        )
+        return None
+
+    # Compile the plugin's Python files with the target interpreter
+    with TemporaryDirectory() as temp_dir:
+        compiled = compile_bytecode(
+            [
+                (plugin_path.joinpath(*x.split("/")), x)
+                for x in release_files
+                if x.startswith(_info_path) and x.endswith(".py")
+            ],
+            temp_dir,
+            get_plugin_setting(plugin_name, "bytecode_python") or None,
+            optimize=int(optimize),
+            mode=mode,
+        )
+        if compiled is None:
+            return None
+
+        # Add the compiled files and their __pycache__ directories
+        for member, compiled_file in compiled:
+            archives.add_directory(
+                member.rsplit("/", 1)[0] + "/", Path(compiled_file).parent,
+            )
+            archives.add_file(member, compiled_file)
+
+    return [member for member, _ in compiled]
+
+
+def _add_file(archives, source, relative_file_path, plugin_path, **kwargs):
+    """Add the given file and all parent directories to the archives."""
+    # Write the file to the archives
+    archives.add_file(relative_file_path, source, **kwargs)
+
+    # Get the file's parent directory
+    parent = PurePosixPath(relative_file_path).parent
+
+    # Get all parent directories to add to the archives
+    while parent.name:
+
+        # Is the current directory already included in the archives?
+        current = f"{parent}/"
+        if current in archives.names:
+            break
+
+        # Add the parent directory to the archives
+        archives.add_directory(current, plugin_path.joinpath(*parent.parts))
+
+        # Get the parent's parent
+        parent = parent.parent
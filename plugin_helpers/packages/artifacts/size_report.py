@@ -0,0 +1,152 @@
+# ../artifacts/size_report.py
+
+"""Reports the size of a release and checks it against size budgets."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from collections import defaultdict
+from heapq import nlargest
+from pathlib import PurePosixPath
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the number of largest files to report
+_LARGEST_FILE_COUNT = 10
+
+# Store the multipliers for each size unit
+_size_units = {
+    "GB": 1024 ** 3,
+    "MB": 1024 ** 2,
+    "KB": 1024,
+    "B": 1,
+}
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_size_report(release_files, zip_file):
+    """Return the raw and compressed sizes of the release's files.
+
+    Sizes come from the archive's member list, so no files are read to
+    build the report.
+    """
+    directories = defaultdict(lambda: [0, 0])
+    extensions = defaultdict(lambda: [0, 0])
+    total = [0, 0]
+    files = []
+    for name in release_files:
+        info = zip_file.getinfo(name)
+        raw, compressed = info.file_size, info.compress_size
+        file_path = PurePosixPath(name)
+        for sizes in (
+            directories[file_path.parts[0]],
+            extensions[file_path.suffix or file_path.name],
+            total,
+        ):
+            sizes[0] += raw
+            sizes[1] += compressed
+        files.append((raw, compressed, name))
+
+    return {
+        "directories": dict(directories),
+        "extensions": dict(extensions),
+        "total": total,
+        "largest": nlargest(_LARGEST_FILE_COUNT, files),
+    }
+
+
+def format_size_report(report):
+    """Return the given size report as a printable table."""
+    lines = [f"\t{'':<48}{'raw':>12}{'compressed':>12}"]
+    for title in ("directories", "extensions"):
+        lines.append(f"\t{title.title()}:")
+        lines.extend(
+            f"\t  {name:<46}{format_size(raw):>12}"
+            f"{format_size(compressed):>12}"
+            for name, (raw, compressed) in sorted(
+                report[title].items(), key=lambda item: -item[1][0],
+            )
+        )
+
+    lines.append("\tLargest files:")
+    lines.extend(
+        f"\t  {_shorten(name, 46):<46}{format_size(raw):>12}"
+        f"{format_size(compressed):>12}"
+        for raw, compressed, name in report["largest"]
+    )
+
+    raw, compressed = report["total"]
+    lines.append(
+        f"\t{'Total':<48}{format_size(raw):>12}{format_size(compressed):>12}",
+    )
+    return "\n".join(lines)
+
+
+def check_size_budgets(report, budgets):
+    """Return the size budgets exceeded by the release's raw sizes.
+
+    Budgets are keyed by "total", "largest_file", a top level directory
+    (such as "materials"), or a file extension (such as ".vtf").
+    """
+    problems = []
+    for name, budget in budgets.items():
+        limit = parse_size(budget)
+        if limit is None:
+            problems.append(f'Invalid size budget "{budget}" for "{name}"')
+            continue
+
+        # Get the raw size that applies to the budget
+        if name == "total":
+            size = report["total"][0]
+        elif name == "largest_file":
+            size = report["largest"][0][0] if report["largest"] else 0
+        else:
+            size = report[
+                "extensions" if name.startswith(".") else "directories"
+            ].get(name, [0])[0]
+
+        if size > limit:
+            problems.append(
+                f'"{name}" is {format_size(size)}, which exceeds its budget '
+                f"of {format_size(limit)}",
+            )
+
+    return problems
+
+
+def format_size(size):
+    """Return the given number of bytes in a readable unit."""
+    for unit, multiplier in _size_units.items():
+        if multiplier > 1 and size >= multiplier:
+            return f"{size / multiplier:.1f} {unit}"
+    return f"{size} B"
+
+
+def parse_size(value):
+    """Return the number of bytes for a size such as "512KB" or "20MB"."""
+    value = str(value).strip().upper()
+    multiplier = 1
+    for unit, unit_multiplier in _size_units.items():
+        if value.endswith(unit):
+            value = value.removesuffix(unit).strip()
+            multiplier = unit_multiplier
+            break
+
+    try:
+        return int(float(value) * multiplier)
+    except ValueError:
+        return None
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _shorten(name, length):
+    """Return the given name, trimmed from the start to the given length."""
+    if len(name) <= length:
+        return name
+    return "..." + name[-length + 3:]
@@ -0,0 +1,450 @@
+# ../artifacts/source_assets.py
+
+"""Analyzes the materials and models included in releases.
+
+Only the headers of textures (VTF) and models (MDL, VVD, VTX, and PHY) are
+read, through mmap, so only the pages holding each header are loaded from
+disk however large the file is.  Textures are reported with their size,
+image format, mipmaps, and the bytes a compressed (DXT) format would save.
+Materials (VMT) are parsed for the textures they use, and models are
+checked for the companion files the engine loads alongside them.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import re
+import struct
+from collections import defaultdict
+from fnmatch import fnmatch
+from mmap import ACCESS_READ, mmap
+from typing import NamedTuple
+
+# Package
+from artifacts.data_files import parse_vdf
+from artifacts.size_report import format_size
+from common.pools import map_in_threads
+
+# Site-package
+from path import Path
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the extensions of the files that are analyzed
+ASSET_EXTENSIONS = ("mdl", "phy", "vmt", "vtf", "vtx", "vvd")
+
+# Store the layout of the VTF header, up to the depth added in version 7.2
+_vtf_header = struct.Struct("<4s2I4x2HI2H4x12x4x4xiBi2xH")
+
+# Store the layout of the start of the MDL header, up to its data length
+_mdl_header = struct.Struct("<4sii64si")
+
+# Store where each companion file's header stores its model's checksum
+_checksum_offsets = {"phy": 12, "vtx": 16, "vvd": 8}
+
+# Store the bytes to read from the start of each kind of binary file
+_header_sizes = {
+    "mdl": _mdl_header.size,
+    "phy": 16,
+    "vtf": _vtf_header.size,
+    "vtx": 20,
+    "vvd": 12,
+}
+
+# Store the companion files a model cannot be loaded without
+_required_companions = ("vvd", "vtx")
+
+# Store the expression that finds the model of a companion file
+_companion_file = re.compile(r"(?:\.(?:dx80|dx90|sw|xbox))?\.(?:phy|vtx|vvd)$")
+
+# Store the expression that finds path separators, which may be repeated
+_separators = re.compile(r"[\\/]+")
+
+# Store the name and bits per pixel of each VTF image format
+_image_formats = {
+    0: ("RGBA8888", 32),
+    1: ("ABGR8888", 32),
+    2: ("RGB888", 24),
+    3: ("BGR888", 24),
+    4: ("RGB565", 16),
+    5: ("I8", 8),
+    6: ("IA88", 16),
+    7: ("P8", 8),
+    8: ("A8", 8),
+    9: ("RGB888_BLUESCREEN", 24),
+    10: ("BGR888_BLUESCREEN", 24),
+    11: ("ARGB8888", 32),
+    12: ("BGRA8888", 32),
+    13: ("DXT1", 4),
+    14: ("DXT3", 8),
+    15: ("DXT5", 8),
+    16: ("BGRX8888", 32),
+    17: ("BGR565", 16),
+    18: ("BGRX5551", 16),
+    19: ("BGRA4444", 16),
+    20: ("DXT1_ONEBITALPHA", 4),
+    21: ("BGRA5551", 16),
+    22: ("UV88", 16),
+    23: ("UVWQ8888", 32),
+    24: ("RGBA16161616F", 64),
+    25: ("RGBA16161616", 64),
+    26: ("UVLX8888", 32),
+}
+
+# Store the bits per pixel of each image format, by its name
+_image_formats_by_name = dict(_image_formats.values())
+
+# Store the bytes of each 4x4 block of the compressed image formats
+_block_bytes = {"DXT1": 8, "DXT1_ONEBITALPHA": 8, "DXT3": 16, "DXT5": 16}
+
+# Store the compressed format each uncompressed color format could use
+#   Formats holding normal data (UV), HDR, or a single channel are left
+#   out, as compressing them loses too much.
+_compressed_formats = {
+    "RGBA8888": "DXT5",
+    "ABGR8888": "DXT5",
+    "ARGB8888": "DXT5",
+    "BGRA8888": "DXT5",
+    "BGRA4444": "DXT5",
+    "BGRA5551": "DXT1_ONEBITALPHA",
+    "RGB888": "DXT1",
+    "BGR888": "DXT1",
+    "BGRX8888": "DXT1",
+    "RGB565": "DXT1",
+    "BGR565": "DXT1",
+    "BGRX5551": "DXT1",
+}
+
+# Store the VTF flags used to size and compress the image data
+_FLAG_ONE_BIT_ALPHA = 0x1000
+_FLAG_EIGHT_BIT_ALPHA = 0x2000
+_FLAG_ENVIRONMENT_MAP = 0x4000
+
+# Store the number of faces of an environment map
+_CUBE_FACES = 6
+
+# Store the VTF version that added the texture's depth to the header
+_DEPTH_VERSION = 2
+
+# Store the material parameters whose values are textures
+_texture_parameters = {
+    "$ambientoccltexture",
+    "$basetexture",
+    "$basetexture2",
+    "$blendmodulatetexture",
+    "$bumpmap",
+    "$bumpmap2",
+    "$corneatexture",
+    "$detail",
+    "$detail2",
+    "$dudvmap",
+    "$envmap",
+    "$envmapmask",
+    "$hdrbasetexture",
+    "$hdrcompressedtexture",
+    "$iris",
+    "$lightwarptexture",
+    "$normalmap",
+    "$phongexponenttexture",
+    "$phongwarptexture",
+    "$refracttinttexture",
+    "$selfillummask",
+    "$texture2",
+    "$tintmasktexture",
+}
+
+# Store the texture names that are provided by the engine
+_engine_textures = ("_rt_*", "env_cubemap")
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class TextureInfo(NamedTuple):
+    """Stores the header values of a VTF texture."""
+
+    width: int
+    height: int
+    image_format: str
+    mipmaps: int
+    data_size: int
+    wasted: int
+    suggested: str | None
+
+
+class SourceAsset(NamedTuple):
+    """Stores the result of analyzing a material or model file."""
+
+    name: str
+    problem: str | None
+    texture: TextureInfo | None
+    references: tuple
+    checksum: int | None
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def analyze_assets(files):
+    """Return the SourceAsset of each of the given files.
+
+    files maps each member name to the file's path.  Files are analyzed in
+    parallel, one thread per CPU, as most of the work is reading headers.
+    """
+    names = list(files)
+    return map_in_threads(analyze_asset, names, [files[x] for x in names])
+
+
+def find_asset_files(plugin_path):
+    """Return the plugin's material and model files, by their member name."""
+    files = {}
+    for directory in ("materials", "models"):
+        if not (plugin_path / directory).is_dir():
+            continue
+        for file in (plugin_path / directory).walkfiles():
+            if file.ext[1:].lower() in ASSET_EXTENSIONS:
+                files[file.relpath(plugin_path).replace("\\", "/")] = file
+    return files
+
+
+def analyze_asset(name, path):
+    """Read the header of the material or model file and return its result."""
+    extension = name.rsplit(".", 1)[-1].lower()
+    if extension == "vmt":
+        return _analyze_material(name, Path(path))
+
+    header = _read_header(path, _header_sizes[extension])
+    if extension == "vtf":
+        return _analyze_texture(name, header)
+    if extension == "mdl":
+        return _analyze_model(name, header, Path(path).size)
+
+    # Get the checksum of the model the companion file was compiled with
+    offset = _checksum_offsets.get(extension)
+    checksum = None
+    if offset is not None and len(header) >= offset + 4:
+        checksum = int.from_bytes(header[offset:offset + 4], "little")
+    return SourceAsset(name, None, None, (), checksum)
+
+
+def find_asset_problems(assets, external=()):
+    """Return the problems found within and between the given assets.
+
+    Materials must only use textures within the assets, and models must
+    have their VVD and VTX files, compiled with the same checksum.
+    external holds patterns of asset names (such as "materials/models/*")
+    that are provided by the game or another plugin.
+    """
+    problems = [x.problem for x in assets if x.problem is not None]
+    names = {x.name.lower() for x in assets}
+
+    # Were any of the referenced textures or materials not included?
+    for asset in assets:
+        problems.extend(
+            f'"{asset.name}" uses "{reference}", which is not included'
+            for reference in asset.references
+            if reference not in names
+            and not any(fnmatch(reference, x) for x in external)
+        )
+
+    # Get each model and its companion files
+    models = {}
+    companions = defaultdict(list)
+    for asset in assets:
+        name = asset.name.lower()
+        if name.endswith(".mdl"):
+            models[name.removesuffix(".mdl")] = asset
+        elif _companion_file.search(name):
+            companions[_companion_file.sub("", name)].append(asset)
+
+    # Are any of the models missing their companions, or from another build?
+    for stem, model in models.items():
+        extensions = {x.name.rsplit(".", 1)[-1] for x in companions[stem]}
+        problems.extend(
+            f'"{model.name}" is missing its .{x} file'
+            for x in _required_companions if x not in extensions
+        )
+        problems.extend(
+            f'"{x.name}" was not compiled with "{model.name}"'
+            for x in companions[stem]
+            if None not in (x.checksum, model.checksum)
+            and x.checksum != model.checksum
+        )
+
+    # Are any companion files left without their model?
+    problems.extend(
+        f'"{x.name}" has no .mdl file'
+        for stem, files in companions.items() if stem not in models
+        for x in files
+    )
+    return problems
+
+
+def get_wasted_bytes(assets):
+    """Return the bytes compressed texture formats would save in total."""
+    return sum(x.texture.wasted for x in assets if x.texture is not None)
+
+
+def format_texture_report(assets):
+    """Return the textures within the given assets as a printable table.
+
+    Textures are listed by the bytes a compressed format would save, then
+    by their size, largest first.
+    """
+    textures = sorted(
+        (x for x in assets if x.texture is not None),
+        key=lambda x: (-x.texture.wasted, -x.texture.data_size, x.name),
+    )
+    if not textures:
+        return "\tNo textures found\n"
+
+    header = (
+        f"\t{'size':>11}  {'format':<18}{'mips':>5}{'data':>11}{'wasted':>11}"
+        "  texture"
+    )
+    lines = [header]
+    for asset in textures:
+        texture = asset.texture
+        wasted = format_size(texture.wasted) if texture.wasted else "-"
+        lines.append(
+            f"\t{texture.width:>5}x{texture.height:<5}  "
+            f"{texture.image_format:<18}{texture.mipmaps:>5}"
+            f"{format_size(texture.data_size):>11}{wasted:>11}  {asset.name}",
+        )
+        if texture.suggested is not None:
+            lines.append(f"\t{'':>13}use {texture.suggested} instead")
+
+    lines.append(
+        f"\tCompressed formats would save "
+        f"{format_size(get_wasted_bytes(assets))}",
+    )
+    return "\n".join(lines) + "\n"
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _read_header(path, size):
+    """Return up to the given number of bytes from the start of the file."""
+    with Path(path).open("rb") as open_file:
+
+        # Empty files cannot be mapped
+        if not Path(path).size:
+            return b""
+        with mmap(open_file.fileno(), 0, access=ACCESS_READ) as contents:
+            return contents[:size]
+
+
+def _analyze_texture(name, header):
+    """Return the SourceAsset of the VTF file with the given header."""
+    if len(header) < _vtf_header.size or not header.startswith(b"VTF\0"):
+        return SourceAsset(name, f'"{name}" is not a VTF file', None, (), None)
+
+    (
+        _signature, _major, minor, width, height, flags, frames, _first,
+        image_format, mipmaps, _thumbnail_format, depth,
+    ) = _vtf_header.unpack_from(header)
+    if image_format not in _image_formats:
+        return SourceAsset(
+            name, f'"{name}" has an unknown image format ({image_format})',
+            None, (), None,
+        )
+
+    # Get the number of images stored for each mipmap
+    images = max(1, frames) * (
+        _CUBE_FACES if flags & _FLAG_ENVIRONMENT_MAP else 1
+    )
+    depth = max(1, depth) if minor >= _DEPTH_VERSION else 1
+    format_name = _image_formats[image_format][0]
+    size = (width, height, depth, max(1, mipmaps))
+    data_size = images * _get_image_size(format_name, *size)
+
+    # Could the texture use a compressed format?
+    suggested = _compressed_formats.get(format_name)
+    if suggested == "DXT5" and not flags & (
+        _FLAG_ONE_BIT_ALPHA | _FLAG_EIGHT_BIT_ALPHA
+    ):
+        suggested = "DXT1"
+    wasted = 0
+    if suggested is not None:
+        wasted = data_size - images * _get_image_size(suggested, *size)
+
+    return SourceAsset(
+        name, None,
+        TextureInfo(
+            width, height, format_name, mipmaps, data_size, wasted, suggested,
+        ),
+        (), None,
+    )
+
+
+def _get_image_size(format_name, width, height, depth, mipmaps):
+    """Return the bytes of an image and its mipmaps in the given format."""
+    size = 0
+    for level in range(mipmaps):
+        level_width = max(1, width >> level)
+        level_height = max(1, height >> level)
+        level_depth = max(1, depth >> level)
+        if format_name in _block_bytes:
+            size += (
+                ((level_width + 3) // 4) * ((level_height + 3) // 4)
+                * _block_bytes[format_name] * level_depth
+            )
+        else:
+            size += (
+                level_width * level_height * level_depth
+                * _image_formats_by_name[format_name] // 8
+            )
+    return size
+
+
+def _analyze_model(name, header, file_size):
+    """Return the SourceAsset of the MDL file with the given header."""
+    if len(header) < _mdl_header.size or not header.startswith(b"IDST"):
+        return SourceAsset(name, f'"{name}" is not an MDL file', None, (), None)
+
+    _signature, _version, checksum, _name, data_length = (
+        _mdl_header.unpack_from(header)
+    )
+    problem = None
+    if data_length > file_size:
+        problem = (
+            f'"{name}" is truncated ({file_size} of {data_length} bytes)'
+        )
+    return SourceAsset(name, problem, None, (), checksum)
+
+
+def _analyze_material(name, path):
+    """Return the SourceAsset of the VMT file, with the textures it uses."""
+    try:
+        sections = parse_vdf(path.read_bytes().decode("utf-8-sig"))
+    except (UnicodeDecodeError, ValueError) as e:
+        return SourceAsset(name, f'"{name}" is not valid: {e}', None, (), None)
+
+    # Get the textures and included materials within every section
+    references = set()
+    waiting = list(sections.values())
+    while waiting:
+        section = waiting.pop()
+        if not isinstance(section, dict):
+            continue
+        for key, value in section.items():
+            if isinstance(value, dict):
+                waiting.append(value)
+                continue
+
+            parameter = key.lower()
+            reference = _separators.sub("/", value).strip("/").lower()
+            if parameter == "include":
+                references.add(reference)
+            elif parameter in _texture_parameters and not any(
+                fnmatch(reference, x) for x in _engine_textures
+            ):
+                references.add(
+                    "materials/" + reference.removesuffix(".vtf") + ".vtf",
+                )
+
+    return SourceAsset(name, None, None, tuple(sorted(references)), None)
+
@@ -0,0 +1,210 @@
+# ../artifacts/translations.py
+
+"""Indexes plugins' translation files and compacts them for releases."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import re
+from fnmatch import fnmatchcase
+from typing import NamedTuple
+
+# Package
+from common.pools import map_in_processes
+
+# Site-package
+from path import Path
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the directory, within a plugin, that holds its translation files
+TRANSLATIONS_PATH = "resource/source-python/translations/gungame/"
+
+# Store the categories of translation files a plugin can have
+TRANSLATION_CATEGORIES = ("messages", "commands", "config", "rules")
+
+# Store the extensions of files searched for references to translations
+_source_extensions = (".cfg", ".ini", ".json", ".py", ".txt", ".vdf", ".xml")
+
+# Store the expressions used to parse translation files
+_section_line = re.compile(r"\s*\[\s*([^\[\]]+?)\s*\]\s*(?:#.*)?$")
+_value_line = re.compile(r"\s*([^\s=#\[]+)\s*=")
+_source_tokens = re.compile(r"[\w:.\-]+")
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class TranslationSection(NamedTuple):
+    """Stores a translation key with its languages and lines."""
+
+    key: str
+    languages: frozenset
+    lines: tuple
+
+
+class TranslationFile(NamedTuple):
+    """Stores the parsed contents of a translation file."""
+
+    name: str
+    category: str
+    sections: tuple
+    duplicates: tuple
+
+
+class PluginTranslations(NamedTuple):
+    """Stores a plugin's translation files and the keys it never uses."""
+
+    files: tuple
+    unused: frozenset
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def index_translations(plugin_paths, keep=None):
+    """Return the translations of each of the given plugins.
+
+    plugin_paths maps plugin names to their paths, and keep optionally maps
+    plugin names to patterns of keys that are always considered used.
+    Large sets of plugins are parsed in parallel, one process per CPU.
+    """
+    keep = keep or {}
+    names = list(plugin_paths)
+    paths = [Path(plugin_paths[name]) for name in names]
+    results = map_in_processes(
+        index_plugin, paths, names, [keep.get(name, ()) for name in names],
+        size=sum(
+            x.size for path in paths if (path / "addons").is_dir()
+            for x in (path / "addons").walkfiles()
+            if x.suffix in _source_extensions
+        ),
+    )
+    return dict(zip(names, results, strict=True))
+
+
+def index_plugin(plugin_path, plugin_name, keep=()):
+    """Return the plugin's translation files and its unused keys."""
+    plugin_path = Path(plugin_path)
+    files = []
+    for category in TRANSLATION_CATEGORIES:
+        name = (
+            f"{TRANSLATIONS_PATH}{category}/custom_plugins/{plugin_name}.ini"
+        )
+        file_path = plugin_path.joinpath(*name.split("/"))
+        if file_path.is_file():
+            files.append(
+                parse_translation_file(file_path.read_bytes(), name, category),
+            )
+
+    keys = {x.key for file in files for x in file.sections}
+    return PluginTranslations(
+        tuple(files),
+        frozenset(
+            _find_unused_keys(plugin_path, keys.difference(
+                x for x in keys
+                if any(fnmatchcase(x, pattern) for pattern in keep)
+            )),
+        ),
+    )
+
+
+def parse_translation_file(contents, name, category):
+    """Return the TranslationFile for the given file contents."""
+    sections = []
+    duplicates = []
+    seen = set()
+    key = None
+    languages = set()
+    lines = []
+    multiline = None
+
+    for line in contents.decode("utf-8-sig").splitlines():
+
+        # Is the line within a multiline value?
+        if multiline is not None:
+            lines.append(line)
+            if line.count(multiline) % 2:
+                multiline = None
+            continue
+
+        # Is this the start of a new key?
+        match = _section_line.match(line)
+        if match is not None:
+            if key is not None:
+                sections.append(
+                    TranslationSection(key, frozenset(languages), tuple(lines)),
+                )
+            key = match.group(1)
+            if key in seen:
+                duplicates.append(key)
+            seen.add(key)
+            languages = set()
+            lines = [line]
+            continue
+
+        # Is the line a value for the current key?
+        match = _value_line.match(line)
+        if key is None or match is None:
+            continue
+
+        languages.add(match.group(1))
+        lines.append(line)
+
+        # Does the value continue onto the following lines?
+        for quotes in ('"""', "'''"):
+            if line.count(quotes) % 2:
+                multiline = quotes
+                break
+
+    if key is not None:
+        sections.append(
+            TranslationSection(key, frozenset(languages), tuple(lines)),
+        )
+
+    return TranslationFile(name, category, tuple(sections), tuple(duplicates))
+
+
+def compact_translation_file(translation_file, unused):
+    """Return the file's contents without comments or the unused keys."""
+    return "".join(
+        line + "\n"
+        for section in translation_file.sections
+        if section.key not in unused
+        for line in section.lines
+    ).encode()
+
+
+def get_missing_languages(translation_file, languages):
+    """Return the keys of the file mapped to the languages they lack."""
+    missing = {}
+    for section in translation_file.sections:
+        languages_missing = set(languages).difference(section.languages)
+        if languages_missing:
+            missing[section.key] = sorted(languages_missing)
+    return missing
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _find_unused_keys(plugin_path, keys):
+    """Return the keys not referenced in the plugin's other files."""
+    addons_path = plugin_path / "addons"
+    if not keys or not addons_path.is_dir():
+        return keys
+
+    unused = set(keys)
+    for file_path in addons_path.walkfiles():
+        if file_path.suffix not in _source_extensions:
+            continue
+
+        text = file_path.read_text(encoding="utf-8", errors="ignore")
+        tokens = set(_source_tokens.findall(text))
+        unused = {x for x in unused if x not in tokens and x not in text}
+        if not unused:
+            break
+
+    return unused
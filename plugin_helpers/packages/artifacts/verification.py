@@ -0,0 +1,163 @@
+# ../artifacts/verification.py
+
+"""Verifies a release archive against the plugin's committed files.
+
+Each member is hashed as git hashes a blob and compared to the blob
+committed at HEAD.  Members that differ are compared again to the
+committed blob's contents after converting CRLF line endings to LF, as a
+checkout with "text=auto" (such as on Windows) converts text files.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from hashlib import sha1
+from os import cpu_count
+from zipfile import BadZipFile, ZipFile
+from zlib import crc32
+
+# Package
+from common.functions import get_repo_files
+from common.metrics import timed_run
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the chunk size to use when reading members
+_CHUNK_SIZE = 1024 * 1024
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def verify_release(
+    zip_path, repo_path, release_files, generated=(), rewritten=(),
+):
+    """Return a list of the problems found within the release archive.
+
+    Members are compared to the files committed at HEAD of the repo_path
+    repository, and release_files lists the committed files that should be
+    in the archive.  generated lists the members the releaser created,
+    such as bytecode, and rewritten lists the committed files the releaser
+    changed, such as compacted translations, which are only checked
+    against their CRC.
+    """
+    repo_files = get_repo_files(repo_path)
+    if repo_files is None:
+        return ["The committed files could not be listed"]
+
+    with ZipFile(zip_path) as zip_file:
+        members = [x for x in zip_file.infolist() if not x.is_dir()]
+
+    # Check the members' contents across the workers
+    workers = min(len(members), cpu_count() or 1) or 1
+    problems = []
+    differing = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for result, names in executor.map(
+            partial(_verify_members, zip_path, repo_files, rewritten),
+            [members[x::workers] for x in range(workers)],
+        ):
+            problems.extend(result)
+            differing.extend(names)
+
+    # Do the differing members only differ by their line endings?
+    if differing:
+        blobs = _read_blobs(
+            repo_path, {repo_files[x].object_hash for x in differing},
+        )
+        with ZipFile(zip_path) as zip_file:
+            problems.extend(
+                f'"{x}" differs from the committed file'
+                for x in sorted(differing)
+                if zip_file.read(x).replace(b"\r\n", b"\n")
+                != blobs.get(repo_files[x].object_hash)
+            )
+
+    # Compare the archive's members to the files that should be included
+    names = {x.filename for x in members}
+    problems.extend(
+        f'Committed file "{x}" is missing from the release'
+        for x in release_files if x not in names
+    )
+    problems.extend(
+        f'"{x}" should not be included in the release'
+        for x in sorted(names.difference(release_files, generated))
+    )
+    return problems
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _verify_members(zip_path, repo_files, rewritten, members):
+    """Return the problems found when streaming the given members.
+
+    The names of the members that do not hash to their committed blob are
+    also returned.
+    """
+    problems = []
+    differing = []
+
+    # Each worker uses its own handle, as reads would otherwise interleave
+    with ZipFile(zip_path) as zip_file:
+        for info in members:
+
+            # Is the member not a committed file?
+            if info.filename not in repo_files:
+                continue
+
+            # Stream the member, hashing it as git would
+            crc = size = 0
+            digest = sha1(
+                f"blob {info.file_size}\0".encode(), usedforsecurity=False,
+            )
+            try:
+                with zip_file.open(info) as open_file:
+                    while chunk := open_file.read(_CHUNK_SIZE):
+                        crc = crc32(chunk, crc)
+                        size += len(chunk)
+                        digest.update(chunk)
+
+            # Is the member's data corrupt?
+            except BadZipFile as error:
+                problems.append(f'"{info.filename}" is corrupt: {error}')
+                continue
+
+            if size != info.file_size or crc != info.CRC:
+                problems.append(
+                    f'"{info.filename}" does not match its size and CRC',
+                )
+            elif (
+                info.filename not in rewritten and
+                digest.hexdigest() != repo_files[info.filename].object_hash
+            ):
+                differing.append(info.filename)
+
+    return problems, differing
+
+
+def _read_blobs(repo_path, object_hashes):
+    """Return the contents of the given blobs, read with git cat-file."""
+    output = timed_run(
+        ["git", "cat-file", "--batch"],
+        cwd=repo_path, input="".join(f"{x}\n" for x in object_hashes).encode(),
+        capture_output=True, check=False,
+    ).stdout
+
+    # Each blob is a "<hash> blob <size>" line, its contents, and a newline
+    blobs = {}
+    position = 0
+    while position < len(output):
+        end = output.index(b"\n", position)
+        header = output[position:end].split()
+        position = end + 1
+        if len(header) < 3:  # noqa: PLR2004
+            continue
+        size = int(header[2])
+        blobs[header[0].decode()] = output[position:position + size]
+        position += size + 1
+    return blobs
@@ -0,0 +1,3 @@
+# ../benchmarks/__init__.py
+
+"""The benchmarks package measures the cost of the helper tools."""
@@ -0,0 +1,116 @@
+# ../benchmarks/bytecode_import.py
+
+"""Compares plugin import time with and without release bytecode.
+
+Execute with the packages directory on the PYTHONPATH:
+
+    python -m benchmarks.bytecode_import --modules 50 --functions 200
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from argparse import ArgumentParser
+from os import environ
+from subprocess import run
+from sys import executable
+from tempfile import TemporaryDirectory
+
+# Package
+from artifacts.bytecode import compile_bytecode
+
+# Site-package
+from path import Path
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the name of the generated plugin
+_PLUGIN_NAME = "gg_benchmark"
+
+# Store the script that times importing the generated plugin
+_IMPORT_SCRIPT = f"""
+from time import perf_counter
+start = perf_counter()
+import {_PLUGIN_NAME}
+print(perf_counter() - start)
+"""
+
+
+# =============================================================================
+# >> MAIN FUNCTION
+# =============================================================================
+def benchmark_bytecode_import(module_count, function_count, repeat):
+    """Return the best import times from source and from bytecode."""
+    with TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir)
+        sources = _create_plugin(path, module_count, function_count)
+
+        # Time importing while compiling every module, as on first load
+        source_time = _time_import(path, repeat)
+
+        # Time importing the bytecode a release would include
+        compile_bytecode(sources, path)
+        bytecode_time = _time_import(path, repeat)
+
+    return source_time, bytecode_time
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _create_plugin(path, module_count, function_count):
+    """Create a plugin package and return its (file, member) pairs."""
+    plugin_path = path / _PLUGIN_NAME
+    plugin_path.makedirs()
+    sources = []
+    for number in range(module_count):
+        module = plugin_path / f"module_{number}.py"
+        module.write_text(
+            "\n\n".join(
+                f"def function_{x}(value):\n"
+                f'    """Return the value times {x}."""\n'
+                f"    return [value * {x} for _ in range({x})]\n"
+                for x in range(function_count)
+            ),
+        )
+        sources.append((module, module.relpath(path).replace("\\", "/")))
+
+    init = plugin_path / "__init__.py"
+    init.write_text(
+        "".join(f"from . import module_{x}\n" for x in range(module_count)),
+    )
+    sources.append((init, f"{_PLUGIN_NAME}/__init__.py"))
+    return sources
+
+
+def _time_import(path, repeat):
+    """Return the fastest time to import the plugin in a new interpreter."""
+    env = dict(environ, PYTHONDONTWRITEBYTECODE="1", PYTHONPATH=path)
+    return min(
+        float(
+            run(
+                [executable, "-c", _IMPORT_SCRIPT],
+                env=env, capture_output=True, text=True, check=True,
+            ).stdout,
+        )
+        for _ in range(repeat)
+    )
+
+
+# =============================================================================
+# >> CALL MAIN FUNCTION
+# =============================================================================
+if __name__ == "__main__":
+    _parser = ArgumentParser(description=__doc__.splitlines()[0])
+    _parser.add_argument("--modules", type=int, default=50)
+    _parser.add_argument("--functions", type=int, default=200)
+    _parser.add_argument("--repeat", type=int, default=5)
+    _args = _parser.parse_args()
+
+    _source, _bytecode = benchmark_bytecode_import(
+        _args.modules, _args.functions, _args.repeat,
+    )
+    print(f"Import from source:   {_source:.3f}s")
+    print(f"Import from bytecode: {_bytecode:.3f}s")
@@ -0,0 +1,82 @@
+# ../benchmarks/link_strategies.py
+
+"""Compares the cost of each link strategy on a large asset plugin.
+
+Execute with the packages directory on the PYTHONPATH:
+
+    python -m benchmarks.link_strategies --files 500 --size 1048576
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from argparse import ArgumentParser
+from os import urandom
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+# Package
+from common.functions import LINK_STRATEGIES, mirror_directory
+
+# Site-package
+from path import Path
+
+
+# =============================================================================
+# >> MAIN FUNCTION
+# =============================================================================
+def benchmark_link_strategies(file_count, file_size):
+    """Return the cold and warm link times for each strategy."""
+    results = {}
+    with TemporaryDirectory() as temp_dir:
+        src = Path(temp_dir) / "plugin" / "materials"
+        _create_assets(src, file_count, file_size)
+
+        for strategy in LINK_STRATEGIES:
+            dest = Path(temp_dir) / strategy / "materials"
+            dest.makedirs()
+
+            start = perf_counter()
+            mirror_directory(src, dest, strategy)
+            cold = perf_counter() - start
+
+            # Nothing has changed, so this is the cost of checking
+            start = perf_counter()
+            mirror_directory(src, dest, strategy)
+            warm = perf_counter() - start
+
+            results[strategy] = (cold, warm)
+
+    return results
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _create_assets(path, file_count, file_size):
+    """Create the given number of random asset files."""
+    for number in range(file_count):
+        file = path / f"texture_{number // 100}" / f"texture_{number}.vtf"
+        if not file.parent.is_dir():
+            file.parent.makedirs()
+        file.write_bytes(urandom(file_size))
+
+
+# =============================================================================
+# >> CALL MAIN FUNCTION
+# =============================================================================
+if __name__ == "__main__":
+    _parser = ArgumentParser(description=__doc__.splitlines()[0])
+    _parser.add_argument("--files", type=int, default=200)
+    _parser.add_argument("--size", type=int, default=1024 * 1024)
+    _args = _parser.parse_args()
+
+    print(
+        f"Linking {_args.files} files of {_args.size} bytes each.\n",
+    )
+    print(f"{'strategy':<10}{'cold (s)':>12}{'warm (s)':>12}")
+    for _strategy, (_cold, _warm) in benchmark_link_strategies(
+        _args.files, _args.size,
+    ).items():
+        print(f"{_strategy:<10}{_cold:>12.3f}{_warm:>12.3f}")
@@ -0,0 +1,92 @@
+# ../benchmarks/runner.py
+
+"""Times each tool's library functions within a generated workspace.
+
+This is executed by benchmarks.suite in a new interpreter, with
+PLUGIN_HELPERS_START_DIR set to the workspace's plugins directory.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from contextlib import redirect_stdout
+from io import StringIO
+from json import dumps
+from sys import argv
+from time import perf_counter
+
+# Package
+from artifacts.releases import create_release
+from benchmarks.workspace import reset_workspace
+from checks.checker import check_plugin
+from common.constants import START_DIR, plugin_list
+from common.linker import link_plugin
+from plugin_creater import create_plugin
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the number of plugins to create each run
+_CREATE_COUNT = 5
+
+# Store the options to create plugins with
+_create_options = {
+    "commands": True,
+    "config": True,
+    "events": True,
+    "rules": True,
+    "settings": True,
+    "sounds": True,
+    "data": "file",
+    "translations": True,
+}
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def run_benchmarks(repeat):
+    """Return the fastest time of each tool across the given repeats."""
+    results = {}
+    for _ in range(repeat):
+        reset_workspace(START_DIR.parent)
+        for tool, seconds in _time_tools().items():
+            results[tool] = min(seconds, results.get(tool, seconds))
+    return results
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _time_tools():
+    """Return the time each tool takes to process the workspace once."""
+    names = [f"gg_created_{x}" for x in range(_CREATE_COUNT)]
+    times = {}
+    with redirect_stdout(StringIO()):
+        start = perf_counter()
+        for plugin_name in names:
+            create_plugin(plugin_name, **_create_options)
+        times["create_plugin"] = perf_counter() - start
+
+        for tool, function in (
+            ("link_plugin", link_plugin),
+            ("check_plugin", check_plugin),
+            ("create_release", create_release),
+        ):
+            start = perf_counter()
+            for plugin_name in plugin_list:
+                function(plugin_name)
+            times[tool] = perf_counter() - start
+
+    for plugin_name in names:
+        START_DIR.joinpath(plugin_name).rmtree_p()
+
+    return times
+
+
+# =============================================================================
+# >> CALL MAIN FUNCTION
+# =============================================================================
+if __name__ == "__main__":
+    print(dumps(run_benchmarks(int(argv[1]))))
@@ -0,0 +1,125 @@
+# ../benchmarks/suite.py
+
+"""Benchmarks the tools at several scales and compares them to a baseline.
+
+Execute with the packages directory on the PYTHONPATH:
+
+    python -m benchmarks.suite --save
+    python -m benchmarks.suite --threshold 0.2
+
+The first stores the results as the baseline.  The second exits with an
+error if any tool is more than 20% slower than its baseline.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from argparse import ArgumentParser
+from json import dumps, loads
+from os import environ, pathsep
+from subprocess import run
+from sys import executable
+from tempfile import TemporaryDirectory
+
+# Package
+from benchmarks.workspace import Scale, create_workspace
+from common.constants import DATA_DIR, HELPERS_DIR
+
+# Site-package
+from path import Path
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the workspace sizes to benchmark
+scales = {
+    "small": Scale(5, 10, 16 * 1024, 1),
+    "medium": Scale(20, 40, 64 * 1024, 2),
+    "large": Scale(50, 100, 256 * 1024, 3),
+}
+
+# Store the default baseline file
+BASELINE_FILE = DATA_DIR / "benchmarks.json"
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def run_suite(scale_names, repeat):
+    """Return the results of each tool at each of the given scales."""
+    results = {}
+    for scale_name in scale_names:
+        with TemporaryDirectory() as temp_dir:
+            create_workspace(temp_dir, scales[scale_name])
+            env = dict(
+                environ,
+                PLUGIN_HELPERS_START_DIR=Path(temp_dir) / "plugins",
+                PYTHONPATH=pathsep.join(
+                    [HELPERS_DIR / "packages", environ.get("PYTHONPATH", "")],
+                ),
+            )
+            output = run(
+                [executable, "-m", "benchmarks.runner", str(repeat)],
+                env=env, capture_output=True, text=True, check=True,
+            ).stdout
+
+            # Subprocesses, such as ruff, also print, so use the last line
+            results[scale_name] = loads(output.splitlines()[-1])
+    return results
+
+
+def find_regressions(results, baseline, threshold):
+    """Return the results that are slower than the baseline allows."""
+    return [
+        (scale_name, tool, seconds, baseline[scale_name][tool])
+        for scale_name, tools in results.items()
+        for tool, seconds in tools.items()
+        if tool in baseline.get(scale_name, {})
+        and seconds > baseline[scale_name][tool] * (1 + threshold)
+    ]
+
+
+# =============================================================================
+# >> CALL MAIN FUNCTION
+# =============================================================================
+if __name__ == "__main__":
+    _parser = ArgumentParser(description=__doc__.splitlines()[0])
+    _parser.add_argument(
+        "--scales", nargs="+", choices=scales, default=list(scales),
+    )
+    _parser.add_argument("--repeat", type=int, default=3)
+    _parser.add_argument("--threshold", type=float, default=0.2)
+    _parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    _parser.add_argument(
+        "--save", action="store_true", help="store the results as baseline",
+    )
+    _args = _parser.parse_args()
+
+    _results = run_suite(_args.scales, _args.repeat)
+    for _scale_name, _tools in _results.items():
+        print(f"{_scale_name}:")
+        for _tool, _seconds in _tools.items():
+            print(f"\t{_tool:<16}{_seconds:>10.3f}s")
+
+    if _args.save:
+        _baseline = (
+            loads(_args.baseline.read_text()) if _args.baseline.is_file()
+            else {}
+        )
+        _baseline.update(_results)
+        _args.baseline.parent.makedirs_p()
+        _args.baseline.write_text(dumps(_baseline, indent=4))
+        print(f'Saved baseline to "{_args.baseline}"')
+
+    elif _args.baseline.is_file():
+        _regressions = find_regressions(
+            _results, loads(_args.baseline.read_text()), _args.threshold,
+        )
+        for _scale_name, _tool, _seconds, _previous in _regressions:
+            print(
+                f"Regression: {_tool} ({_scale_name}) took {_seconds:.3f}s, "
+                f"baseline {_previous:.3f}s",
+            )
+        if _regressions:
+            raise SystemExit(1)
@@ -0,0 +1,201 @@
+# ../benchmarks/workspace.py
+
+"""Generates synthetic GunGame plugin workspaces for benchmarking."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from random import Random
+from subprocess import run
+from sys import executable
+from typing import NamedTuple
+
+# Site-package
+from path import Path
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the translation categories each plugin has a file for
+_translation_categories = ("messages", "commands", "config", "rules")
+
+# Store the languages used in translation files
+_languages = ("en", "de", "es", "fr", "ru")
+
+# Store the asset directories with the extensions to generate within them
+_asset_types = {
+    "materials": ("vtf", "vmt"),
+    "models": ("mdl", "phy", "vvd", "vtx"),
+    "sound": ("mp3", "wav"),
+}
+
+# Store the git arguments used to commit the generated plugins
+_git_commit = [
+    "git", "-c", "user.name=benchmark", "-c", "user.email=benchmark@localhost",
+    "commit", "-q", "-m", "Initial commit",
+]
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Scale(NamedTuple):
+    """Stores the size of a workspace to generate."""
+
+    plugin_count: int
+    files_per_plugin: int
+    asset_size: int
+    depth: int
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def create_workspace(path, scale, seed=0):
+    """Create a workspace at the given path and return its plugin names.
+
+    The workspace's plugins are in <path>/plugins, which is the directory to
+    give the tools as PLUGIN_HELPERS_START_DIR.  The config.ini in that
+    directory points to <path>/GunGame and <path>/Releases.  Each plugin
+    is its own git repository, with files_per_plugin Python modules and as
+    many assets of asset_size bytes, nested depth directories deep.
+    """
+    path = Path(path)
+    start_dir = path / "plugins"
+    start_dir.makedirs_p()
+    _create_config(path, start_dir)
+
+    random = Random(seed)
+    plugin_names = []
+    for number in range(scale.plugin_count):
+        plugin_name = f"gg_bench_{number}"
+        _create_plugin(start_dir / plugin_name, plugin_name, scale, random)
+        plugin_names.append(plugin_name)
+
+    return plugin_names
+
+
+def reset_workspace(path):
+    """Remove everything the tools created in the given workspace."""
+    path = Path(path)
+    for directory in (path / "GunGame", path / "Releases"):
+        directory.rmtree_p()
+    _create_gungame(path / "GunGame")
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _create_config(path, start_dir):
+    """Create the workspace's config.ini and GunGame directories."""
+    start_dir.joinpath("config.ini").write_text(
+        'AUTHOR="benchmark"\n'
+        f'GUNGAME_DIRECTORY="{path / "GunGame"}"\n'
+        f'RELEASE_DIRECTORY="{path / "Releases"}"\n'
+        f'PYTHON_EXECUTABLE="{executable}"\n',
+    )
+    _create_gungame(path / "GunGame")
+
+
+def _create_gungame(gungame_dir):
+    """Create the GunGame directories plugins are linked into."""
+    for args in (
+        ("addons", "source-python", "plugins", "gungame", "plugins", "custom"),
+        ("addons", "source-python", "data", "plugins", "gungame"),
+        ("sound", "source-python", "gungame", "default"),
+        *(
+            (
+                "resource", "source-python", "translations", "gungame",
+                category, "custom_plugins",
+            ) for category in _translation_categories
+        ),
+    ):
+        gungame_dir.joinpath(*args).makedirs_p()
+
+
+def _create_plugin(plugin_path, plugin_name, scale, random):
+    """Create a plugin repository with generated files."""
+    file_count, depth = scale.files_per_plugin, scale.depth
+    code_path = plugin_path.joinpath(
+        "addons", "source-python", "plugins", "gungame", "plugins", "custom",
+        plugin_name,
+    )
+    code_path.makedirs()
+    code_path.joinpath("__init__.py").write_text('"""."""\n')
+    code_path.joinpath("info.ini").write_text('version = "1.0.0"\n')
+    code_path.joinpath("info.py").write_text(
+        '"""Contains plugin information."""\n\n'
+        "from gungame.core.plugins.info import GunGamePluginInfo\n\n"
+        "info = GunGamePluginInfo(__name__)\n",
+    )
+    code_path.joinpath(plugin_name + ".py").write_text('"""."""\n')
+
+    # Create the plugin's modules within nested packages
+    keys = []
+    for number in range(file_count):
+        package = code_path.joinpath(
+            *(
+                f"package_{number % (x + 2)}"
+                for x in range(number % (depth + 1))
+            ),
+        )
+        if not package.is_dir():
+            package.makedirs()
+            package.joinpath("__init__.py").write_text('"""."""\n')
+        key = f"{plugin_name}_message_{number}"
+        keys.append(key)
+        package.joinpath(f"module_{number}.py").write_text(
+            f'"""Module {number}."""\n\n'
+            f'MESSAGE = "{key}"\n\n\n'
+            f"def function_{number}(value):\n"
+            f'    """Return the value with the module\'s number."""\n'
+            f"    return value + {number}\n",
+        )
+
+    # Create the plugin's data file and translations
+    data_file = plugin_path.joinpath(
+        "addons", "source-python", "data", "plugins", "gungame",
+        plugin_name + ".ini",
+    )
+    data_file.parent.makedirs()
+    data_file.write_text(
+        "".join(f"value_{x} = {x}\n" for x in range(file_count)),
+    )
+    for category in _translation_categories:
+        translation_file = plugin_path.joinpath(
+            "resource", "source-python", "translations", "gungame",
+            category, "custom_plugins", plugin_name + ".ini",
+        )
+        translation_file.parent.makedirs()
+        translation_file.write_text(
+            "".join(
+                f"[{key}]\n" + "".join(
+                    f'{language} = "{key} ({language})"\n'
+                    for language in _languages
+                ) + "\n"
+                for key in keys
+            ),
+        )
+
+    # Create the plugin's assets
+    for number in range(file_count):
+        directory, extensions = list(_asset_types.items())[
+            number % len(_asset_types)
+        ]
+        asset = plugin_path.joinpath(
+            directory,
+            *(
+                ("source-python", "gungame", "default")
+                if directory == "sound" else
+                (f"{plugin_name}_{x}" for x in range(number % (depth + 1)))
+            ),
+            f"asset_{number}.{extensions[number % len(extensions)]}",
+        )
+        asset.parent.makedirs_p()
+        asset.write_bytes(random.randbytes(scale.asset_size))
+
+    # Commit the plugin to its own repository
+    run(["git", "init", "-q", "-b", "master"], cwd=plugin_path, check=True)
+    run(["git", "add", "-A"], cwd=plugin_path, check=True)
+    run(_git_commit, cwd=plugin_path, check=True)
@@ -0,0 +1,3 @@
+# ../checks/__init__.py
+
+"""The checks package provides the static passes used by plugin_checker."""
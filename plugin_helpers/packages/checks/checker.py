@@ -0,0 +1,180 @@
+# ../checks/checker.py
+
+"""Checks plugins for standards issues."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Package
+from artifacts.source_assets import (
+    analyze_assets,
+    find_asset_files,
+    find_asset_problems,
+    format_texture_report,
+)
+from checks.hot_paths import (
+    HOT_PATH_REPORT,
+    find_hot_path_issues,
+    format_hot_path_issues,
+    write_hot_path_report,
+)
+from checks.import_cost import format_import_costs, get_import_costs
+from checks.modules import get_code_path
+from common.constants import START_DIR, plugin_list
+from common.file_index import get_dirty_files, mark_clean
+from common.functions import (
+    get_plugin_flag,
+    get_plugin_list,
+)
+from common.locks import plugin_locked
+from common.metrics import measured, span, timed_run
+
+# Site-package
+from path import Path
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the passes that can be set in check_passes, in the order they run
+CHECK_PASSES = ("ruff", "import_cost", "assets", "hot_paths")
+
+
+# =============================================================================
+# >> MAIN FUNCTION
+# =============================================================================
+@measured("check")
+@plugin_locked
+def check_plugin(plugin_name, *, strict=False):
+    """Check the given plugin for standards issues.
+
+    Returns whether the plugin was checked.  When strict, returns whether
+    it was checked without ruff or the assets pass finding any issues.
+    """
+    # Was an invalid plugin name given?
+    if plugin_name not in plugin_list:
+        print(
+            f'Invalid plugin name "{plugin_name}"',
+        )
+        return False
+
+    # Were any unknown passes set for the plugin?
+    passes = get_plugin_list(plugin_name, "check_passes") or ["ruff"]
+    unknown = sorted(set(passes) - set(CHECK_PASSES))
+    if unknown:
+        print(
+            f'Unknown check passes for "{plugin_name}": {", ".join(unknown)}',
+        )
+        return False
+
+    # Run each of the plugin's passes
+    output = ""
+    passed = True
+    if "ruff" in passes:
+        output, passed = _run_ruff(plugin_name)
+    if "import_cost" in passes:
+        with span("import_cost", plugin=plugin_name):
+            costs = get_import_costs(plugin_name)
+        output += (
+            "Estimated import-time cost of each module, highest first:\n"
+            + format_import_costs(costs)
+        )
+    if "assets" in passes:
+        assets_output, assets_passed = _check_assets(plugin_name)
+        output += assets_output
+        passed = passed and assets_passed
+
+    # Print the results at once, as plugins may be checked in parallel
+    #   The hot_paths pass is run by check_hot_paths for every plugin at once.
+    print(f'Checking plugin "{plugin_name}"\n' + output)
+    return passed or not strict
+
+
+def check_plugin_strictly(plugin_name):
+    """Check the given plugin and return whether no issues were found.
+
+    Used by the builder, whose check task fails while the plugin has
+    issues, so the plugin is not released.
+    """
+    return check_plugin(plugin_name, strict=True)
+
+
+def check_hot_paths(plugin_names):
+    """Check the callbacks of the given plugins for expensive work.
+
+    Every plugin is checked at once, and the issues are also written as
+    JSON to HOT_PATH_REPORT.
+    """
+    with span("hot_paths", plugins=len(plugin_names)):
+        issues = find_hot_path_issues(plugin_names)
+    write_hot_path_report(issues)
+
+    for plugin_name, plugin_issues in issues.items():
+        print(
+            f'Checking callbacks of plugin "{plugin_name}"\n'
+            + format_hot_path_issues(plugin_issues),
+        )
+    print(f'Callback issues written to "{HOT_PATH_REPORT}"\n')
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _check_assets(plugin_name):
+    """Analyze the plugin's materials and models and return the output."""
+    with span("assets", plugin=plugin_name) as phase:
+        files = find_asset_files(START_DIR / plugin_name)
+        assets = analyze_assets(files)
+        phase.add(files=len(files))
+    problems = find_asset_problems(
+        assets, get_plugin_list(plugin_name, "external_assets"),
+    )
+    return (
+        "Textures, by the bytes a compressed format would save:\n"
+        + format_texture_report(assets)
+        + "".join(f"{x}\n" for x in problems)
+    ), not problems
+
+
+def _run_ruff(plugin_name):
+    """Check the plugin with ruff and return the output and if it passed."""
+    # Should only the files changed since the last check be checked?
+    plugin_path = get_code_path(plugin_name)
+    if not get_plugin_flag(plugin_name, "use_file_index"):
+        output = timed_run(
+            ["ruff", "check", plugin_path],
+            capture_output=True, text=True, check=False,
+        )
+        return output.stdout + output.stderr, output.returncode == 0
+
+    # Get the Python files changed since the last check
+    dirty = get_dirty_files("check", plugin_name)
+    prefix = plugin_path.relpath(START_DIR / plugin_name).replace("\\", "/")
+    changed = {
+        x: Path(plugin_name).joinpath(*x.split("/"))
+        for x in sorted(dirty.changed)
+        if x.startswith(f"{prefix}/") and x.endswith(".py")
+    }
+
+    # Were no Python files changed?
+    if not changed:
+        mark_clean("check", plugin_name, dirty.changed | dirty.removed)
+        return "No changed files to check with ruff\n", True
+
+    # Check the files from the start directory, which ruff reports them from
+    output = timed_run(
+        ["ruff", "check", *changed.values()],
+        cwd=START_DIR, capture_output=True, text=True, check=False,
+    )
+
+    # Files with issues stay dirty, so they are checked again next time
+    #   Every file stays dirty if ruff itself failed.
+    issues = set(changed) if output.returncode > 1 else {
+        x for x, y in changed.items() if f"{y}:" in output.stdout
+    }
+    mark_clean(
+        "check", plugin_name, (dirty.changed | dirty.removed) - issues,
+    )
+    return (
+        f"Checking {len(changed)} changed files with ruff\n"
+        + output.stdout + output.stderr
+    ), output.returncode == 0
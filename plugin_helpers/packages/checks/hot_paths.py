@@ -0,0 +1,220 @@
+# ../checks/hot_paths.py
+
+"""Finds known expensive work within the callbacks plugins run during play.
+
+Callbacks are found from their decorators, such as Event("player_death")
+and register_command_callback.  Opening files, parsing ConfigObj, JSON, or
+XML, compiling regular expressions, and looping over every player are
+reported within them, as that work is done every time the callback runs
+and shows up as server frame time spikes.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import ast
+from json import dumps
+from time import strftime
+from typing import NamedTuple
+
+# Package
+from checks.modules import (
+    get_call_name,
+    get_code_path,
+    get_expensive_call,
+    get_plugin_modules,
+)
+from common.constants import DATA_DIR, START_DIR
+from common.functions import get_temp_path, move_into_place
+from common.pools import map_in_processes
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the path of the report written for other tools to read
+HOT_PATH_REPORT = DATA_DIR / "hot_paths.json"
+
+# Store the kind of callback each decorator registers, by its name
+_callback_decorators = {
+    "commands.client.ClientCommand": "command",
+    "commands.say.SayCommand": "command",
+    "commands.server.ServerCommand": "command",
+    "commands.typed.TypedClientCommand": "command",
+    "commands.typed.TypedSayCommand": "command",
+    "commands.typed.TypedServerCommand": "command",
+    "entities.hooks.EntityPostHook": "hook",
+    "entities.hooks.EntityPreHook": "hook",
+    "events.Event": "event",
+    "events.hooks.PreEvent": "event",
+    "gungame.core.commands.registration.register_command_callback": (
+        "command"
+    ),
+}
+
+# Store the names that iterating over (or up to) loops over every player
+_player_collections = {
+    "engines.server.global_vars.max_clients",
+    "filters.players.PlayerIter",
+    "gungame.core.players.dictionary.player_dictionary",
+    "players.helpers.playerinfo_iter",
+}
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class HotPathIssue(NamedTuple):
+    """Stores expensive work found within a callback."""
+
+    file: str
+    line: int
+    column: int
+    callback: str
+    trigger: str
+    kind: str
+    description: str
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def find_hot_path_issues(plugin_names):
+    """Return the HotPathIssues of each of the given plugins.
+
+    Plugins with a lot of code are checked in parallel, one process per
+    CPU.
+    """
+    plugin_names = list(plugin_names)
+    code_paths = [get_code_path(x) for x in plugin_names]
+    return dict(
+        zip(
+            plugin_names,
+            map_in_processes(
+                find_plugin_hot_paths, plugin_names,
+                size=sum(
+                    x.size for path in code_paths if path.is_dir()
+                    for x in path.walkfiles("*.py")
+                ),
+            ),
+            strict=True,
+        ),
+    )
+
+
+def find_plugin_hot_paths(plugin_name):
+    """Return the HotPathIssues of the given plugin."""
+    issues = []
+    for module in get_plugin_modules(plugin_name).values():
+
+        # Skip modules that cannot be parsed, as the ruff pass reports them
+        if isinstance(module, SyntaxError):
+            continue
+
+        file = module.path.relpath(START_DIR).replace("\\", "/")
+        for node in ast.walk(module.tree):
+            if not isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+                continue
+
+            # Is the function not registered as a callback?
+            trigger = _get_trigger(node, module.aliases)
+            if trigger is None:
+                continue
+
+            issues.extend(
+                HotPathIssue(
+                    file, line, column, node.name, trigger, kind, description,
+                )
+                for line, column, kind, description in _find_expensive_work(
+                    node, module.aliases,
+                )
+            )
+    return issues
+
+
+def write_hot_path_report(issues):
+    """Write the given issues of each plugin as JSON to HOT_PATH_REPORT."""
+    DATA_DIR.makedirs_p()
+    temp = get_temp_path(HOT_PATH_REPORT)
+    temp.write_text(
+        dumps(
+            {
+                "created": strftime("%Y-%m-%d %H:%M:%S"),
+                "plugins": {
+                    plugin_name: [x._asdict() for x in plugin_issues]
+                    for plugin_name, plugin_issues in issues.items()
+                },
+            },
+            indent=2,
+        ),
+    )
+    move_into_place(temp, HOT_PATH_REPORT)
+
+
+def format_hot_path_issues(issues):
+    """Return the given issues of a plugin as printable lines."""
+    if not issues:
+        return "No expensive work found within callbacks\n"
+
+    return "".join(
+        f"{x.file}:{x.line}:{x.column}: {x.kind} {x.description} "
+        f"in {x.callback} ({x.trigger})\n"
+        for x in issues
+    )
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _get_trigger(node, aliases):
+    """Return what runs the function, if it is decorated as a callback."""
+    for decorator in node.decorator_list:
+        function = (
+            decorator.func if isinstance(decorator, ast.Call) else decorator
+        )
+        name = get_call_name(function, aliases)
+        if name is None:
+            continue
+
+        # Is this a listener, such as OnTick or OnClientActive?
+        kind = _callback_decorators.get(name)
+        if kind is None and name.startswith("listeners.On"):
+            kind = "listener"
+        if kind is None:
+            continue
+
+        # Add the events or commands the decorator was given
+        names = [
+            x.value for x in getattr(decorator, "args", [])
+            if isinstance(x, ast.Constant) and isinstance(x.value, str)
+        ]
+        return f"{kind} {', '.join(names or [name.rsplit('.', 1)[-1]])}"
+
+    return None
+
+
+def _find_expensive_work(function, aliases):
+    """Yield the position, kind, and description of expensive work."""
+    # Only the body runs with the callback, not the decorators or defaults
+    for node in (x for y in function.body for x in ast.walk(y)):
+        if isinstance(node, ast.Call):
+            found = get_expensive_call(node, aliases)
+            if found is not None:
+                yield node.lineno, node.col_offset + 1, *found
+
+        # Does the loop or comprehension go over every player?
+        elif isinstance(node, ast.For | ast.AsyncFor | ast.comprehension):
+            if _is_player_loop(node.iter, aliases):
+                yield (
+                    node.iter.lineno, node.iter.col_offset + 1,
+                    "player_loop", "loops over every player",
+                )
+
+
+def _is_player_loop(iterable, aliases):
+    """Return whether iterating over the expression loops over players."""
+    return any(
+        isinstance(node, ast.Name | ast.Attribute)
+        and get_call_name(node, aliases) in _player_collections
+        for node in ast.walk(iterable)
+    )
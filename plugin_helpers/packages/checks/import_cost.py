@@ -0,0 +1,261 @@
+# ../checks/import_cost.py
+
+"""Estimates the work each of a plugin's modules does when it is imported.
+
+Only code that runs at import time is inspected: the module's body, class
+bodies, decorators, and default values, but not function bodies.  Each
+statement that does I/O, registers with GunGame, compiles a regular
+expression, loops, or builds a large literal is given an estimated cost.
+A module's total cost includes every plugin module it imports, directly or
+not, so the modules that stall a plugin's load the most are ranked first.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import ast
+from typing import NamedTuple
+
+# Package
+from checks.modules import (
+    get_call_name,
+    get_expensive_call,
+    get_imported_modules,
+    get_plugin_modules,
+)
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the estimated cost of each kind of import-time work
+_kind_costs = {
+    "file_io": 10,
+    "parsing": 10,
+    "registration": 5,
+    "regex": 2,
+    "loop": 1,
+    "literal": 1,
+}
+
+# Store how many times more work done within a loop is estimated to cost
+_LOOP_FACTOR = 10
+
+# Store the number of items a literal needs to count as large
+#   Each multiple of this number adds the literal cost once.
+_LARGE_LITERAL = 100
+
+# Store the GunGame calls the premade plugin files make at import time
+_gungame_calls = {
+    "gungame.core.config.manager.GunGameConfigManager": (
+        "file_io", "creates or updates the plugin's config file",
+    ),
+    "gungame.core.events.resource.GGResourceFile": (
+        "file_io", "writes the custom events' resource file",
+    ),
+    "gungame.core.plugins.info.GunGamePluginInfo": (
+        "file_io", "reads the plugin's info.ini",
+    ),
+    "gungame.core.rules.instance.GunGameRules": (
+        "registration", "registers the plugin's rules",
+    ),
+    "gungame.core.settings.gungame_player_settings.add_section": (
+        "registration", "adds a player settings section",
+    ),
+    "gungame.core.sounds.manager.sound_manager.register_sound": (
+        "registration", "registers a sound",
+    ),
+}
+
+# Store the comprehensions, which loop over their iterables
+_comprehensions = (
+    ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp,
+)
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class CostlyStatement(NamedTuple):
+    """Stores a statement that does work when its module is imported."""
+
+    line: int
+    kind: str
+    cost: int
+    description: str
+
+
+class ModuleCost(NamedTuple):
+    """Stores the estimated import-time cost of a module."""
+
+    name: str
+    own_cost: int
+    total_cost: int
+    imports: tuple
+    statements: tuple
+
+
+class _ImportTimeVisitor(ast.NodeVisitor):
+    """Collects the work a module does while it is being imported."""
+
+    def __init__(self, aliases):
+        """Store the module's imports and prepare the results."""
+        self.aliases = aliases
+        self.statements = []
+        self.imports = []
+        self._loops = 0
+        self._literals = 0
+
+    def visit(self, node):
+        """Visit the node, skipping code that does not run at import time."""
+        # Do only the decorators and default values of functions run?
+        if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+            self._visit_all(node.decorator_list)
+            self._visit_all(node.args.defaults)
+            self._visit_all(node.args.kw_defaults)
+        elif isinstance(node, ast.Lambda):
+            self._visit_all(node.args.defaults)
+            self._visit_all(node.args.kw_defaults)
+
+        # Store imports, to build the module's imports
+        elif isinstance(node, ast.Import | ast.ImportFrom):
+            self.imports.append(node)
+
+        # Is the work within the node done repeatedly?
+        elif isinstance(node, ast.For | ast.AsyncFor | ast.While):
+            self._visit_loop(node, "runs a loop")
+        elif isinstance(node, _comprehensions):
+            self._visit_loop(node, "builds a comprehension")
+
+        elif isinstance(node, ast.Call):
+            self._visit_call(node)
+        elif isinstance(node, ast.List | ast.Tuple | ast.Set | ast.Dict):
+            self._visit_literal(node)
+        else:
+            self.generic_visit(node)
+
+    def _visit_call(self, node):
+        """Add the call if it is known to be expensive."""
+        found = get_expensive_call(node, self.aliases) or _gungame_calls.get(
+            get_call_name(node.func, self.aliases),
+        )
+        if found is not None:
+            self._add(node, *found)
+        self.generic_visit(node)
+
+    def _visit_literal(self, node):
+        """Add the literal if it is large, counting any nested literals."""
+        if not self._literals:
+            items = sum(
+                isinstance(x, ast.Constant | ast.Name) for x in ast.walk(node)
+            )
+            if items >= _LARGE_LITERAL:
+                self._add(
+                    node, "literal", f"builds a literal of {items} items",
+                    items // _LARGE_LITERAL,
+                )
+        self._literals += 1
+        self.generic_visit(node)
+        self._literals -= 1
+
+    def _visit_all(self, nodes):
+        """Visit each of the given nodes."""
+        for child in nodes:
+            if child is not None:
+                self.visit(child)
+
+    def _visit_loop(self, node, description):
+        """Add the loop and visit its children as being within a loop."""
+        self._add(node, "loop", description)
+        self._loops += 1
+        self.generic_visit(node)
+        self._loops -= 1
+
+    def _add(self, node, kind, description, count=1):
+        """Add the statement with its estimated cost."""
+        cost = _kind_costs[kind] * count
+        if self._loops and kind != "loop":
+            cost *= _LOOP_FACTOR
+            description += " within a loop"
+        self.statements.append(
+            CostlyStatement(node.lineno, kind, cost, description),
+        )
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_import_costs(plugin_name):
+    """Return the ModuleCost of each of the plugin's modules, highest first.
+
+    Modules that cannot be parsed are left out, as the ruff pass reports
+    them.
+    """
+    modules = {
+        name: module for name, module in get_plugin_modules(plugin_name).items()
+        if not isinstance(module, SyntaxError)
+    }
+
+    # Get the work and imports of each module
+    own = {}
+    graph = {}
+    for name, module in modules.items():
+        visitor = _ImportTimeVisitor(module.aliases)
+        visitor.visit(module.tree)
+        own[name] = tuple(visitor.statements)
+        graph[name] = get_imported_modules(module, modules, visitor.imports)
+
+    # Add the cost of every module each module imports
+    costs = []
+    for name in modules:
+        imported = _get_transitive_imports(name, graph)
+        own_cost = sum(x.cost for x in own[name])
+        costs.append(
+            ModuleCost(
+                name, own_cost,
+                own_cost + sum(sum(y.cost for y in own[x]) for x in imported),
+                tuple(sorted(graph[name])), own[name],
+            ),
+        )
+
+    return sorted(costs, key=lambda x: (-x.total_cost, x.name))
+
+
+def format_import_costs(costs):
+    """Return the given module costs as a printable table."""
+    if not any(x.total_cost for x in costs):
+        return "\tNo import-time work found\n"
+
+    lines = [f"\t{'total':>6}{'own':>6}  module"]
+    for module in costs:
+        if not module.total_cost:
+            continue
+        lines.append(
+            f"\t{module.total_cost:>6}{module.own_cost:>6}  {module.name}",
+        )
+        lines.extend(
+            f"\t{'':>14}line {x.line}: {x.description} ({x.cost})"
+            for x in sorted(module.statements, key=lambda x: -x.cost)
+        )
+
+    # Count the modules that do no import-time work, rather than list them
+    idle = sum(not x.total_cost for x in costs)
+    if idle:
+        lines.append(f"\t{idle} other modules do no import-time work")
+    return "\n".join(lines) + "\n"
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _get_transitive_imports(name, graph):
+    """Return every module the given module imports, directly or not."""
+    found = set()
+    waiting = list(graph[name])
+    while waiting:
+        current = waiting.pop()
+        if current in found or current == name:
+            continue
+        found.add(current)
+        waiting.extend(graph[current])
+    return found
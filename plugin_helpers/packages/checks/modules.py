@@ -0,0 +1,204 @@
+# ../checks/modules.py
+
+"""Finds and parses the Python modules of a plugin for the static checks.
+
+Calls are resolved through the module's imports, so a call to ConfigObj
+imported from configobj is known as configobj.ConfigObj, and can be
+matched against the tables of known expensive calls.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import ast
+from typing import NamedTuple
+
+# Package
+from common.constants import START_DIR
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the package that every plugin's code is imported from
+PLUGIN_PACKAGE = "gungame.plugins.custom"
+
+# Store the kind and description of known expensive calls, by their name
+_expensive_calls = {
+    "open": ("file_io", "opens a file"),
+    "io.open": ("file_io", "opens a file"),
+    "os.listdir": ("file_io", "lists a directory"),
+    "os.scandir": ("file_io", "lists a directory"),
+    "os.walk": ("file_io", "walks a directory"),
+    "glob.glob": ("file_io", "lists files matching a pattern"),
+    "glob.iglob": ("file_io", "lists files matching a pattern"),
+    "shutil.copyfile": ("file_io", "copies a file"),
+    "configobj.ConfigObj": ("parsing", "parses a ConfigObj file"),
+    "json.load": ("parsing", "parses a JSON file"),
+    "json.loads": ("parsing", "parses JSON"),
+    "pickle.load": ("parsing", "unpickles a file"),
+    "pickle.loads": ("parsing", "unpickles data"),
+    "xml.etree.ElementTree.parse": ("parsing", "parses an XML file"),
+    "xml.etree.ElementTree.fromstring": ("parsing", "parses XML"),
+    "translations.strings.LangStrings": (
+        "parsing", "parses a translation file",
+    ),
+    "re.compile": ("regex", "compiles a regular expression"),
+}
+
+# Store the kind and description of expensive methods of any object
+#   These are the file methods of path.Path and pathlib.Path, which are
+#   usually called on paths built at runtime, so their names cannot be
+#   resolved through the imports.
+_expensive_methods = {
+    "read_text": ("file_io", "reads a file"),
+    "read_bytes": ("file_io", "reads a file"),
+    "write_text": ("file_io", "writes a file"),
+    "write_bytes": ("file_io", "writes a file"),
+    "iterdir": ("file_io", "lists a directory"),
+    "listdir": ("file_io", "lists a directory"),
+    "walkfiles": ("file_io", "walks a directory"),
+    "rglob": ("file_io", "walks a directory"),
+}
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class PluginModule(NamedTuple):
+    """Stores a parsed module of a plugin."""
+
+    name: str
+    path: object
+    tree: ast.Module
+    aliases: dict
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_code_path(plugin_name):
+    """Return the directory of the plugin's Python code."""
+    return START_DIR.joinpath(
+        plugin_name, "addons", "source-python", "plugins",
+        "gungame", "plugins", "custom", plugin_name,
+    )
+
+
+def get_plugin_modules(plugin_name):
+    """Return the plugin's parsed modules, mapped by their dotted name.
+
+    Names are relative to the custom plugins package, so the plugin's
+    main module is plugin_name.plugin_name.  Modules that cannot be parsed
+    are returned as the SyntaxError they raised.
+    """
+    code_path = get_code_path(plugin_name)
+    modules = {}
+    if not code_path.is_dir():
+        return modules
+
+    for file in sorted(code_path.walkfiles("*.py")):
+        parts = [plugin_name, *file.relpath(code_path).splitall()[1:]]
+        parts[-1] = parts[-1][:-3]
+        if parts[-1] == "__init__":
+            parts.pop()
+        name = ".".join(parts)
+        try:
+            tree = ast.parse(file.read_bytes(), filename=str(file))
+        except SyntaxError as e:
+            modules[name] = e
+            continue
+        modules[name] = PluginModule(name, file, tree, get_aliases(tree))
+    return modules
+
+
+def get_aliases(tree):
+    """Return the full dotted name of each name imported within the tree."""
+    aliases = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname is None:
+                    top = alias.name.split(".")[0]
+                    aliases[top] = top
+                else:
+                    aliases[alias.asname] = alias.name
+        elif isinstance(node, ast.ImportFrom) and not node.level:
+            for alias in node.names:
+                aliases[alias.asname or alias.name] = (
+                    f"{node.module}.{alias.name}"
+                )
+    return aliases
+
+
+def get_call_name(node, aliases):
+    """Return the dotted name of the called object, resolved by the imports.
+
+    None is returned when the call is not made on a chain of names, such
+    as a call on the result of another call.
+    """
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(aliases.get(node.id, node.id))
+    return ".".join(reversed(parts))
+
+
+def get_expensive_call(node, aliases):
+    """Return the kind and description of the call, if it is expensive."""
+    name = get_call_name(node.func, aliases)
+    if name in _expensive_calls:
+        return _expensive_calls[name]
+    if isinstance(node.func, ast.Attribute):
+        return _expensive_methods.get(node.func.attr)
+    return None
+
+
+def get_imported_modules(module, modules, nodes=None):
+    """Return the plugin's modules imported by the given module.
+
+    nodes are the import statements to resolve, which default to every
+    import within the module.  Importing a submodule also imports every
+    package above it, so those packages are included.
+    """
+    is_package = module.path.name == "__init__.py"
+    package = module.name if is_package else module.name.rpartition(".")[0]
+    imported = set()
+    for node in ast.walk(module.tree) if nodes is None else nodes:
+        if isinstance(node, ast.Import):
+            targets = [x.name for x in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base = _resolve_from(node, package)
+            if base is None:
+                continue
+            targets = [base] + [f"{base}.{x.name}" for x in node.names]
+        else:
+            continue
+
+        for target in targets:
+            parts = target.removeprefix(f"{PLUGIN_PACKAGE}.").split(".")
+            imported.update(
+                ".".join(parts[:x]) for x in range(1, len(parts) + 1)
+                if ".".join(parts[:x]) in modules
+            )
+
+    imported.discard(module.name)
+    return imported
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _resolve_from(node, package):
+    """Return the absolute module a from import imports from."""
+    if not node.level:
+        return node.module
+
+    parts = package.split(".")
+    if node.level - 1 >= len(parts):
+        return None
+    base = ".".join(parts[:len(parts) - node.level + 1])
+    return f"{base}.{node.module}" if node.module else base
@@ -0,0 +1,203 @@
+# ../common/asset_store.py
+
+"""Stores each unique asset of every plugin once, by the hash of its contents.
+
+Assets (materials, models, and sounds) are hashed using mmap, and a copy
+(or copy-on-write clone) of each unique asset is kept in the data directory.
+The index of each plugin's assets records their size and modification time,
+so only assets that changed since the last update are hashed again.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha1
+from json import dumps, loads
+from mmap import ACCESS_READ, mmap
+from os import cpu_count
+from typing import NamedTuple
+
+# Package
+from common.constants import DATA_DIR, START_DIR
+from common.functions import get_temp_path, link_file, move_into_place
+from common.locks import lock
+from common.metrics import span
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the directories, within a plugin, that hold its assets
+ASSET_DIRECTORIES = ("materials", "models", "sound")
+
+# Store the directory of the asset store
+STORE_DIR = DATA_DIR / "assets"
+
+# Store the file holding the index of each plugin's assets
+INDEX_FILE = STORE_DIR / "index.json"
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class StoredAsset(NamedTuple):
+    """Stores the hash and size of an asset's contents."""
+
+    digest: str
+    size: int
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def update_store(plugin_names):
+    """Add the plugins' assets to the store and return them.
+
+    The return value maps each plugin name to its assets, which map the
+    asset's path (relative to the plugin) to its StoredAsset.
+    """
+    with (
+        lock("asset_store"),
+        span("asset_store", plugins=len(plugin_names)) as phase,
+    ):
+        index = _load_index()
+
+        # Find the assets that changed since they were last hashed
+        assets = {}
+        changed = []
+        for plugin_name in plugin_names:
+            plugin_path = START_DIR / plugin_name
+            for directory in ASSET_DIRECTORIES:
+                if not (plugin_path / directory).is_dir():
+                    continue
+
+                for file in (plugin_path / directory).walkfiles():
+                    name = file.relpath(plugin_path).replace("\\", "/")
+                    key = f"{plugin_name}/{name}"
+                    stat_result = file.stat()
+                    entry = index.get(key)
+                    if (
+                        entry is None or
+                        entry[:2] != [
+                            stat_result.st_size, stat_result.st_mtime_ns,
+                        ] or
+                        not get_blob_path(entry[2]).is_file()
+                    ):
+                        entry = [stat_result.st_size, stat_result.st_mtime_ns]
+                        changed.append((file, entry))
+                    assets[key] = entry
+
+        # Hash the changed assets in parallel
+        workers = min(len(changed), cpu_count() or 1) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for (file, entry), digest in zip(
+                changed, executor.map(hash_asset, [x for x, _ in changed]),
+                strict=True,
+            ):
+                entry[2:] = [digest]
+                _add_blob(file, digest)
+        phase.add(files=len(changed), bytes_read=sum(x[1][0] for x in changed))
+
+        # Store the plugins' current assets, replacing their previous ones
+        updated = {
+            key: value for key, value in index.items()
+            if key.split("/")[0] not in plugin_names
+        }
+        updated.update(assets)
+        if updated != index:
+            _save_index(updated)
+
+    # Get each plugin's assets
+    plugin_assets = {x: {} for x in plugin_names}
+    for key, (size, _mtime, digest) in assets.items():
+        plugin_name, name = key.split("/", 1)
+        plugin_assets[plugin_name][name] = StoredAsset(digest, size)
+    return plugin_assets
+
+
+def hash_asset(path):
+    """Return the SHA-1 hex digest of the file, read through mmap."""
+    digest = sha1(usedforsecurity=False)
+    with path.open("rb") as open_file:
+
+        # Empty files cannot be mapped
+        if path.size:
+            with mmap(open_file.fileno(), 0, access=ACCESS_READ) as contents:
+                digest.update(contents)
+
+    return digest.hexdigest()
+
+
+def get_blob_path(digest):
+    """Return the path of the stored copy of the given asset."""
+    return STORE_DIR / "objects" / digest[:2] / digest[2:]
+
+
+def get_compressed_blob(digest):
+    """Return the CRC and deflated contents of the given stored asset.
+
+    Each asset is only compressed once, as the result is kept alongside
+    the stored copy of the asset.
+    """
+    blob_path = get_blob_path(digest)
+    compressed_path = blob_path.parent / f"{blob_path.name}.deflate"
+    if compressed_path.is_file():
+        data = compressed_path.read_bytes()
+        return int.from_bytes(data[:4], "big"), data[4:]
+
+    # Compress the asset in the format used by zip files
+    contents = blob_path.read_bytes()
+    compressor = zlib.compressobj(
+        zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS,
+    )
+    data = compressor.compress(contents) + compressor.flush()
+    crc = zlib.crc32(contents)
+
+    # Other threads can compress the same asset, so use a unique name
+    temp = get_temp_path(compressed_path)
+    temp.write_bytes(crc.to_bytes(4, "big") + data)
+    move_into_place(temp, compressed_path)
+    return crc, data
+
+
+def find_duplicates(plugin_assets):
+    """Return the assets that have more than one copy, by their hash."""
+    copies = {}
+    for plugin_name, assets in plugin_assets.items():
+        for name, asset in assets.items():
+            copies.setdefault(asset, []).append(f"{plugin_name}/{name}")
+    return {
+        asset: sorted(paths) for asset, paths in copies.items()
+        if len(paths) > 1
+    }
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _add_blob(file, digest):
+    """Store a copy of the file, if its contents are not yet stored."""
+    blob_path = get_blob_path(digest)
+    if blob_path.is_file():
+        return
+    blob_path.parent.makedirs_p()
+    link_file(file, blob_path, "reflink")
+
+
+def _load_index():
+    """Return the index of each plugin's assets."""
+    if not INDEX_FILE.is_file():
+        return {}
+    try:
+        return loads(INDEX_FILE.read_text())
+    except ValueError:
+        return {}
+
+
+def _save_index(index):
+    """Write the index of each plugin's assets."""
+    STORE_DIR.makedirs_p()
+    temp = get_temp_path(INDEX_FILE)
+    temp.write_text(dumps(index, sort_keys=True))
+    move_into_place(temp, INDEX_FILE)
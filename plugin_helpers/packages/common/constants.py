@@ -6,6 +6,7 @@
 # >> IMPORTS
 # =============================================================================
 # Python
+from os import environ
 from platform import system
 
 # Site-Package
@@ -18,11 +19,19 @@ from path import Path
 # Store the platform
 PLATFORM = system().lower()
 
+# Store the plugin helpers directory
+HELPERS_DIR = Path(__file__).parent.parent.parent
+
 # Store the main directory
-START_DIR = Path(__file__).parent.parent.parent.parent
+#   PLUGIN_HELPERS_START_DIR can point the tools at another workspace,
+#   which is how the benchmarks run against generated plugins.
+START_DIR = Path(environ.get("PLUGIN_HELPERS_START_DIR") or HELPERS_DIR.parent)
 
 # Store the premade files location
-PREMADE_FILES_DIR = START_DIR / "plugin_helpers" / "files"
+PREMADE_FILES_DIR = HELPERS_DIR / "files"
+
+# Store the directory for the tools' own data, such as caches and baselines
+DATA_DIR = START_DIR / ".plugin_helpers"
 
 # Get the configuration
 config_obj = ConfigObj(START_DIR / "config.ini")
@@ -41,11 +50,64 @@ GUNGAME_ADDONS_DIR = GUNGAME_DIR.joinpath(
 # Store the Release directory
 RELEASE_DIR = Path(config_obj["RELEASE_DIRECTORY"])
 
+# Store the server directories to deploy releases to
+DEPLOY_DIRS = [
+    Path(x) for x in config_obj.get("DEPLOY_DIRECTORIES", "").split(";")
+    if x.strip()
+]
+
+# Store the FastDL directory to mirror released assets to, if any
+FASTDL_DIR = (
+    Path(config_obj["FASTDL_DIRECTORY"])
+    if config_obj.get("FASTDL_DIRECTORY", "").strip() else None
+)
+
 # Store the Python executable path
 PYTHON_EXE = config_obj["PYTHON_EXECUTABLE"]
 
 SEMANTIC_VERSIONING_COUNT = 3
 
+# Store all allowed readable data file types
+_readable_data = [
+    "ini",
+    "json",
+    "vdf",
+    "xml",
+]
+
+# Store plugin specific directories with their respective allowed file types
+allowed_filetypes = {
+    "addons/source-python/plugins/gungame/plugins/custom": [
+        *_readable_data,
+        "md",
+        "py",
+    ],
+    "addons/source-python/data/plugins/gungame": [
+        *_readable_data,
+        "md",
+        "txt",
+    ],
+    "resource/source-python/translations/gungame": ["ini"],
+}
+
+# Store non-plugin specific directories
+#   with their respective allowed file types
+other_filetypes = {
+    "materials/": ["vmt", "vtf"],
+    "models/": ["mdl", "phy", "vtx", "vvd"],
+}
+
+# Store directories with files that fit allowed_filetypes
+#   with names that should not be included
+exception_filetypes = {
+    "resource/source-python/translations/gungame": [
+        "_server.ini",
+    ],
+}
+
+# Get the per-plugin settings
+plugin_settings = ConfigObj(START_DIR / "plugin_settings.ini")
+
 # Get a list of all plugins
 plugin_list = [
     x.stem for x in START_DIR.dirs()
@@ -0,0 +1,287 @@
+# ../common/dependencies.py
+
+"""Finds the plugins each plugin imports and runs batches in their order.
+
+The imports of each Python file are cached by the file's hash in the data
+directory, so only files that changed since the last run are parsed.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import ast
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from hashlib import sha1
+from json import dumps, loads
+from os import cpu_count
+
+# Package
+from common.constants import DATA_DIR, START_DIR, plugin_list
+from common.functions import get_temp_path, move_into_place
+from common.metrics import span
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the file the imports of each Python file are cached in
+CACHE_FILE = DATA_DIR / "dependencies.json"
+
+# Store the package custom plugins are imported from
+_custom_package = "gungame.plugins.custom."
+
+# Store the path, within a plugin, of its Python files
+_code_path = (
+    "addons", "source-python", "plugins", "gungame", "plugins", "custom",
+)
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_dependency_graph(plugin_names):
+    """Return the given plugins mapped to the custom plugins they import."""
+    with span("dependencies", plugins=len(plugin_names)) as phase:
+        cache = _load_cache()
+        graph = {}
+        used = {}
+        for plugin_name in plugin_names:
+            graph[plugin_name] = set()
+            code_path = START_DIR.joinpath(plugin_name, *_code_path)
+            if not code_path.is_dir():
+                continue
+
+            for file in code_path.walkfiles("*.py"):
+                key = file.relpath(START_DIR).replace("\\", "/")
+                contents = file.read_bytes()
+                digest = sha1(contents, usedforsecurity=False).hexdigest()
+
+                # Was the file changed since it was last parsed?
+                entry = cache.get(key)
+                if entry is None or entry[0] != digest:
+                    entry = [digest, _get_imports(contents, file)]
+                    phase.add(files=1)
+
+                used[key] = entry
+                graph[plugin_name].update(
+                    x for x in entry[1] if x != plugin_name
+                )
+
+        # Keep the other plugins' files, dropping files that were removed
+        updated = {
+            key: value for key, value in cache.items()
+            if key.split("/")[0] not in graph
+        }
+        updated.update(used)
+        if updated != cache:
+            _save_cache(updated)
+
+    return graph
+
+
+def find_cycles(graph):
+    """Return the groups of plugins that import each other."""
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    cycles = []
+
+    # Find the strongly connected plugins (Tarjan's algorithm)
+    def visit(plugin_name):
+        index[plugin_name] = low[plugin_name] = len(index)
+        stack.append(plugin_name)
+        on_stack.add(plugin_name)
+        for dependency in graph[plugin_name]:
+            if dependency not in graph:
+                continue
+            if dependency not in index:
+                visit(dependency)
+                low[plugin_name] = min(low[plugin_name], low[dependency])
+            elif dependency in on_stack:
+                low[plugin_name] = min(low[plugin_name], index[dependency])
+
+        if low[plugin_name] == index[plugin_name]:
+            group = []
+            while not group or group[-1] != plugin_name:
+                group.append(stack.pop())
+                on_stack.discard(group[-1])
+            if len(group) > 1:
+                cycles.append(sorted(group))
+
+    for plugin_name in graph:
+        if plugin_name not in index:
+            visit(plugin_name)
+
+    return cycles
+
+
+def get_run_graph(plugin_names):
+    """Return the given plugins mapped to the given plugins they import.
+
+    Import cycles and imports of plugins that do not exist are printed, and
+    plugins within a cycle are returned without any order between them.
+    """
+    graph = get_dependency_graph(plugin_names)
+
+    # Print the imports of plugins that do not exist
+    for plugin_name, dependencies in graph.items():
+        missing = sorted(dependencies.difference(plugin_list))
+        if missing:
+            print(
+                f'"{plugin_name}" imports plugins that do not exist: '
+                + ", ".join(missing),
+            )
+
+    # Print the cycles and remove them from the graph
+    for cycle in find_cycles(graph):
+        print(f"Import cycle between plugins: {', '.join(cycle)}")
+        for plugin_name in cycle:
+            graph[plugin_name].difference_update(cycle)
+
+    # Only wait for the chosen plugins
+    return {
+        plugin_name: dependencies.intersection(graph)
+        for plugin_name, dependencies in graph.items()
+    }
+
+
+def run_in_order(function, plugin_names, journal=None):
+    """Call the function for each plugin after the plugins it imports.
+
+    Plugins that do not depend on each other are run in parallel.  Import
+    cycles and imports of plugins that do not exist are printed first, and
+    plugins within a cycle are run without any order between them.
+
+    When the function returns False for a plugin, the plugins that import
+    it (directly or not) are not run.  When a Journal is given, plugins the
+    function already completed for are skipped, and each plugin is recorded
+    as completed unless the function returns False.  The batch is finished
+    once every plugin has been completed.
+    """
+    waiting = get_run_graph(plugin_names)
+
+    # Were any of the plugins completed before the batch was interrupted?
+    completed = set()
+    if journal is not None:
+        completed = {
+            x for x in waiting if journal.is_done(x, function.__name__)
+        }
+        for dependencies in waiting.values():
+            dependencies.difference_update(completed)
+
+    workers = min(len(waiting), cpu_count() or 1) or 1
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            failed = _run_batch(
+                executor, function, waiting, completed, journal,
+            )
+
+        # Do not start the plugins that are still queued when interrupted
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
+
+    # Was every plugin completed?
+    if journal is not None and not failed:
+        journal.finish()
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _run_batch(executor, function, waiting, completed, journal):
+    """Run the function for the waiting plugins and return if any failed."""
+    step = function.__name__
+    failed = False
+    running = {}
+    while waiting or running:
+
+        # Start every plugin whose dependencies have finished
+        for plugin_name in [x for x, y in waiting.items() if not y]:
+            del waiting[plugin_name]
+            if plugin_name in completed:
+                continue
+            if journal is not None:
+                journal.plan(plugin_name, step)
+            running[executor.submit(function, plugin_name)] = plugin_name
+
+        # Were the remaining plugins all completed before?
+        if not running:
+            continue
+
+        # Wait for a plugin to finish
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            plugin_name = running.pop(future)
+
+            # Record the plugins that finished before raising any errors
+            if future.exception() is not None:
+                continue
+
+            if future.result() is False:
+                failed = True
+                _skip_dependents(waiting, plugin_name)
+                continue
+            if journal is not None:
+                journal.complete(plugin_name, step)
+            for dependencies in waiting.values():
+                dependencies.discard(plugin_name)
+
+        for future in done:
+            future.result()
+
+    return failed
+
+
+def _skip_dependents(waiting, plugin_name):
+    """Remove the plugins that import the failed plugin from waiting."""
+    failed = [plugin_name]
+    while failed:
+        current = failed.pop()
+        for dependent in [x for x, y in waiting.items() if current in y]:
+            del waiting[dependent]
+            failed.append(dependent)
+            print(
+                f'Not running "{dependent}", as it imports "{current}", '
+                "which failed or was not run",
+            )
+
+
+def _get_imports(contents, file):
+    """Return the custom plugins imported by the given file's contents."""
+    try:
+        tree = ast.parse(contents, str(file))
+    except SyntaxError:
+        return []
+
+    modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update(x.name for x in node.names)
+        elif isinstance(node, ast.ImportFrom) and not node.level:
+            modules.add(node.module)
+            modules.update(f"{node.module}.{x.name}" for x in node.names)
+
+    return sorted({
+        x.removeprefix(_custom_package).split(".")[0]
+        for x in modules if x.startswith(_custom_package)
+    })
+
+
+def _load_cache():
+    """Return the cached imports of each Python file."""
+    if not CACHE_FILE.is_file():
+        return {}
+    try:
+        return loads(CACHE_FILE.read_text())
+    except ValueError:
+        return {}
+
+
+def _save_cache(cache):
+    """Write the cached imports of each Python file."""
+    DATA_DIR.makedirs_p()
+    temp = get_temp_path(CACHE_FILE)
+    temp.write_text(dumps(cache, sort_keys=True))
+    move_into_place(temp, CACHE_FILE)
@@ -0,0 +1,173 @@
+# ../common/file_index.py
+
+"""Keeps the state of every file within each plugin, similar to git's index.
+
+Each plugin's index maps its files to their size, modification time, inode,
+and content hash.  Refreshing the index only hashes files whose stat
+changed.  Tools are consumers of the index, and each consumer records the
+hashes of the files it last handled, so it can ask for the files that
+changed since then (its dirty files).
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from json import dumps, loads
+from os import scandir
+from time import time_ns
+from typing import NamedTuple
+
+# Package
+from common.constants import DATA_DIR, START_DIR
+from common.functions import get_temp_path, hash_file, move_into_place
+from common.locks import lock
+from common.metrics import span
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the directory of each plugin's index
+INDEX_DIR = DATA_DIR / "file_index"
+
+# Store how recently a file can be modified and still be trusted by its stat
+#   A file changed again within the same timestamp tick would keep the same
+#   stat, so recently modified files are hashed again on the next refresh.
+_RACY_NANOSECONDS = 2 * 10 ** 9
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class DirtyFiles(NamedTuple):
+    """Stores the files that changed since a consumer last handled them."""
+
+    changed: frozenset
+    removed: frozenset
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def refresh_index(plugin_name):
+    """Update the plugin's index and return its files mapped to their hash."""
+    with (
+        lock(f"file_index-{plugin_name}"),
+        span("file_index", plugin=plugin_name) as phase,
+    ):
+        index = _load_index(plugin_name)
+        previous = index["files"]
+        files = {}
+        now = time_ns()
+        for name, entry in _scan(START_DIR / plugin_name):
+            stat_result = entry.stat(follow_symlinks=False)
+            state = [
+                stat_result.st_size, stat_result.st_mtime_ns, entry.inode(),
+            ]
+
+            # Has the file not changed since it was last hashed?
+            if previous.get(name, [])[:3] == state:
+                files[name] = previous[name]
+                continue
+
+            phase.add(files=1, bytes_read=stat_result.st_size)
+            digest = hash_file(entry.path)
+
+            # Was the file modified too recently for its stat to be trusted?
+            if now - stat_result.st_mtime_ns < _RACY_NANOSECONDS:
+                state[1] = -1
+
+            files[name] = [*state, digest]
+
+        if files != previous:
+            index["files"] = files
+            _save_index(plugin_name, index)
+
+    return {name: state[3] for name, state in files.items()}
+
+
+def get_dirty_files(consumer, plugin_name):
+    """Return the plugin's files that changed since the consumer was clean."""
+    files = refresh_index(plugin_name)
+    handled = _load_index(plugin_name)["consumers"].get(
+        consumer, {},
+    ).get("files", {})
+    return DirtyFiles(
+        frozenset(x for x, y in files.items() if handled.get(x) != y),
+        frozenset(handled.keys() - files.keys()),
+    )
+
+
+def mark_clean(consumer, plugin_name, names=None, **data):
+    """Record that the consumer has handled the given files of the plugin.
+
+    names defaults to every file in the plugin's index.  Any keyword
+    arguments are stored with the consumer's record, to be retrieved with
+    get_consumer_data.
+    """
+    with lock(f"file_index-{plugin_name}"):
+        index = _load_index(plugin_name)
+        files = {x: y[3] for x, y in index["files"].items()}
+        record = index["consumers"].setdefault(
+            consumer, {"files": {}, "data": {}},
+        )
+        for name in files if names is None else names:
+            if name in files:
+                record["files"][name] = files[name]
+            else:
+                record["files"].pop(name, None)
+        record["data"].update(data)
+        _save_index(plugin_name, index)
+
+
+def get_consumer_data(consumer, plugin_name):
+    """Return the data stored with the consumer's record for the plugin."""
+    return _load_index(plugin_name)["consumers"].get(
+        consumer, {},
+    ).get("data", {})
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _scan(path, prefix=""):
+    """Yield the name and directory entry of each file within the path."""
+    with scandir(path) as entries:
+        for entry in entries:
+
+            # Skip hidden files and directories, such as .git
+            if entry.name.startswith("."):
+                continue
+
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scan(entry.path, f"{prefix}{entry.name}/")
+            elif entry.is_file(follow_symlinks=False):
+                yield f"{prefix}{entry.name}", entry
+
+
+def _get_index_path(plugin_name):
+    """Return the path to the plugin's index."""
+    return INDEX_DIR / f"{plugin_name}.json"
+
+
+def _load_index(plugin_name):
+    """Return the plugin's index."""
+    index_path = _get_index_path(plugin_name)
+    index = {}
+    if index_path.is_file():
+        try:
+            index = loads(index_path.read_text())
+        except ValueError:
+            index = {}
+    index.setdefault("files", {})
+    index.setdefault("consumers", {})
+    return index
+
+
+def _save_index(plugin_name, index):
+    """Write the plugin's index."""
+    INDEX_DIR.makedirs_p()
+    index_path = _get_index_path(plugin_name)
+    temp = get_temp_path(index_path)
+    temp.write_text(dumps(index, separators=(",", ":")))
+    move_into_place(temp, index_path)
@@ -6,11 +6,55 @@
 # >> IMPORTS
 # =============================================================================
 # Python
-from contextlib import suppress
-from os import system
+import fnmatch
+from bisect import bisect_left
+from functools import cache
+from hashlib import sha1
+from os import getpid, replace, symlink, system
+from shutil import get_terminal_size
+from threading import get_ident
+from typing import NamedTuple
 
 # Package
-from common.constants import PLATFORM, plugin_list
+from common.constants import (
+    PLATFORM,
+    RELEASE_DIR,
+    START_DIR,
+    plugin_list,
+    plugin_settings,
+)
+from common.metrics import current_span, span, timed_run
+
+# Site-package
+from configobj import ConfigObj
+from path import Path
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the supported ways of linking files
+LINK_STRATEGIES = (
+    "symlink",
+    "hardlink",
+    "reflink",
+    "copy",
+)
+
+# Store the ioctl request used to clone a file on Linux (FICLONE)
+_FICLONE = 0x40049409
+
+# Store the chunk size to use when reading files
+_CHUNK_SIZE = 1024 * 1024
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class RepoFile(NamedTuple):
+    """Stores the blob hash and size of a file committed to a plugin."""
+
+    object_hash: str
+    size: int
 
 
 # =============================================================================
@@ -22,92 +66,395 @@ def clear_screen():
 
 
 def get_plugin(suffix, *, allow_all=True):
-    """Return a plugin by name to do something with."""
+    """Return a list of the plugins chosen to do something with.
+
+    Plugins can be chosen by number, range of numbers ("3-17"), name,
+    unique prefix or part of a name, or glob ("gg_*"), with several
+    choices separated by commas or spaces ("3-17,22 gg_deathmatch").
+    When allow_all is False, only a single plugin can be chosen.
+    """
     # Clear the screen
     clear_screen()
 
     # Are there any plugins?
     if not plugin_list:
         print(f"There are no plugins to {suffix}.")
-        return None
+        return []
 
     # Get the question to ask
-    message = f"What plugin would you like to {suffix}?\n\n"
+    message = (
+        f"What plugin would you like to {suffix}?\n\n" +
+        _get_plugin_menu(allow_all=allow_all)
+    )
 
-    # Loop through each plugin
-    for number, plugin in enumerate(plugin_list, 1):
+    # Ask until a valid choice is given
+    while True:
+        value = input(message + "\n").strip()
+        try:
+            plugins = _select_plugins(value, allow_all=allow_all)
 
-        # Add the current plugin
-        message += f"\t({number}) {plugin}\n"
+        # Was an invalid choice given?
+        except ValueError as error:
+            clear_screen()
+            print(f"{error}\n")
+            continue
 
-    # Add ALL to the list if it needs to be
-    if allow_all:
-        message += f"\t({len(plugin_list) + 1}) ALL\n"
+        # Was a valid choice given?
+        if plugins:
+            return plugins
 
-    # Ask which plugin to do something with
-    value = input(message + "\n").strip()
+        # Nothing was given, so ask again
+        clear_screen()
 
-    # Was a plugin name given?
-    if value in [*plugin_list, "ALL"]:
 
-        # Return the value
-        return value
+def link_directory(src, dest):
+    """Create a symbolic link for the given source at the given destination."""
+    _create_link(src, dest, directory=True)
 
-    # Was an integer given?
-    with suppress(ValueError):
 
-        # Typecast the value
-        value = int(value)
+def link_file(src, dest, strategy="symlink"):
+    """Link or copy the given source to the given destination.
 
-        # Was the value a valid plugin choice?
-        if value <= len(plugin_list):
+    The strategy must be one of LINK_STRATEGIES.  The "reflink" and "copy"
+    strategies only write the destination when its contents differ.
+    """
+    current_span().add(files=1)
 
-            # Return the plugin by index
-            return plugin_list[value - 1]
+    # Should the file be hard linked?
+    if strategy == "hardlink":
+        _hardlink_file(src, dest)
+        return
 
-        # Was ALL's choice given?
-        if value == len(plugin_list) + 1 and allow_all:
+    # Should the file be copied?
+    if strategy in ("reflink", "copy"):
+        _copy_if_changed(src, dest, clone=strategy == "reflink")
+        return
 
-            # Return ALL
-            return "ALL"
+    _create_link(src, dest, directory=False)
 
-    # If no valid choice was given, try again
-    return get_plugin(suffix, allow_all)
 
+def mirror_directory(src, dest, strategy):
+    """Link or copy every file within the given source directory.
 
-def link_directory(src, dest):
-    """Create a symbolic link for the given source at the given destination."""
-    # Is this a Windows OS?
-    if PLATFORM == "windows":
+    Files within the destination that are not within the source (such as
+    modules that were deleted or renamed) are removed.
+    """
+    # Was the directory previously linked as a whole?
+    if dest.islink():
+        dest.unlink()
 
-        # Link using Windows format
-        system(
-            f'mklink /d "{dest}" "{src}"',
-        )
+    sources = set()
+    for file in src.walkfiles():
+        sources.add(file.relpath(src))
+        dest_file = dest / file.relpath(src)
 
-    # Is this a Linux OS?
-    else:
+        # Are symbolic links only created when missing?
+        if strategy == "symlink" and dest_file.is_file():
+            continue
 
-        # Link using Linux format
-        system(
-            f'ln -s "{src}" "{dest}"',
-        )
+        if not dest_file.parent.is_dir():
+            dest_file.parent.makedirs_p()
+        link_file(file, dest_file, strategy)
 
+    prune_directory(dest, sources)
 
-def link_file(src, dest):
-    """Create a hard link for the given source at the given destination."""
-    # Is this a Windows OS?
-    if PLATFORM == "windows":
 
-        # Link using Windows format
-        system(
-            f'mklink "{dest}" "{src}"',
-        )
+def prune_directory(dest, keep):
+    """Remove the files within the directory that are not in keep.
 
-    # Is this a Linux OS?
-    else:
+    keep holds the paths to keep, relative to the directory.  Bytecode is
+    kept while its module is kept, and directories left empty are removed.
+    """
+    for dest_file in list(dest.walkfiles()):
+        relative = dest_file.relpath(dest)
+
+        # Is this the bytecode of a module, such as __pycache__/a.*.pyc?
+        if relative.parent.name == "__pycache__":
+            relative = relative.parent.parent / (
+                dest_file.name.split(".")[0] + ".py"
+            )
+        if relative not in keep:
+            dest_file.remove_p()
+
+    # Remove the deepest directories first, so their parents can be emptied
+    for directory in sorted(dest.walkdirs(), key=len, reverse=True):
+        if not directory.listdir():
+            directory.rmdir_p()
+
+
+def get_plugin_setting(plugin_name, setting, default=None):
+    """Return the given setting for the plugin from plugin_settings.ini."""
+    # Does the plugin have its own value for the setting?
+    section = plugin_settings.get(plugin_name)
+    if isinstance(section, dict) and setting in section:
+        return section[setting]
+
+    # Return the global value for the setting
+    return plugin_settings.get(setting, default)
+
+
+def get_plugin_flag(plugin_name, setting):
+    """Return whether the given setting is turned on for the plugin."""
+    value = get_plugin_setting(plugin_name, setting, "false")
+    return str(value).lower() in ("1", "on", "true", "yes")
 
-        # Link using Linux format
-        system(
-            f'ln -s "{src}" "{dest}"',
+
+def get_plugin_list(plugin_name, setting):
+    """Return the given comma separated setting for the plugin as a list."""
+    value = get_plugin_setting(plugin_name, setting, [])
+    if isinstance(value, str):
+        value = [value]
+    return [x for x in value if x]
+
+
+def get_plugin_version(plugin_name):
+    """Return the plugin's current version from its info.ini file."""
+    info_file = START_DIR.joinpath(
+        plugin_name, "addons", "source-python", "plugins", "gungame",
+        "plugins", "custom", plugin_name, "info.ini",
+    )
+    if not info_file.is_file():
+        return None
+    return ConfigObj(info_file).get("version")
+
+
+def get_repo_files(plugin_path):
+    """Return the files committed at HEAD mapped to their RepoFile.
+
+    None is returned, after printing git's error, when the files cannot
+    be listed (such as when the plugin has no commits).
+    """
+    with span("ls_tree"):
+        result = timed_run(
+            ["git", "ls-tree", "--full-tree", "-r", "-l", "-z", "HEAD"],
+            cwd=plugin_path, capture_output=True, check=False,
         )
+
+    # Did git fail to list the files?
+    if result.returncode:
+        print(
+            f'Failed to list the files committed to "{plugin_path}": '
+            + result.stderr.decode(errors="replace").strip(),
+        )
+        return None
+
+    repo_files = {}
+    for entry in result.stdout.split(b"\0"):
+
+        # Is this the end of the output?
+        if not entry:
+            continue
+
+        # Store the file if it is not a submodule
+        info, _, path = entry.partition(b"\t")
+        _mode, object_type, object_hash, size = info.split()
+        if object_type == b"blob":
+            repo_files[path.decode()] = RepoFile(
+                object_hash.decode(), int(size),
+            )
+
+    return repo_files
+
+
+def get_release_path(plugin_name, version):
+    """Return the path to the plugin's release zip for the given version."""
+    return RELEASE_DIR / plugin_name / f"{plugin_name} - v{version}.zip"
+
+
+def move_into_place(temp, dest):
+    """Atomically replace the destination with the given temporary file."""
+    # Path.replace is str.replace for path.Path objects, so use os.replace
+    replace(temp, dest)  # noqa: PTH105
+
+
+def get_temp_path(path):
+    """Return a temporary name, next to the path, unique to this thread.
+
+    Files are written to a temporary name and moved into place with
+    move_into_place, so other processes never see them partly written.
+    The temporary name ends with the path's name, keeping its extension.
+    """
+    path = Path(path)
+    return path.parent / f".tmp.{getpid()}.{get_ident()}.{path.name}"
+
+
+def hash_file(path):
+    """Return the SHA-1 hex digest of the given file's contents."""
+    digest = sha1(usedforsecurity=False)
+    with Path(path).open("rb") as open_file:
+        for chunk in iter(lambda: open_file.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+@cache
+def _get_plugin_menu(*, allow_all):
+    """Return the numbered plugin menu, in as many columns as will fit."""
+    choices = [
+        f"({number}) {plugin}" for number, plugin in enumerate(plugin_list, 1)
+    ]
+    if allow_all:
+        choices.append(f"({len(plugin_list) + 1}) ALL")
+
+    # Get the number of columns and rows that fit the terminal
+    width = max(map(len, choices)) + 4
+    columns = max(1, (get_terminal_size().columns - 8) // width)
+    rows = -(-len(choices) // columns)
+
+    return "".join(
+        "\t" + "".join(
+            f"{choice:<{width}}" for choice in choices[row::rows]
+        ).rstrip() + "\n"
+        for row in range(rows)
+    )
+
+
+@cache
+def _get_plugin_index():
+    """Return the lowercase plugin names, sorted for prefix searches."""
+    return sorted((x.lower(), x) for x in plugin_list)
+
+
+def _select_plugins(value, *, allow_all):
+    """Return the plugins for the given choices, in plugin_list order."""
+    selected = set()
+    for choice in value.replace(",", " ").split():
+        selected.update(_select_choice(choice, allow_all=allow_all))
+
+    # Was more than one plugin chosen when only one is allowed?
+    if not allow_all and len(selected) > 1:
+        msg = "Only one plugin can be chosen."
+        raise ValueError(msg)
+
+    return [x for x in plugin_list if x in selected]
+
+
+def _select_choice(choice, *, allow_all):
+    """Return the plugins for a single choice."""
+    # Was ALL chosen?
+    all_number = str(len(plugin_list) + 1)
+    if allow_all and choice.upper() in ("ALL", all_number):
+        return plugin_list
+
+    # Was a number or range of numbers given?
+    start, _, end = choice.partition("-")
+    if start.isdigit() and (end.isdigit() or not end):
+        start, end = int(start), int(end or start)
+        if not 1 <= start <= end <= len(plugin_list):
+            msg = f'Invalid plugin number "{choice}".'
+            raise ValueError(msg)
+        return plugin_list[start - 1:end]
+
+    # Was a glob given?
+    if any(x in choice for x in "*?["):
+        plugins = fnmatch.filter(plugin_list, choice)
+        if not plugins:
+            msg = f'No plugins match "{choice}".'
+            raise ValueError(msg)
+        return plugins
+
+    # Was a name, or a unique part of a name, given?
+    return [_find_plugin(choice)]
+
+
+def _find_plugin(choice):
+    """Return the plugin by name, unique prefix, or unique part of a name."""
+    # Was a full name given?
+    if choice in plugin_list:
+        return choice
+
+    # Find the plugins that start with the given value
+    index = _get_plugin_index()
+    lower = choice.lower()
+    position = bisect_left(index, (lower,))
+    matches = []
+    while position < len(index) and index[position][0].startswith(lower):
+        matches.append(index[position][1])
+        position += 1
+
+    # Find the plugins that contain the given value
+    if not matches:
+        matches = [name for key, name in index if lower in key]
+
+    if len(matches) == 1:
+        return matches[0]
+
+    if not matches:
+        msg = f'No plugin named "{choice}".'
+    else:
+        msg = f'"{choice}" matches several plugins: {", ".join(matches)}'
+    raise ValueError(msg)
+
+
+def _create_link(src, dest, *, directory):
+    """Create a symbolic link, or verify the existing one links to src.
+
+    Another process may create the same link at the same time, so an
+    existing link to the same source is not an error.
+    """
+    try:
+        # Path.symlink cannot create links to directories on Windows
+        symlink(src, dest, target_is_directory=directory)  # noqa: PTH211
+    except FileExistsError:
+        if not dest.islink() or dest.readlink() != src:
+            print(f'"{dest}" already exists and does not link to "{src}"')
+
+
+def _hardlink_file(src, dest):
+    """Hard link the given source to the destination if not already."""
+    # Is the destination already linked to the source?
+    if dest.is_file() and not dest.islink() and dest.samefile(src):
+        return
+
+    # Link to a temporary name and move it into place
+    temp = get_temp_path(dest)
+    src.link(temp)
+    move_into_place(temp, dest)
+
+
+def _copy_if_changed(src, dest, *, clone):
+    """Copy (or clone) the given source if the destination differs."""
+    # Is the destination already up to date?
+    if dest.is_file() and not dest.islink():
+        src_stat = src.stat()
+        dest_stat = dest.stat()
+        if src_stat.st_size == dest_stat.st_size:
+            if src_stat.st_mtime_ns == dest_stat.st_mtime_ns:
+                return
+
+            # Are the contents the same, even though the times are not?
+            current_span().add(bytes_read=src_stat.st_size * 2)
+            if hash_file(src) == hash_file(dest):
+                src.copystat(dest)
+                return
+
+    # Write to a temporary name and move it into place
+    current_span().add(bytes_written=src.size)
+    temp = get_temp_path(dest)
+    if not (clone and _clone_file(src, temp)):
+        src.copyfile(temp)
+    src.copystat(temp)
+    move_into_place(temp, dest)
+
+
+def _clone_file(src, dest):
+    """Clone the given file using copy-on-write and return the success."""
+    # Is the platform unable to clone files?
+    if PLATFORM != "linux":
+        return False
+
+    # Import here, as fcntl is not available on Windows
+    from fcntl import ioctl  # noqa: PLC0415
+
+    with src.open("rb") as src_file, dest.open("wb") as dest_file:
+        try:
+            ioctl(dest_file.fileno(), _FICLONE, src_file.fileno())
+
+        # Does the filesystem not support cloning?
+        except OSError:
+            return False
+
+    return True
@@ -0,0 +1,177 @@
+# ../common/journal.py
+
+"""Records the planned and completed steps of batch operations.
+
+Each operation (such as linking or releasing) has an append-only journal in
+the data directory.  A batch writes a record when it starts, before and
+after each step of each plugin, and when it finishes.  Every record is
+flushed to disk before the step continues, so when a batch is interrupted,
+running the operation again for the same plugins resumes the batch and
+skips the steps that were already completed.  Each batch's process holds
+the batch's lock while it runs, so a batch is never resumed by a second
+process while the first is still running it.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from json import dumps, loads
+from os import fsync, getpid
+from time import strftime, time_ns
+
+# Package
+from common.constants import DATA_DIR
+from common.functions import get_temp_path, move_into_place
+from common.locks import lock, try_lock
+
+# Site-package
+from path import Path
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the directory of each operation's journal
+JOURNAL_DIR = DATA_DIR / "journal"
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Journal:
+    """Records the steps of a batch operation over the given plugins.
+
+    The most recent unfinished batch of the operation for the same plugins
+    that no running process holds is resumed, with its completed steps
+    kept.  Otherwise a new batch is started.  Finished batches are removed
+    from the journal when the next batch starts.
+    """
+
+    def __init__(self, operation, plugin_names):
+        """Resume or start the operation's batch for the given plugins."""
+        self.path = JOURNAL_DIR / f"{operation}.jsonl"
+        self._lock_name = f"journal-{operation}"
+        self._planned = {}
+        self._done = {}
+        self._owner = None
+        with lock(self._lock_name):
+            self._start(plugin_names)
+
+    @property
+    def resumed(self):
+        """Return whether an interrupted batch is being resumed."""
+        return self.started is not None
+
+    def is_done(self, plugin_name, step):
+        """Return whether the plugin's step was completed."""
+        return (plugin_name, step) in self._done
+
+    def is_interrupted(self, plugin_name, step):
+        """Return whether the plugin's step was started but not completed."""
+        key = (plugin_name, step)
+        return key in self._planned and key not in self._done
+
+    def get_data(self, plugin_name, step):
+        """Return the data recorded with the plugin's step.
+
+        The data recorded when the step was completed is returned, or the
+        data recorded when it was planned if it was never completed.
+        """
+        key = (plugin_name, step)
+        return self._done.get(key, self._planned.get(key, {}))
+
+    def plan(self, plugin_name, step, **data):
+        """Record that the plugin's step is about to start."""
+        self._planned[plugin_name, step] = data
+        self._append(event="planned", plugin=plugin_name, step=step, data=data)
+
+    def complete(self, plugin_name, step, **data):
+        """Record that the plugin's step was completed."""
+        self._done[plugin_name, step] = data
+        self._append(event="done", plugin=plugin_name, step=step, data=data)
+
+    def finish(self):
+        """Record that every step of the batch was completed."""
+        self._append(event="finished")
+
+        # Release the batch, which can no longer be resumed
+        with lock(self._lock_name):
+            self._owner.close()
+            Path(self._owner.name).remove_p()
+
+    def _start(self, plugin_names):
+        """Resume or start the batch, removing any finished batches."""
+        # Get the unfinished batches, in the order they were started
+        batches = {}
+        for record in _read_records(self.path):
+            if record["event"] == "start":
+                batches[record["batch"]] = [record]
+            elif record["event"] == "finished":
+                batches.pop(record["batch"], None)
+            elif record["batch"] in batches:
+                batches[record["batch"]].append(record)
+
+        # Is there an unfinished batch for the same plugins, which is not
+        #   being run by another process?
+        self.started = None
+        for records in reversed(batches.values()):
+            if sorted(records[0]["plugins"]) != sorted(plugin_names):
+                continue
+            self._owner = try_lock(f"{self._lock_name}-{records[0]['batch']}")
+            if self._owner is not None:
+                self.batch = records[0]["batch"]
+                self.started = records[0]["time"]
+                break
+        else:
+            self.batch = f"{time_ns()}-{getpid()}"
+            self._owner = try_lock(f"{self._lock_name}-{self.batch}")
+            records = [{
+                "batch": self.batch, "event": "start",
+                "time": strftime("%Y-%m-%d %H:%M:%S"),
+                "plugins": sorted(plugin_names),
+            }]
+            batches[self.batch] = records
+
+        # Get the steps the batch already planned and completed
+        for record in records[1:]:
+            key = (record["plugin"], record["step"])
+            if record["event"] == "planned":
+                self._planned[key] = record["data"]
+            else:
+                self._done[key] = record["data"]
+
+        # Write only the unfinished batches back to the journal
+        JOURNAL_DIR.makedirs_p()
+        temp = get_temp_path(self.path)
+        temp.write_text("".join(
+            dumps(record) + "\n"
+            for records in batches.values() for record in records
+        ))
+        move_into_place(temp, self.path)
+
+    def _append(self, **record):
+        """Append the record to the journal and flush it to disk."""
+        with lock(self._lock_name), self.path.open("a") as open_file:
+            open_file.write(dumps({"batch": self.batch, **record}) + "\n")
+            open_file.flush()
+            fsync(open_file.fileno())
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _read_records(path):
+    """Yield the records of the given journal.
+
+    A record that was only partly written when a batch was interrupted is
+    skipped, along with anything after it.
+    """
+    if not path.is_file():
+        return
+
+    for line in path.read_text().splitlines():
+        try:
+            record = loads(line)
+        except ValueError:
+            return
+        yield record
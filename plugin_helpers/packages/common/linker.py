@@ -0,0 +1,210 @@
+# ../common/linker.py
+
+"""Links plugins to Source.Python's repository."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Package
+from common.asset_store import get_blob_path, update_store
+from common.constants import GUNGAME_DIR, START_DIR, plugin_list
+from common.file_index import get_consumer_data, get_dirty_files, mark_clean
+from common.functions import (
+    LINK_STRATEGIES,
+    get_plugin_flag,
+    get_plugin_setting,
+    link_directory,
+    link_file,
+    mirror_directory,
+)
+from common.locks import plugin_locked
+from common.metrics import measured
+
+
+# =============================================================================
+# >> MAIN FUNCTION
+# =============================================================================
+@measured("link")
+@plugin_locked
+def link_plugin(plugin_name):
+    """Link the given plugin to Source.Python's repository.
+
+    Returns whether the plugin was linked.
+    """
+    # Was an invalid plugin name given?
+    if plugin_name not in plugin_list:
+        print(
+            f'Invalid plugin name "{plugin_name}"',
+        )
+        return False
+
+    # Get the strategy to use when linking the plugin
+    strategy = get_plugin_setting(plugin_name, "link_strategy", "symlink")
+    if strategy not in LINK_STRATEGIES:
+        print(
+            f'Invalid link_strategy "{strategy}" for plugin "{plugin_name}"',
+        )
+        return False
+
+    # Get the plugin's path
+    plugin_path = START_DIR / plugin_name
+
+    # Should assets be linked from their stored copies?
+    assets = {}
+    if strategy != "symlink" and get_plugin_flag(plugin_name, "asset_store"):
+        assets = update_store([plugin_name])[plugin_name]
+
+    # Should only the files changed since the last link be linked?
+    changed = dirty = None
+    removed = frozenset()
+    if strategy != "symlink" and get_plugin_flag(plugin_name, "use_file_index"):
+        dirty = get_dirty_files("link", plugin_name)
+
+        # Were the files last linked with the same strategy?
+        data = get_consumer_data("link", plugin_name)
+        if data.get("strategy") == strategy:
+            changed, removed = dirty.changed, dirty.removed
+
+    # Link the main directory
+    _link_directory(
+        strategy, plugin_path, "addons", "source-python", "plugins",
+        "gungame", "plugins", "custom", plugin_name, changed=changed,
+        removed=removed,
+    )
+
+    # Link the data directory
+    _link_directory(
+        strategy, plugin_path, "addons", "source-python", "data",
+        "plugins", "gungame", plugin_name, changed=changed,
+        removed=removed,
+    )
+
+    # Link the data files
+    _link_file(
+        strategy, plugin_path, "addons", "source-python", "data",
+        "plugins", "gungame", plugin_name + ".ini", changed=changed,
+    )
+    _link_file(
+        strategy, plugin_path, "addons", "source-python", "data",
+        "plugins", "gungame", plugin_name + ".json", changed=changed,
+    )
+
+    # Link the message translations file
+    _link_file(
+        strategy, plugin_path, "resource", "source-python", "translations",
+        "gungame", "messages", "custom_plugins", plugin_name + ".ini",
+        changed=changed,
+    )
+
+    # Link the commands translations file
+    _link_file(
+        strategy, plugin_path, "resource", "source-python", "translations",
+        "gungame", "commands", "custom_plugins", plugin_name + ".ini",
+        changed=changed,
+    )
+
+    # Link the config translations file
+    _link_file(
+        strategy, plugin_path, "resource", "source-python", "translations",
+        "gungame", "config", "custom_plugins", plugin_name + ".ini",
+        changed=changed,
+    )
+
+    # Link the rules translations file
+    _link_file(
+        strategy, plugin_path, "resource", "source-python", "translations",
+        "gungame", "rules", "custom_plugins", plugin_name + ".ini",
+        changed=changed,
+    )
+
+    # Link sounds
+    sound_path = plugin_path / "sound" / "source-python" / "gungame" / "default"
+    if sound_path.is_dir():
+        for sound_file in sound_path.files():
+            _link_file(
+                strategy, plugin_path, "sound", "source-python", "gungame",
+                "default", sound_file.name, assets=assets, changed=changed,
+            )
+
+    # Record the files that were linked
+    if dirty is not None:
+        mark_clean(
+            "link", plugin_name, dirty.changed | dirty.removed,
+            strategy=strategy,
+        )
+
+    return True
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _link_directory(
+    strategy, plugin_path, *args, changed=None, removed=frozenset(),
+):
+    """Link the directory using the given arguments.
+
+    When the files changed since the last link are given, only those
+    files within the directory are linked, and the removed files within
+    the directory are removed from the Source.Python repository.
+    """
+    # Remove the files deleted from the directory since the last link
+    prefix = "/".join(args) + "/"
+    for name in sorted(removed):
+        if name.startswith(prefix):
+            GUNGAME_DIR.joinpath(*name.split("/")).remove_p()
+
+    # Get the path within the plugin
+    src = plugin_path.joinpath(*args)
+
+    # Does the path not exist?
+    if not src.is_dir():
+        return
+
+    # Get the path within the Source.Python repository
+    dest = GUNGAME_DIR.joinpath(*args)
+
+    # Should only the directory's changed files be linked?
+    if changed is not None:
+        for name in sorted(changed):
+            if name.startswith(prefix):
+                GUNGAME_DIR.joinpath(*name.split("/")).parent.makedirs_p()
+                _link_file(strategy, plugin_path, *name.split("/"))
+
+    # Should the directory's files be linked individually?
+    elif strategy != "symlink":
+        mirror_directory(src, dest, strategy)
+
+    # Does the destination not exist?
+    elif not dest.is_dir():
+
+        # Link the directory
+        link_directory(src, dest)
+
+
+def _link_file(strategy, plugin_path, *args, assets=None, changed=None):
+    """Link the file using the given arguments."""
+    # Has the file not changed since it was last linked?
+    if changed is not None and "/".join(args) not in changed:
+        return
+
+    # Get the path within the plugin
+    src = plugin_path.joinpath(*args)
+
+    # Does the path not exist?
+    if not src.is_file():
+        return
+
+    # Is the file an asset with a stored copy to link from instead?
+    asset = (assets or {}).get("/".join(args))
+    if asset is not None:
+        src = get_blob_path(asset.digest)
+
+    # Get the path within the Source.Python repository
+    dest = GUNGAME_DIR.joinpath(*args)
+
+    # Does the destination not exist or need to be checked for changes?
+    if strategy != "symlink" or not dest.is_file():
+
+        # Link the file
+        link_file(src, dest, strategy)
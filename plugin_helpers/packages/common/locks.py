@@ -0,0 +1,133 @@
+# ../common/locks.py
+
+"""Provides locks shared by every process and thread using the workspace.
+
+Each lock is a file in the data directory that is locked with fcntl.flock
+(or msvcrt.locking on Windows).  The lock is held by the open file, so it
+is also released when a process exits without releasing it.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from contextlib import contextmanager
+from functools import wraps
+from hashlib import sha1
+
+# Package
+from common.constants import DATA_DIR, PLATFORM
+
+# Site-package
+from path import Path
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the directory of the lock files
+LOCK_DIR = DATA_DIR / "locks"
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+@contextmanager
+def lock(name):
+    """Hold the named lock, waiting until no one else holds it."""
+    LOCK_DIR.makedirs_p()
+    with (LOCK_DIR / f"{name}.lock").open("a+b") as open_file:
+        _acquire(open_file)
+        try:
+            yield
+        finally:
+            _release(open_file)
+
+
+def try_lock(name):
+    """Take the named lock, unless someone else already holds it.
+
+    Returns the open lock file, which holds the lock until it is closed,
+    or None if the lock is held by someone else.
+    """
+    LOCK_DIR.makedirs_p()
+    open_file = (LOCK_DIR / f"{name}.lock").open("a+b")
+    try:
+        _acquire(open_file, blocking=False)
+    except OSError:
+        open_file.close()
+        return None
+    return open_file
+
+
+def plugin_lock(plugin_name):
+    """Return the lock for working on the given plugin."""
+    return lock(f"plugin-{plugin_name}")
+
+
+def directory_lock(path):
+    """Return the lock for writing into the given directory."""
+    digest = sha1(
+        str(Path(path).abspath()).encode(), usedforsecurity=False,
+    ).hexdigest()
+    return lock(f"directory-{digest[:16]}")
+
+
+def plugin_locked(function):
+    """Decorate a function taking a plugin name to hold the plugin's lock."""
+    @wraps(function)
+    def wrapper(plugin_name, *args, **kwargs):
+        with plugin_lock(plugin_name):
+            return function(plugin_name, *args, **kwargs)
+    return wrapper
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _acquire(open_file, *, blocking=True):
+    """Lock the given open file, waiting for any other holder.
+
+    When not blocking, OSError is raised if someone else holds the lock.
+    """
+    # Is this a Windows OS?
+    if PLATFORM == "windows":
+
+        # Import here, as msvcrt is only available on Windows
+        from msvcrt import LK_LOCK, LK_NBLCK, locking  # noqa: PLC0415
+
+        # Should the lock only be taken if it is free?
+        open_file.seek(0)
+        if not blocking:
+            locking(open_file.fileno(), LK_NBLCK, 1)
+            return
+
+        # LK_LOCK gives up after 10 seconds, so keep trying
+        while True:
+            try:
+                locking(open_file.fileno(), LK_LOCK, 1)
+            except OSError:
+                continue
+            return
+
+    # Import here, as fcntl is not available on Windows
+    from fcntl import LOCK_EX, LOCK_NB, flock  # noqa: PLC0415
+
+    flock(open_file.fileno(), LOCK_EX if blocking else LOCK_EX | LOCK_NB)
+
+
+def _release(open_file):
+    """Unlock the given open file."""
+    # Is this a Windows OS?
+    if PLATFORM == "windows":
+
+        # Import here, as msvcrt is only available on Windows
+        from msvcrt import LK_UNLCK, locking  # noqa: PLC0415
+
+        open_file.seek(0)
+        locking(open_file.fileno(), LK_UNLCK, 1)
+        return
+
+    # Import here, as fcntl is not available on Windows
+    from fcntl import LOCK_UN, flock  # noqa: PLC0415
+
+    flock(open_file.fileno(), LOCK_UN)
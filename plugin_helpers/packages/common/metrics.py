@@ -0,0 +1,170 @@
+# ../common/metrics.py
+
+"""Records per-phase timings and metrics for the helper tools.
+
+Metrics are only recorded when the PLUGIN_HELPERS_METRICS environment
+variable or the METRICS_FILE config.ini value is set to a file path.  Each
+finished span is appended to that file as a line of JSON.  When metrics are
+off, span() returns a shared object whose methods do nothing.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from functools import wraps
+from json import dumps
+from os import environ, getpid
+from subprocess import run
+from sys import argv
+from threading import Lock, local
+from time import perf_counter, thread_time, time
+
+# Package
+from common.constants import config_obj
+
+# Site-package
+from path import Path
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the file to write metrics to, if any
+METRICS_FILE = environ.get(
+    "PLUGIN_HELPERS_METRICS", config_obj.get("METRICS_FILE", ""),
+)
+
+# Store the name of the tool being executed
+_TOOL = Path(argv[0]).stem if argv and argv[0] else "python"
+
+# Store the open spans for each thread
+_open_spans = local()
+
+# Store the lock used when writing to the metrics file
+_write_lock = Lock()
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _NullSpan:
+    """A span that records nothing, used when metrics are off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        """Return the span."""
+        return self
+
+    def __exit__(self, *args):
+        """Do nothing."""
+
+    def add(self, **counters):
+        """Do nothing."""
+
+
+class Span:
+    """Records the wall time, CPU time, and counters for a phase.
+
+    The CPU time is that of the thread running the span, so spans running
+    at the same time in other threads are not counted in it.
+    """
+
+    __slots__ = ("_cpu", "_wall", "counters", "name", "parent")
+
+    def __init__(self, name, **counters):
+        """Store the span's name and any starting counters."""
+        self.name = name
+        self.counters = counters
+        self.parent = None
+        self._wall = self._cpu = 0.0
+
+    def __enter__(self):
+        """Start timing the span."""
+        stack = _get_stack()
+        if stack:
+            self.parent = stack[-1].name
+        stack.append(self)
+        self._wall = perf_counter()
+        self._cpu = thread_time()
+        return self
+
+    def __exit__(self, *args):
+        """Stop timing the span and write its record."""
+        wall = perf_counter() - self._wall
+        cpu = thread_time() - self._cpu
+        _get_stack().remove(self)
+        _write_record({
+            "time": time(),
+            "pid": getpid(),
+            "tool": _TOOL,
+            "span": self.name,
+            "parent": self.parent,
+            "wall_time": wall,
+            "cpu_time": cpu,
+            **self.counters,
+        })
+
+    def add(self, **counters):
+        """Add the given values to the span's counters."""
+        for name, value in counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+
+
+# Store the span used when metrics are off
+_NULL_SPAN = _NullSpan()
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def span(name, **counters):
+    """Return a span to time a phase with, for use in a with statement."""
+    if not METRICS_FILE:
+        return _NULL_SPAN
+    return Span(name, **counters)
+
+
+def measured(name):
+    """Decorate a function taking a plugin name to record it as a span."""
+    def decorator(function):
+        @wraps(function)
+        def wrapper(plugin_name, *args, **kwargs):
+            with span(name, plugin=plugin_name):
+                return function(plugin_name, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_span():
+    """Return the innermost open span of the current thread."""
+    if not METRICS_FILE:
+        return _NULL_SPAN
+    stack = _get_stack()
+    return stack[-1] if stack else _NULL_SPAN
+
+
+def timed_run(*args, **kwargs):
+    """Call subprocess.run, adding its time to the current span."""
+    start = perf_counter()
+    try:
+        return run(*args, **kwargs)  # noqa: PLW1510
+    finally:
+        current_span().add(subprocess_time=perf_counter() - start)
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _get_stack():
+    """Return the current thread's stack of open spans."""
+    if not hasattr(_open_spans, "stack"):
+        _open_spans.stack = []
+    return _open_spans.stack
+
+
+def _write_record(record):
+    """Append the given record to the metrics file."""
+    line = dumps(record, default=str) + "\n"
+    with _write_lock, Path(METRICS_FILE).open("a") as open_file:
+        open_file.write(line)
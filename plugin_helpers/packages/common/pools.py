@@ -0,0 +1,63 @@
+# ../common/pools.py
+
+"""Runs the same function over many arguments in parallel.
+
+The tools call these from their own worker threads (such as the releases
+run_in_order creates at the same time), where forking would copy the locks
+other threads hold into each child.  Process pools are therefore spawned,
+and only once there is enough work to pay for starting the processes.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from os import cpu_count
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the bytes of input below which work is not worth spawning processes
+PROCESS_POOL_THRESHOLD = 8 * 1024 * 1024
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def map_in_processes(function, *arguments, size):
+    """Return the results of calling the function with each of the arguments.
+
+    size is the number of bytes the calls read.  Below PROCESS_POOL_THRESHOLD
+    the calls are made in this thread, otherwise in one spawned process per
+    CPU.  The function and its arguments must be picklable.
+    """
+    count = len(arguments[0])
+    workers = min(count, cpu_count() or 1)
+    if workers <= 1 or size < PROCESS_POOL_THRESHOLD:
+        return list(map(function, *arguments))
+
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=get_context("spawn"),
+    ) as executor:
+        return list(
+            executor.map(
+                function, *arguments,
+                chunksize=max(1, count // (workers * 4)),
+            ),
+        )
+
+
+def map_in_threads(function, *arguments):
+    """Return the results of calling the function with each of the arguments.
+
+    Use for work that waits on files, or that releases the GIL (such as
+    zlib and bz2 compression), with one thread per CPU.
+    """
+    workers = min(len(arguments[0]), cpu_count() or 1)
+    if workers <= 1:
+        return list(map(function, *arguments))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, *arguments))
@@ -0,0 +1,262 @@
+# ../common/tasks.py
+
+"""Runs tools as tasks, skipping the tasks that are already up to date.
+
+Each task (such as linking a plugin) declares the plugin files and
+settings it reads, and the outputs it writes.  A task's fingerprint is a
+hash of the contents of those files (from the file index), the values of
+those settings, and any other values it is given.  The fingerprint is
+recorded in the data directory when the task succeeds, so the task is
+skipped while its fingerprint is unchanged and its outputs exist.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from fnmatch import fnmatch
+from hashlib import sha1
+from json import dumps, loads
+from os import cpu_count
+from typing import NamedTuple
+
+# Package
+from common.constants import DATA_DIR
+from common.dependencies import get_run_graph
+from common.file_index import refresh_index
+from common.functions import get_plugin_setting, get_temp_path, move_into_place
+from common.locks import lock
+
+# Site-package
+from path import Path
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the file the fingerprint of each plugin's tasks is recorded in
+TASK_FILE = DATA_DIR / "tasks.json"
+
+# Store the statuses of tasks that did not succeed
+_unfinished = ("failed", "blocked")
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Task(NamedTuple):
+    """Stores how a tool is run for a plugin and what the tool depends on.
+
+    function is called with the plugin's name and returns False when it
+    fails.  requires names the plugin's tasks that must succeed first, and
+    the task also runs after the same task of the plugins it imports.
+    patterns selects the plugin's files the task reads, settings names the
+    plugin settings it reads, and values holds any other values it reads.
+    get_outputs returns the paths the task writes for a plugin.  prepare,
+    which may ask for input, is called with the plugin's name and the
+    Journal while no other task is running, and the task is only run when
+    it returns True.  The task is recorded in the Journal by the name of
+    its function, as run_in_order does.
+    """
+
+    name: str
+    function: Callable
+    requires: tuple = ()
+    patterns: tuple = ("*",)
+    settings: tuple = ()
+    values: tuple = ()
+    get_outputs: Callable | None = None
+    prepare: Callable | None = None
+
+
+class _TaskRunner:
+    """Runs the tasks of each plugin in order, in parallel where possible."""
+
+    def __init__(self, plugin_tasks, journal):
+        """Store the tasks and the tasks each of them waits for."""
+        self.journal = journal
+        self.tasks = {
+            (plugin_name, task.name): task
+            for plugin_name, tasks in plugin_tasks.items() for task in tasks
+        }
+        graph = get_run_graph(list(plugin_tasks))
+        self.waiting = {}
+        for (plugin_name, name), task in self.tasks.items():
+            requirements = {(plugin_name, x) for x in task.requires}
+            requirements.update((x, name) for x in graph[plugin_name])
+            self.waiting[plugin_name, name] = requirements.intersection(
+                self.tasks,
+            )
+        self.statuses = {}
+        self.running = {}
+        self.deferred = []
+
+    def run(self, executor):
+        """Run every task and return the status of each."""
+        while self.waiting or self.running or self.deferred:
+            self._start_ready(executor)
+
+            # Prepare the deferred tasks once nothing else is running, as
+            #   preparing may ask for input
+            if self.deferred and not self.running:
+                for key in self.deferred:
+                    if self.tasks[key].prepare(key[0], self.journal):
+                        self._submit(executor, key)
+                    else:
+                        self._finish(key, "failed")
+                self.deferred.clear()
+
+            # Are the remaining tasks waiting for each other?
+            if not self.running:
+                if self.waiting and all(self.waiting.values()):
+                    msg = "Tasks require each other: " + ", ".join(
+                        f"{x}:{y}" for x, y in sorted(self.waiting)
+                    )
+                    raise ValueError(msg)
+                continue
+
+            # Wait for a task to finish
+            done, _ = wait(self.running, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = self.running.pop(future)
+
+                # Record the tasks that finished before raising any errors
+                if future.exception() is not None:
+                    continue
+
+                if future.result() is False:
+                    self._finish(key, "failed")
+                    continue
+
+                if self.journal is not None:
+                    self.journal.complete(key[0], self._get_step(key))
+                _record(key, get_fingerprint(self.tasks[key], key[0]))
+                self._finish(key, "done")
+
+            for future in done:
+                future.result()
+
+        return self.statuses
+
+    def _start_ready(self, executor):
+        """Start, skip, or defer every task whose requirements finished."""
+        for key in [x for x, y in self.waiting.items() if not y]:
+            del self.waiting[key]
+            task = self.tasks[key]
+            if self.statuses.get(key) == "blocked":
+                self._finish(key, "blocked")
+            elif is_up_to_date(task, key[0]):
+                self._finish(key, "up to date")
+            elif task.prepare is not None:
+                self.deferred.append(key)
+            else:
+                self._submit(executor, key)
+
+    def _submit(self, executor, key):
+        """Start running the task."""
+        if self.journal is not None:
+            self.journal.plan(key[0], self._get_step(key))
+        self.running[executor.submit(self.tasks[key].function, key[0])] = key
+
+    def _get_step(self, key):
+        """Return the name the task is recorded in the Journal with."""
+        return self.tasks[key].function.__name__
+
+    def _finish(self, key, status):
+        """Store the task's status and release the tasks waiting for it."""
+        self.statuses[key] = status
+        for waiting_key, requirements in self.waiting.items():
+            if key not in requirements:
+                continue
+            requirements.discard(key)
+
+            # Only block the plugin's own tasks, as the same task of other
+            #   plugins only waits for the plugin so the order is kept
+            if status in _unfinished and waiting_key[0] == key[0]:
+                self.statuses[waiting_key] = "blocked"
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def run_tasks(plugin_tasks, journal=None):
+    """Run the tasks of each plugin that are not up to date.
+
+    plugin_tasks maps each plugin to its tasks.  Tasks that do not depend
+    on each other are run in parallel, and the status of each task is
+    returned by its plugin and name: "done", "up to date", "failed", or
+    "blocked" (when a task it waits for did not succeed).  When a Journal
+    is given, each task is recorded in it, and the batch is finished when
+    no task failed.
+    """
+    runner = _TaskRunner(plugin_tasks, journal)
+    workers = min(len(runner.tasks), cpu_count() or 1) or 1
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            statuses = runner.run(executor)
+
+        # Do not start the tasks that are still queued when interrupted
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
+
+    if journal is not None and not set(statuses.values()) & set(_unfinished):
+        journal.finish()
+    return statuses
+
+
+def get_fingerprint(task, plugin_name):
+    """Return the hash of everything the task reads for the plugin."""
+    files = refresh_index(plugin_name)
+    data = {
+        "task": task.name,
+        "files": sorted(
+            (name, digest) for name, digest in files.items()
+            if any(fnmatch(name, pattern) for pattern in task.patterns)
+        ),
+        "settings": {
+            x: get_plugin_setting(plugin_name, x) for x in task.settings
+        },
+        "values": [str(x) for x in task.values],
+    }
+    return sha1(
+        dumps(data, sort_keys=True, default=str).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+
+
+def is_up_to_date(task, plugin_name):
+    """Return whether the task's inputs and outputs are unchanged."""
+    recorded = _load_records().get(plugin_name, {}).get(task.name)
+    if recorded != get_fingerprint(task, plugin_name):
+        return False
+
+    outputs = [] if task.get_outputs is None else task.get_outputs(plugin_name)
+    return all(
+        Path(x).exists() or Path(x).islink() for x in outputs
+    )
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _record(key, fingerprint):
+    """Record the fingerprint of the plugin's task."""
+    with lock("tasks"):
+        records = _load_records()
+        records.setdefault(key[0], {})[key[1]] = fingerprint
+        DATA_DIR.makedirs_p()
+        temp = get_temp_path(TASK_FILE)
+        temp.write_text(dumps(records, indent=1, sort_keys=True))
+        move_into_place(temp, TASK_FILE)
+
+
+def _load_records():
+    """Return the recorded fingerprint of each plugin's tasks."""
+    if not TASK_FILE.is_file():
+        return {}
+    try:
+        return loads(TASK_FILE.read_text())
+    except ValueError:
+        return {}
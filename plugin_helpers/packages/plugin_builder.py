@@ -0,0 +1,128 @@
+# ../plugin_builder.py
+
+"""Links, checks, and releases plugins, skipping the work already done."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Package
+from artifacts.releases import prepare_release, release_plugin
+from checks.checker import check_plugin_strictly
+from common.constants import (
+    FASTDL_DIR,
+    GUNGAME_DIR,
+    RELEASE_DIR,
+    plugin_list,
+)
+from common.functions import (
+    clear_screen,
+    get_plugin,
+    get_plugin_list,
+    get_plugin_version,
+    get_release_path,
+)
+from common.journal import Journal
+from common.linker import link_plugin
+from common.tasks import Task, run_tasks
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the tasks that can be set in build_tasks
+BUILD_TASKS = {
+    "link": Task(
+        "link", link_plugin,
+        settings=("asset_store", "link_strategy", "use_file_index"),
+        values=(GUNGAME_DIR,),
+        get_outputs=lambda plugin_name: [
+            GUNGAME_DIR.joinpath(
+                "addons", "source-python", "plugins", "gungame", "plugins",
+                "custom", plugin_name,
+            ),
+        ],
+    ),
+    "check": Task(
+        "check", check_plugin_strictly,
+        patterns=("*.py", "materials/*", "models/*"),
+        settings=("check_passes", "external_assets", "use_file_index"),
+    ),
+    "release": Task(
+        "release", release_plugin,
+        requires=("check",),
+        settings=(
+            "archive_formats", "asset_store", "bytecode_invalidation",
+            "bytecode_optimize", "bytecode_python", "check_assets",
+            "compact_translations", "compile_bytecode", "external_assets",
+            "minify_data", "size_budgets", "texture_waste_budget",
+            "translation_keep", "use_file_index", "verify_release",
+        ),
+        values=(RELEASE_DIR, FASTDL_DIR),
+        get_outputs=lambda plugin_name: [
+            get_release_path(plugin_name, get_plugin_version(plugin_name)),
+        ],
+        prepare=prepare_release,
+    ),
+}
+
+
+# =============================================================================
+# >> MAIN FUNCTION
+# =============================================================================
+def build_plugins(plugin_names):
+    """Run each of the plugins' build tasks that are not up to date."""
+    # Get the tasks to run for each plugin
+    plugin_tasks = {}
+    for plugin_name in plugin_names:
+
+        # Was an invalid plugin name given?
+        if plugin_name not in plugin_list:
+            print(
+                f'Invalid plugin name "{plugin_name}"',
+            )
+            return
+
+        # Were any unknown tasks set for the plugin?
+        names = get_plugin_list(plugin_name, "build_tasks") or list(BUILD_TASKS)
+        unknown = sorted(set(names) - set(BUILD_TASKS))
+        if unknown:
+            print(
+                f'Unknown build tasks for "{plugin_name}": '
+                + ", ".join(unknown),
+            )
+            return
+
+        plugin_tasks[plugin_name] = [BUILD_TASKS[x] for x in names]
+
+    # Resume the last build of the same plugins, if it was interrupted
+    journal = Journal("build", plugin_names)
+    if journal.resumed:
+        print(f"Resuming the build started {journal.started}\n")
+
+    # Run the tasks, in parallel where they do not depend on each other
+    statuses = run_tasks(plugin_tasks, journal)
+
+    # Print the status of every task
+    print("Build results:")
+    for plugin_name, tasks in plugin_tasks.items():
+        print(
+            f"\t{plugin_name}: "
+            + ", ".join(
+                f"{x.name} {statuses.get((plugin_name, x.name), 'blocked')}"
+                for x in tasks
+            ),
+        )
+    print()
+
+
+# =============================================================================
+# >> CALL MAIN FUNCTION
+# =============================================================================
+if __name__ == "__main__":
+
+    # Get the plugins to build
+    _plugin_names = get_plugin("build")
+    clear_screen()
+
+    # Build the plugins
+    if _plugin_names:
+        build_plugins(_plugin_names)
@@ -0,0 +1,92 @@
+# ../plugin_bundler.py
+
+"""Bundles the current releases of plugins into a single archive."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from time import strftime
+
+# Package
+from artifacts.bundles import write_bundle
+from common.constants import RELEASE_DIR, plugin_list
+from common.functions import (
+    clear_screen,
+    get_plugin,
+    get_plugin_version,
+    get_release_path,
+    get_temp_path,
+    move_into_place,
+)
+from common.metrics import span
+
+
+# =============================================================================
+# >> MAIN FUNCTION
+# =============================================================================
+def create_bundle(plugin_names):
+    """Bundle the current release of each of the given plugins."""
+    # Get each plugin's current release
+    releases = {}
+    for plugin_name in plugin_names:
+
+        # Was an invalid plugin name given?
+        if plugin_name not in plugin_list:
+            print(
+                f'Invalid plugin name "{plugin_name}"',
+            )
+            return
+
+        # Does the plugin not have a release for its current version?
+        version = get_plugin_version(plugin_name)
+        zip_path = get_release_path(plugin_name, version)
+        if version is None or not zip_path.is_file():
+            print(
+                f'No release found for "{plugin_name}" version "{version}".',
+            )
+            return
+
+        releases[plugin_name] = (version, zip_path)
+
+    # Get the bundle's location
+    bundle_path = RELEASE_DIR.joinpath(
+        "bundles", f"bundle - {strftime('%Y%m%d-%H%M%S')}.zip",
+    )
+    bundle_path.parent.makedirs_p()
+
+    # Write the bundle to a temporary name until it is complete
+    temp = get_temp_path(bundle_path)
+    with span("bundle", plugins=len(releases)) as phase:
+        problems = write_bundle(temp, releases)
+        phase.add(bytes_written=temp.size)
+
+    # Were there any problems with the bundle?
+    if problems:
+        temp.remove()
+        print(
+            "Failed to create bundle:\n"
+            + "\n".join(f"\t{problem}" for problem in problems),
+        )
+        return
+    move_into_place(temp, bundle_path)
+
+    # Print a message that everything was successful
+    print(f"Successfully created bundle of {len(releases)} plugins:")
+    print(f'\t"{bundle_path}"\n\n')
+
+
+# =============================================================================
+# >> CALL MAIN FUNCTION
+# =============================================================================
+if __name__ == "__main__":
+
+    # Get the plugins to bundle
+    _plugin_names = get_plugin("bundle")
+
+    # Clear the screen
+    clear_screen()
+
+    # Bundle the chosen plugins
+    if _plugin_names:
+        create_bundle(_plugin_names)
@@ -5,49 +5,33 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
-# Python
-from os import system
-
 # Package
-from common.constants import START_DIR, plugin_list
-from common.functions import clear_screen, get_plugin
-
-
-# =============================================================================
-# >> MAIN FUNCTION
-# =============================================================================
-def check_plugin(plugin_name):
-    """Check the given plugin for standards issues."""
-    # Was an invalid plugin name given?
-    if plugin_name not in plugin_list:
-        print(
-            f'Invalid plugin name "{plugin_name}"',
-        )
-        return
-
-    # Get the plugin's path
-    plugin_path = START_DIR.joinpath(
-        plugin_name, "addons", "source-python", "plugins",
-        "gungame", "plugins", "custom", plugin_name,
-    )
-    system(
-        f"ruff check {plugin_path}",
-    )
-
+from checks.checker import check_hot_paths, check_plugin
+from common.dependencies import run_in_order
+from common.functions import clear_screen, get_plugin, get_plugin_list
+from common.journal import Journal
 
 # =============================================================================
 # >> CALL MAIN FUNCTION
 # =============================================================================
 if __name__ == "__main__":
 
-    # Get the plugin to check
-    _plugin_name = get_plugin("check")
-    if _plugin_name is not None:
-        clear_screen()
-        if _plugin_name == "ALL":
-            for _plugin_name in plugin_list:
-                print(f'Checking plugin "{_plugin_name}"')
-                check_plugin(_plugin_name)
-
-        else:
-            check_plugin(_plugin_name)
+    # Get the plugins to check
+    _plugin_names = get_plugin("check")
+    clear_screen()
+
+    # Resume the last check of the same plugins, if it was interrupted
+    _journal = Journal("check", _plugin_names)
+    if _journal.resumed:
+        print(f"Resuming the check started {_journal.started}\n")
+
+    # Check the plugins, after the plugins they import
+    run_in_order(check_plugin, _plugin_names, _journal)
+
+    # Check the callbacks of the plugins that use the hot_paths pass
+    _hot_path_plugins = [
+        x for x in _plugin_names
+        if "hot_paths" in get_plugin_list(x, "check_passes")
+    ]
+    if _hot_path_plugins:
+        check_hot_paths(_hot_path_plugins)
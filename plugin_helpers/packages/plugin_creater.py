@@ -9,6 +9,7 @@
 # Package
 from common.constants import AUTHOR, PREMADE_FILES_DIR, START_DIR, plugin_list
 from common.functions import clear_screen
+from common.metrics import current_span, measured
 from distutils.util import strtobool
 
 # =============================================================================
@@ -24,6 +25,7 @@ _directory_or_file = {
 # =============================================================================
 # >> MAIN FUNCTION
 # =============================================================================
+@measured("create")
 def create_plugin(plugin_name, **options):
     """Verify the plugin name and create its base directories/files."""
     # Was no plugin name provided?
@@ -181,11 +183,14 @@ def _copy_file(filepath):
 
         open_file.write(file_contents)
 
+    current_span().add(files=1, bytes_written=len(file_contents))
+
 
 def _create_file(filepath):
     if not filepath.parent.isdir():
         filepath.parent.makedirs()
     filepath.touch()
+    current_span().add(files=1)
 
 
 def _get_plugin_name():
@@ -0,0 +1,88 @@
+# ../plugin_deduplicator.py
+
+"""Reports the assets that are duplicated across plugins."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Package
+from artifacts.size_report import format_size
+from common.asset_store import (
+    find_duplicates,
+    get_compressed_blob,
+    update_store,
+)
+from common.constants import other_filetypes, plugin_list
+from common.functions import clear_screen, get_plugin
+
+
+# =============================================================================
+# >> MAIN FUNCTION
+# =============================================================================
+def report_duplicates(plugin_names):
+    """Print the assets the given plugins have more than one copy of."""
+    # Were any invalid plugin names given?
+    for plugin_name in plugin_names:
+        if plugin_name not in plugin_list:
+            print(
+                f'Invalid plugin name "{plugin_name}"',
+            )
+            return
+
+    # Find the assets with more than one copy
+    duplicates = find_duplicates(update_store(plugin_names))
+    if not duplicates:
+        print("No duplicate assets found.")
+        return
+
+    # Print each asset's copies, largest first
+    wasted_disk = wasted_release = 0
+    for asset, paths in sorted(
+        duplicates.items(), key=lambda item: -item[0].size * len(item[1]),
+    ):
+        extra_copies = len(paths) - 1
+        wasted_disk += asset.size * extra_copies
+
+        # Get the size the extra copies add to releases
+        released = sum(map(_is_released, paths))
+        if released > 1:
+            wasted_release += (
+                len(get_compressed_blob(asset.digest)[1]) * (released - 1)
+            )
+
+        print(f"{format_size(asset.size)} x {len(paths)} ({asset.digest}):")
+        for path in paths:
+            print(f"\t{path}")
+
+    print(
+        f"\nDisk used by duplicate copies: {format_size(wasted_disk)}\n"
+        f"Release size used by duplicate copies: {format_size(wasted_release)}",
+    )
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _is_released(path):
+    """Return whether the plugin's asset is included in its releases."""
+    name = path.split("/", 1)[1]
+    return any(
+        name.startswith(directory) and name.rsplit(".", 1)[-1] in extensions
+        for directory, extensions in other_filetypes.items()
+    )
+
+
+# =============================================================================
+# >> CALL MAIN FUNCTION
+# =============================================================================
+if __name__ == "__main__":
+
+    # Get the plugins to compare
+    _plugin_names = get_plugin("find duplicate assets for")
+
+    # Clear the screen
+    clear_screen()
+
+    # Report the chosen plugins' duplicate assets
+    if _plugin_names:
+        report_duplicates(_plugin_names)
@@ -0,0 +1,164 @@
+# ../plugin_deployer.py
+
+"""Deploys a plugin's current release to the configured servers."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from os import cpu_count
+from shutil import copyfileobj
+from zipfile import ZipFile
+from zlib import crc32
+
+# Package
+from common.constants import DEPLOY_DIRS, plugin_list
+from common.functions import (
+    clear_screen,
+    get_plugin,
+    get_plugin_version,
+    get_release_path,
+    get_temp_path,
+    move_into_place,
+)
+from common.locks import directory_lock
+from common.metrics import measured, span
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the chunk size to use when comparing files
+_CHUNK_SIZE = 1024 * 1024
+
+
+# =============================================================================
+# >> MAIN FUNCTION
+# =============================================================================
+@measured("deploy")
+def deploy_plugin(plugin_name):
+    """Extract the plugin's current release into every deploy directory."""
+    # Was an invalid plugin name given?
+    if plugin_name not in plugin_list:
+        print(
+            f'Invalid plugin name "{plugin_name}"',
+        )
+        return
+
+    # Are there no servers to deploy to?
+    if not DEPLOY_DIRS:
+        print("No DEPLOY_DIRECTORIES set in config.ini.")
+        return
+
+    # Get the plugin's current release
+    version = get_plugin_version(plugin_name)
+    zip_path = get_release_path(plugin_name, version)
+    if version is None or not zip_path.is_file():
+        print(
+            f'No release found for "{plugin_name}" version "{version}".',
+        )
+        return
+
+    # Sync the release into every server at the same time
+    workers = min(len(DEPLOY_DIRS), cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            partial(_sync_release, zip_path), DEPLOY_DIRS,
+        )
+
+        # Print the results for each server
+        print(f"Deployed {plugin_name} version {version}:")
+        for server_dir, (written, unchanged, size) in zip(
+            DEPLOY_DIRS, results, strict=True,
+        ):
+            print(
+                f'\t"{server_dir}": {written} files updated ({size} bytes), '
+                f"{unchanged} unchanged",
+            )
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _sync_release(zip_path, server_dir):
+    """Write the release members that differ from the server's files."""
+    written = unchanged = size = 0
+
+    # Each thread uses its own handle, as reads would otherwise interleave
+    #   Other processes deploying to the same server wait for this one.
+    with (
+        directory_lock(server_dir),
+        span("sync", server=server_dir) as phase,
+        ZipFile(zip_path) as zip_file,
+    ):
+        for info in zip_file.infolist():
+
+            # Is the member outside of the server's directory?
+            parts = info.filename.rstrip("/").split("/")
+            if info.filename.startswith("/") or ".." in parts:
+                continue
+
+            dest = server_dir.joinpath(*parts)
+
+            # Is the member a directory?
+            if info.is_dir():
+                dest.makedirs_p()
+                continue
+
+            # Is the file already up to date?
+            if _is_current(dest, info):
+                phase.add(bytes_read=info.file_size)
+                unchanged += 1
+                continue
+
+            dest.parent.makedirs_p()
+
+            # Write to a temporary name and move it into place
+            #   The temporary file is removed if the member cannot be read.
+            temp = get_temp_path(dest)
+            try:
+                with zip_file.open(info) as src, temp.open("wb") as open_file:
+                    copyfileobj(src, open_file, _CHUNK_SIZE)
+                move_into_place(temp, dest)
+            finally:
+                temp.remove_p()
+
+            written += 1
+            size += info.file_size
+
+        phase.add(files=written, bytes_written=size)
+
+    return written, unchanged, size
+
+
+def _is_current(dest, info):
+    """Return whether the file matches the member's size and CRC."""
+    # Do the sizes differ?
+    if not dest.is_file() or dest.size != info.file_size:
+        return False
+
+    # Compare the CRC of the file on disk
+    crc = 0
+    with dest.open("rb") as open_file:
+        for chunk in iter(lambda: open_file.read(_CHUNK_SIZE), b""):
+            crc = crc32(chunk, crc)
+    return crc == info.CRC
+
+
+# =============================================================================
+# >> CALL MAIN FUNCTION
+# =============================================================================
+if __name__ == "__main__":
+
+    # Get the plugins to deploy
+    _plugin_names = get_plugin("deploy")
+
+    # Clear the screen
+    clear_screen()
+
+    # Loop through the chosen plugins
+    for _plugin_name in _plugin_names:
+
+        # Deploy the current plugin
+        deploy_plugin(_plugin_name)
@@ -0,0 +1,74 @@
+# ../plugin_profiler.py
+
+"""Profiles the callbacks of plugins without a game server."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Package
+from common.constants import plugin_list
+from common.functions import clear_screen, get_plugin, get_plugin_setting
+from profiling.harness import (
+    create_stream,
+    format_profiles,
+    load_plugin,
+    profile_callbacks,
+)
+
+
+# =============================================================================
+# >> MAIN FUNCTION
+# =============================================================================
+def profile_plugin(plugin_name):
+    """Profile the given plugin's callbacks and return the success."""
+    # Was an invalid plugin name given?
+    if plugin_name not in plugin_list:
+        print(
+            f'Invalid plugin name "{plugin_name}"',
+        )
+        return False
+
+    # Import the plugin with the stub runtime
+    #   Any error can be raised by the plugin's own code.
+    try:
+        seconds, callbacks = load_plugin(plugin_name)
+    except Exception as e:  # noqa: BLE001
+        print(
+            f'Failed to import plugin "{plugin_name}": '
+            f"{type(e).__name__}: {e}\n",
+        )
+        return False
+
+    # Does the plugin not have any callbacks to profile?
+    print(
+        f'Profiling plugin "{plugin_name}"\n'
+        f"\tImported in {seconds * 1000:.1f} ms",
+    )
+    if not callbacks:
+        print("\tNo event or command callbacks found\n")
+        return True
+
+    # Send the plugin's callbacks a stream of events and commands
+    count = int(get_plugin_setting(plugin_name, "profile_calls", 1000))
+    stream = create_stream(callbacks, count)
+    print(
+        f"\tSent {count} synthetic events and commands\n"
+        + format_profiles(profile_callbacks(callbacks, stream)),
+    )
+    return True
+
+
+# =============================================================================
+# >> CALL MAIN FUNCTION
+# =============================================================================
+if __name__ == "__main__":
+
+    # Get the plugins to profile
+    _plugin_names = get_plugin("profile")
+
+    # Clear the screen
+    clear_screen()
+
+    # Profile the chosen plugins
+    for _plugin_name in _plugin_names:
+        profile_plugin(_plugin_name)
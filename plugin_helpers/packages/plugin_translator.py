@@ -0,0 +1,116 @@
+# ../plugin_translator.py
+
+"""Checks the translation files of plugins for problems."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from collections import defaultdict
+
+# Package
+from artifacts.translations import get_missing_languages, index_translations
+from common.constants import START_DIR, plugin_list
+from common.functions import clear_screen, get_plugin, get_plugin_list
+from common.metrics import span
+
+
+# =============================================================================
+# >> MAIN FUNCTION
+# =============================================================================
+def check_translations(plugin_names):
+    """Print the problems with the translations of the given plugins."""
+    # Were any invalid plugin names given?
+    for plugin_name in plugin_names:
+        if plugin_name not in plugin_list:
+            print(
+                f'Invalid plugin name "{plugin_name}"',
+            )
+            return
+
+    # Parse every plugin's translation files
+    with span("translations", plugins=len(plugin_names)) as phase:
+        index = index_translations(
+            {x: START_DIR / x for x in plugin_names},
+            {x: get_plugin_list(x, "translation_keep") for x in plugin_names},
+        )
+        phase.add(files=sum(len(x.files) for x in index.values()))
+
+    # Get the plugins that define each key within each category
+    definitions = defaultdict(list)
+    for plugin_name, translations in index.items():
+        for translation_file in translations.files:
+            for section in translation_file.sections:
+                definitions[translation_file.category, section.key].append(
+                    plugin_name,
+                )
+
+    # Print the problems found for each plugin
+    for plugin_name, translations in index.items():
+        problems = _get_problems(plugin_name, translations, definitions)
+        if not problems:
+            print(f'No translation problems found for "{plugin_name}"')
+            continue
+
+        print(f'Translation problems found for "{plugin_name}":')
+        for problem in problems:
+            print(f"\t{problem}")
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _get_problems(plugin_name, translations, definitions):
+    """Return the problems found within the plugin's translations."""
+    # Get the languages every key should have
+    languages = get_plugin_list(plugin_name, "translation_languages") or {
+        language for translation_file in translations.files
+        for section in translation_file.sections
+        for language in section.languages
+    }
+
+    problems = []
+    for translation_file in translations.files:
+        category = translation_file.category
+        problems.extend(
+            f'"{key}" is defined more than once in {category}'
+            for key in translation_file.duplicates
+        )
+        problems.extend(
+            f'"{section.key}" in {category} is also defined by '
+            + ", ".join(
+                x for x in definitions[category, section.key]
+                if x != plugin_name
+            )
+            for section in translation_file.sections
+            if len(set(definitions[category, section.key])) > 1
+        )
+        problems.extend(
+            f'"{key}" in {category} is missing: {", ".join(missing)}'
+            for key, missing in get_missing_languages(
+                translation_file, languages,
+            ).items()
+        )
+        problems.extend(
+            f'"{section.key}" in {category} is never used'
+            for section in translation_file.sections
+            if section.key in translations.unused
+        )
+
+    return problems
+
+
+# =============================================================================
+# >> CALL MAIN FUNCTION
+# =============================================================================
+if __name__ == "__main__":
+
+    # Get the plugins to check
+    _plugin_names = get_plugin("check the translations of")
+
+    # Clear the screen
+    clear_screen()
+
+    # Check the chosen plugins' translations together
+    if _plugin_names:
+        check_translations(_plugin_names)
@@ -0,0 +1,3 @@
+# ../profiling/__init__.py
+
+"""The profiling package runs plugins headlessly to measure their callbacks."""
@@ -0,0 +1,337 @@
+# ../profiling/harness.py
+
+"""Loads plugins with the stub runtime and profiles their callbacks.
+
+The stubs directory stands in for GunGame and the parts of Source.Python
+the premade plugin files use, so plugins can be imported on a system
+without a game server.  A synthetic stream of events and commands is then
+sent to the plugin's callbacks.  The stream is run once to time each call,
+and again with tracemalloc to measure each call's allocations, as tracing
+slows down every call.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import sys
+import tracemalloc
+from collections import defaultdict
+from importlib import import_module
+from random import Random
+from time import perf_counter, perf_counter_ns
+from typing import NamedTuple
+
+# Package
+from checks.modules import PLUGIN_PACKAGE, get_code_path
+from common.constants import plugin_list
+
+# Site-package
+from path import Path
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the directory of the stub runtime
+STUBS_DIR = Path(__file__).parent.parent / "stubs"
+
+# Store the premade modules GunGame imports along with a plugin
+_premade_modules = (
+    "custom_events", "commands", "configuration", "rules", "settings",
+    "sounds",
+)
+
+# Store the number of players the synthetic events are for
+_PLAYER_COUNT = 24
+
+# Store the weapons used by synthetic events
+_weapons = (
+    "ak47", "awp", "deagle", "glock", "hegrenade", "knife", "m4a1", "usp",
+)
+
+# Store the variables of common events, with a value of each one's type
+_event_variables = {
+    "player_death": {
+        "userid": 0, "attacker": 0, "assister": 0, "weapon": "",
+        "headshot": False,
+    },
+    "player_hurt": {
+        "userid": 0, "attacker": 0, "health": 0, "armor": 0, "weapon": "",
+        "dmg_health": 0, "dmg_armor": 0, "hitgroup": 0,
+    },
+    "player_spawn": {"userid": 0},
+    "player_team": {"userid": 0, "team": 0, "oldteam": 0, "disconnect": False},
+    "player_disconnect": {"userid": 0, "reason": "", "name": ""},
+    "weapon_fire": {"userid": 0, "weapon": ""},
+    "round_start": {"timelimit": 0, "fraglimit": 0, "objective": ""},
+    "round_end": {"winner": 0, "reason": 0, "message": ""},
+}
+
+# Store the variables of events that are not known
+_default_variables = {"userid": 0, "attacker": 0}
+
+# Store the variables that hold a player's userid
+_userid_variables = ("userid", "attacker", "assister", "leveler", "victim")
+
+# Store the values variables that hold a team number or weapon can have
+_variable_choices = {
+    "oldteam": (2, 3),
+    "team": (2, 3),
+    "weapon": _weapons,
+    "winner": (2, 3),
+}
+
+# Store how often each event is fired, relative to other callbacks
+_event_weights = {
+    "weapon_fire": 10,
+    "player_hurt": 5,
+    "player_death": 2,
+    "player_spawn": 2,
+}
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Callback(NamedTuple):
+    """Stores a callback of a plugin and what runs it."""
+
+    name: str
+    trigger: str
+    function: object
+    event_name: str | None
+    variables: dict | None
+
+
+class CallbackProfile(NamedTuple):
+    """Stores the latency and allocations of a callback's calls."""
+
+    name: str
+    trigger: str
+    calls: int
+    errors: int
+    error: str | None
+    nanoseconds: tuple
+    peak_bytes: int
+    retained_bytes: int
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def install_stubs():
+    """Make the stub runtime and every plugin in the workspace importable."""
+    if str(STUBS_DIR) not in sys.path:
+        sys.path.insert(0, str(STUBS_DIR))
+
+    custom = import_module(PLUGIN_PACKAGE)
+    for plugin_name in plugin_list:
+        path = str(get_code_path(plugin_name).parent)
+        if path not in custom.__path__:
+            custom.__path__.append(path)
+
+
+def load_plugin(plugin_name):
+    """Import the plugin and return the seconds taken and its callbacks.
+
+    The premade modules the plugin has (such as commands) are imported
+    too, as GunGame's plugin manager imports them itself.  Any error raised
+    by the plugin's own code is raised.
+    """
+    install_stubs()
+    package = f"{PLUGIN_PACKAGE}.{plugin_name}"
+    code_path = get_code_path(plugin_name)
+    start = perf_counter()
+    import_module(f"{package}.{plugin_name}")
+    for module in _premade_modules:
+        if (code_path / f"{module}.py").is_file():
+            import_module(f"{package}.{module}")
+    seconds = perf_counter() - start
+
+    # Import the callback registries only now, from the stub runtime
+    from events import event_callbacks  # noqa: PLC0415
+    from events.custom import CustomEvent  # noqa: PLC0415
+    from gungame.core.commands.registration import (  # noqa: PLC0415
+        command_callbacks,
+    )
+
+    # Get the variables of every custom event
+    variables = dict(_event_variables)
+    waiting = [CustomEvent]
+    while waiting:
+        event = waiting.pop()
+        waiting.extend(event.__subclasses__())
+        variables[event.get_name()] = {
+            x: y.default for x, y in event.get_variables().items()
+        }
+
+    callbacks = [
+        Callback(
+            _get_name(function, package), f"event {event_name}", function,
+            event_name, variables.get(event_name, _default_variables),
+        )
+        for event_name, functions in event_callbacks.items()
+        for function in functions
+        if _is_within(function, package)
+    ]
+    callbacks.extend(
+        Callback(
+            _get_name(function, package), f"command {command}", function,
+            None, None,
+        )
+        for command, function in command_callbacks.items()
+        if _is_within(function, package)
+    )
+    return seconds, callbacks
+
+
+def create_stream(callbacks, count, seed=0):
+    """Return a synthetic stream of calls to the given callbacks.
+
+    Each call is the index of the callback and the arguments to call it
+    with.  Events get values of their variables' types (with userids of up
+    to _PLAYER_COUNT players) and commands get a player's index.
+    """
+    rng = Random(seed)
+    weights = [_event_weights.get(x.event_name, 1) for x in callbacks]
+
+    # Import the event class only now, from the stub runtime
+    from events import GameEvent  # noqa: PLC0415
+
+    stream = []
+    for index in rng.choices(range(len(callbacks)), weights, k=count):
+        callback = callbacks[index]
+        if callback.event_name is None:
+            stream.append((index, (rng.randint(1, _PLAYER_COUNT),)))
+            continue
+
+        stream.append((
+            index,
+            (GameEvent(
+                callback.event_name,
+                **{
+                    name: _get_value(name, default, rng)
+                    for name, default in callback.variables.items()
+                },
+            ),),
+        ))
+    return stream
+
+
+def profile_callbacks(callbacks, stream):
+    """Run the stream and return the CallbackProfile of each callback."""
+    errors = defaultdict(list)
+    timings = defaultdict(list)
+    for index, args in stream:
+        start = perf_counter_ns()
+        error = _call(callbacks[index].function, args)
+        if error is None:
+            timings[index].append(perf_counter_ns() - start)
+        else:
+            errors[index].append(error)
+
+    # Run the stream again while tracing allocations
+    peaks = defaultdict(int)
+    retained = defaultdict(int)
+    tracemalloc.start()
+    for index, args in stream:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        _call(callbacks[index].function, args)
+        current, peak = tracemalloc.get_traced_memory()
+        peaks[index] = max(peaks[index], peak - before)
+        retained[index] += current - before
+    tracemalloc.stop()
+
+    return [
+        CallbackProfile(
+            callback.name, callback.trigger,
+            len(timings[index]) + len(errors[index]), len(errors[index]),
+            errors[index][0] if errors[index] else None,
+            tuple(sorted(timings[index])), peaks[index], retained[index],
+        )
+        for index, callback in enumerate(callbacks)
+    ]
+
+
+def format_profiles(profiles):
+    """Return the given callback profiles as a printable table."""
+    header = (
+        f"\t{'callback':<36}{'calls':>7}{'p50 us':>9}{'p99 us':>9}"
+        f"{'max us':>9}{'peak KB':>9}"
+    )
+    lines = [header]
+    for profile in sorted(
+        profiles, key=lambda x: -_get_percentile(x.nanoseconds, 0.99),
+    ):
+        lines.append(
+            f"\t{_shorten(profile.name, 36):<36}{profile.calls:>7}"
+            + "".join(
+                f"{_get_percentile(profile.nanoseconds, x) / 1000:>9.1f}"
+                for x in (0.5, 0.99, 1)
+            )
+            + f"{profile.peak_bytes / 1024:>9.1f}",
+        )
+        lines.append(f"\t  {profile.trigger}")
+        if profile.retained_bytes >= 1024:  # noqa: PLR2004
+            lines.append(
+                f"\t  retained {profile.retained_bytes / 1024:.1f} KB "
+                "across every call",
+            )
+        if profile.errors:
+            lines.append(
+                f"\t  {profile.errors} calls failed, first with "
+                f"{profile.error}",
+            )
+    return "\n".join(lines) + "\n"
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _is_within(function, package):
+    """Return whether the function was defined within the given package."""
+    module = getattr(function, "__module__", "")
+    return module == package or module.startswith(f"{package}.")
+
+
+def _get_name(function, package):
+    """Return the function's name, relative to the given package."""
+    module = function.__module__.removeprefix(f"{package}.")
+    return f"{module}.{function.__qualname__}"
+
+
+def _get_value(name, default, rng):
+    """Return a random value for the event variable."""
+    if name in _userid_variables:
+        return rng.randint(2, _PLAYER_COUNT + 1)
+    if name in _variable_choices:
+        return rng.choice(_variable_choices[name])
+    if isinstance(default, bool):
+        return rng.random() < 0.5  # noqa: PLR2004
+    if isinstance(default, str):
+        return f"{name}_{rng.randint(1, _PLAYER_COUNT)}"
+    if isinstance(default, float):
+        return rng.random() * 100
+    return rng.randint(0, 100)
+
+
+def _call(function, args):
+    """Call the function and return the error it raised, if any."""
+    try:
+        function(*args)
+    except Exception as e:  # noqa: BLE001
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+def _get_percentile(values, fraction):
+    """Return the given percentile of the sorted values."""
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def _shorten(text, width):
+    """Return the text, shortened from the start to fit the given width."""
+    return text if len(text) <= width else "..." + text[3 - width:]
@@ -0,0 +1,80 @@
+# ../stubs/events/__init__.py
+
+"""Stands in for Source.Python's events package outside of a server.
+
+Callbacks decorated with Event are stored in event_callbacks instead of
+being registered with the engine, and fire_event calls them directly.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from collections import defaultdict
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the callbacks of each event, by the event's name
+event_callbacks = defaultdict(list)
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Event:
+    """Registers the decorated function as a callback for the events."""
+
+    def __init__(self, *event_names):
+        """Store the names of the events to register the callback for."""
+        self.event_names = event_names
+        self.callback = None
+
+    def __call__(self, callback):
+        """Register the callback for each event and return the callback."""
+        self.callback = callback
+        for event_name in self.event_names:
+            event_callbacks[event_name].append(callback)
+        return callback
+
+
+class GameEvent:
+    """Stores the name and variables of a fired event."""
+
+    def __init__(self, name, **variables):
+        """Store the event's name and variables."""
+        self.name = name
+        self.variables = variables
+
+    def __getitem__(self, variable):
+        """Return the value of the given variable."""
+        return self.variables[variable]
+
+    def is_empty(self, variable):
+        """Return whether the event does not have the given variable."""
+        return variable not in self.variables
+
+    def get_bool(self, variable, default=False):  # noqa: FBT002
+        """Return the given variable as a bool."""
+        return bool(self.variables.get(variable, default))
+
+    def get_int(self, variable, default=0):
+        """Return the given variable as an int."""
+        return int(self.variables.get(variable, default))
+
+    def get_float(self, variable, default=0.0):
+        """Return the given variable as a float."""
+        return float(self.variables.get(variable, default))
+
+    def get_string(self, variable, default=""):
+        """Return the given variable as a string."""
+        return str(self.variables.get(variable, default))
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def fire_event(game_event):
+    """Call every callback registered for the given event."""
+    for callback in event_callbacks[game_event.name]:
+        callback(game_event)
@@ -0,0 +1,45 @@
+# ../stubs/events/custom.py
+
+"""Stands in for Source.Python's custom events."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Source.Python
+from events import GameEvent, fire_event
+from events.variable import CustomEventVariable
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class CustomEvent:
+    """A custom event, named after its class in lower case."""
+
+    def __init__(self, **variables):
+        """Store the event's variables, using the defaults for any not given."""
+        for name, variable in self.get_variables().items():
+            setattr(self, name, variables.get(name, variable.default))
+
+    @classmethod
+    def get_variables(cls):
+        """Return the event's variables, mapped by their name."""
+        return {
+            name: value for klass in reversed(cls.__mro__)
+            for name, value in vars(klass).items()
+            if isinstance(value, CustomEventVariable)
+        }
+
+    @classmethod
+    def get_name(cls):
+        """Return the name of the event."""
+        return cls.__name__.lower()
+
+    def fire(self):
+        """Call every callback registered for the event."""
+        fire_event(
+            GameEvent(
+                self.get_name(),
+                **{x: getattr(self, x) for x in self.get_variables()},
+            ),
+        )
@@ -0,0 +1,46 @@
+# ../stubs/events/variable.py
+
+"""Stands in for the variable types of Source.Python's custom events."""
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class CustomEventVariable:
+    """Stores the description and default value of a custom event variable."""
+
+    default = 0
+
+    def __init__(self, description=""):
+        """Store the variable's description."""
+        self.description = description
+
+
+class BoolVariable(CustomEventVariable):
+    """A bool variable of a custom event."""
+
+    default = False
+
+
+class ByteVariable(CustomEventVariable):
+    """A byte variable of a custom event."""
+
+
+class ShortVariable(CustomEventVariable):
+    """A short variable of a custom event."""
+
+
+class LongVariable(CustomEventVariable):
+    """A long variable of a custom event."""
+
+
+class FloatVariable(CustomEventVariable):
+    """A float variable of a custom event."""
+
+    default = 0.0
+
+
+class StringVariable(CustomEventVariable):
+    """A string variable of a custom event."""
+
+    default = ""
@@ -0,0 +1,3 @@
+# ../stubs/gungame/__init__.py
+
+"""Stands in for GunGame, so plugins can be imported outside of a server."""
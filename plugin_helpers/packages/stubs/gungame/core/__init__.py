@@ -0,0 +1,3 @@
+# ../stubs/gungame/core/__init__.py
+
+"""Stands in for GunGame's core package."""
@@ -0,0 +1,3 @@
+# ../stubs/gungame/core/commands/__init__.py
+
+"""Stands in for GunGame's commands package."""
@@ -0,0 +1,21 @@
+# ../stubs/gungame/core/commands/registration.py
+
+"""Stands in for GunGame's command registration."""
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the callback of each command, by the command's name
+command_callbacks = {}
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def register_command_callback(command, translation):
+    """Register the decorated function as the command's callback."""
+    def decorator(callback):
+        callback.translation = translation
+        command_callbacks[command] = callback
+        return callback
+    return decorator
@@ -0,0 +1,3 @@
+# ../stubs/gungame/core/config/__init__.py
+
+"""Stands in for GunGame's config package."""
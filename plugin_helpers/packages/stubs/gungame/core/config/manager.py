@@ -0,0 +1,85 @@
+# ../stubs/gungame/core/config/manager.py
+
+"""Stands in for GunGame's config manager, without writing any files."""
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class ConVar:
+    """Stores the value of a console variable."""
+
+    def __init__(self, name, value=""):
+        """Store the variable's name and value."""
+        self.name = name
+        self.value = value
+
+    def get_bool(self):
+        """Return the value as a bool."""
+        return bool(self.get_int())
+
+    def get_int(self):
+        """Return the value as an int."""
+        return int(float(self.value or 0))
+
+    def get_float(self):
+        """Return the value as a float."""
+        return float(self.value or 0)
+
+    def get_string(self):
+        """Return the value as a string."""
+        return str(self.value)
+
+    def set_string(self, value):
+        """Set the value."""
+        self.value = value
+
+    set_bool = set_int = set_float = set_string
+
+
+class _CvarManager(ConVar):
+    """Stores a console variable being added to a config file."""
+
+    def __init__(self, name, value="", description=""):
+        """Store the variable and prepare its config file text."""
+        super().__init__(name, value)
+        self.description = description
+        self.Default = value
+        self.Options = []
+        self.Notes = []
+
+    def __enter__(self):
+        """Return the variable, to add its text within a with statement."""
+        return self
+
+    def __exit__(self, *args):
+        """Finish adding the variable."""
+
+
+class GunGameConfigManager:
+    """Stores the console variables of a plugin's config file."""
+
+    def __init__(self, name, cvar_prefix=""):
+        """Store the config's name and the prefix of its variables."""
+        self.name = name
+        self.cvar_prefix = cvar_prefix
+        self.cvars = {}
+
+    def __enter__(self):
+        """Return the config, to add its variables within a with statement."""
+        return self
+
+    def __exit__(self, *args):
+        """Finish the config, which is not written to a file."""
+
+    def cvar(self, name, default="", description="", *_args, **_kwargs):
+        """Add a console variable to the config and return it."""
+        name = self.cvar_prefix + name
+        self.cvars[name] = _CvarManager(name, default, description)
+        return self.cvars[name]
+
+    def section(self, *_args, **_kwargs):
+        """Add a section header to the config's text."""
+
+    def text(self, *_args, **_kwargs):
+        """Add text to the config."""
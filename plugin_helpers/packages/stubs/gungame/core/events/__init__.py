@@ -0,0 +1,3 @@
+# ../stubs/gungame/core/events/__init__.py
+
+"""Stands in for GunGame's events package."""
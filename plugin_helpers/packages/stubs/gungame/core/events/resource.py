@@ -0,0 +1,15 @@
+# ../stubs/gungame/core/events/resource.py
+
+"""Stands in for GunGame's event resource files, without writing them."""
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class GGResourceFile:
+    """Stores the custom events of a plugin's resource file."""
+
+    def __init__(self, file_path, *events):
+        """Store the file's name and events."""
+        self.file_path = file_path
+        self.events = events
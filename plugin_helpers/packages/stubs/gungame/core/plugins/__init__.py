@@ -0,0 +1,3 @@
+# ../stubs/gungame/core/plugins/__init__.py
+
+"""Stands in for GunGame's plugins package."""
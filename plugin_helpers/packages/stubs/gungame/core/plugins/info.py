@@ -0,0 +1,31 @@
+# ../stubs/gungame/core/plugins/info.py
+
+"""Stands in for GunGame's plugin information."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from sys import modules
+
+# Site-package
+from configobj import ConfigObj
+from path import Path
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class GunGamePluginInfo:
+    """Stores the values of the plugin's info.ini file."""
+
+    def __init__(self, module_name):
+        """Read the info.ini file next to the given module."""
+        self.name = module_name.split(".")[-2]
+        self.verbose_name = self.name
+        self.author = self.description = self.version = self.url = ""
+
+        info_file = Path(modules[module_name].__file__).parent / "info.ini"
+        if info_file.is_file():
+            for key, value in ConfigObj(info_file).items():
+                setattr(self, key, value)
@@ -0,0 +1,3 @@
+# ../stubs/gungame/core/rules/__init__.py
+
+"""Stands in for GunGame's rules package."""
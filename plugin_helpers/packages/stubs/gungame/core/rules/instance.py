@@ -0,0 +1,23 @@
+# ../stubs/gungame/core/rules/instance.py
+
+"""Stands in for GunGame's plugin rules."""
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class GunGameRules(dict):
+    """Stores the rules of a plugin, by their name."""
+
+    def __init__(self, plugin_name):
+        """Store the plugin's name."""
+        super().__init__()
+        self.plugin_name = plugin_name
+
+    def register_rule(self, name, value, variables=None):
+        """Add the rule."""
+        self[name] = (value, variables or {})
+
+    def unregister_rule(self, name):
+        """Remove the rule."""
+        self.pop(name, None)
@@ -0,0 +1,21 @@
+# ../stubs/gungame/core/rules/strings.py
+
+"""Stands in for GunGame's rules translations."""
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _Translations(dict):
+    """Returns the name of any translation that was not added."""
+
+    def __missing__(self, key):
+        """Return the key, as no translation files are read."""
+        return key
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the translations used by rules
+rules_translations = _Translations()
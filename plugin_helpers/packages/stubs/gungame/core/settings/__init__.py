@@ -0,0 +1,50 @@
+# ../stubs/gungame/core/settings/__init__.py
+
+"""Stands in for GunGame's player settings, using each default value."""
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _Setting:
+    """Stores the default value of a player setting."""
+
+    def __init__(self, name, default, text=None):
+        """Store the setting's name, default value, and text."""
+        self.name = name
+        self.default = default
+        self.text = text
+
+    def get_setting(self, _index):
+        """Return the player's value, which is always the default."""
+        return self.default
+
+
+class _SettingsSection(dict):
+    """Stores the settings and subsections of a settings section."""
+
+    def __init__(self, name, text=None):
+        """Store the section's name and text."""
+        super().__init__()
+        self.name = name
+        self.text = text
+
+    def add_section(self, name, text=None):
+        """Add a subsection and return it."""
+        self[name] = _SettingsSection(name, text)
+        return self[name]
+
+    def add_setting(self, name, default, text=None, *_args, **_kwargs):
+        """Add a setting and return it."""
+        self[name] = _Setting(name, default, text)
+        return self[name]
+
+    add_bool_setting = add_float_setting = add_int_setting = add_setting
+    add_string_setting = add_setting
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the section every plugin adds its player settings to
+gungame_player_settings = _SettingsSection("gungame")
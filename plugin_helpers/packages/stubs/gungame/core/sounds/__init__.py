@@ -0,0 +1,3 @@
+# ../stubs/gungame/core/sounds/__init__.py
+
+"""Stands in for GunGame's sounds package."""
@@ -0,0 +1,29 @@
+# ../stubs/gungame/core/sounds/manager.py
+
+"""Stands in for GunGame's sound manager, without playing any sounds."""
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _SoundManager(dict):
+    """Stores the default sound of each registered sound, by its name."""
+
+    def register_sound(self, sound_name, default):
+        """Register the sound."""
+        self[sound_name] = default
+
+    def play_sound(self, sound_name, *_users):
+        """Play the sound, which only checks that it was registered."""
+        return self[sound_name]
+
+    def stop_sound(self, sound_name, *_users):
+        """Stop the sound, which only checks that it was registered."""
+        return self[sound_name]
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Store the manager every plugin registers its sounds with
+sound_manager = _SoundManager()
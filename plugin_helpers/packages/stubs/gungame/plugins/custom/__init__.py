@@ -0,0 +1,7 @@
+# ../stubs/gungame/plugins/custom/__init__.py
+
+"""Holds the custom plugins being profiled.
+
+The profiler adds each plugin's custom directory from the workspace to
+this package's __path__, so plugins import as they would on a server.
+"""
@@ -17,6 +17,15 @@ if exist %STARTDIR%\config.ini (
     copy plugin_helpers\windows\config.ini config.ini
 )
 
+:: Does the plugin settings file not exist?
+if not exist %STARTDIR%\plugin_settings.ini (
+
+    echo Creating plugin_settings.ini file.  Set values to your specifications.
+
+    :: Copy the default plugin settings
+    copy plugin_helpers\plugin_settings.ini plugin_settings.ini
+)
+
 echo.
 echo.
 
@@ -13,6 +13,14 @@ else
 
 fi
 
+# Does the plugin settings file already exist?
+if [ ! -f $STARTDIR/plugin_settings.ini ]; then
+
+    echo Creating plugin_settings.ini file.  Set values to your specifications.
+    cp plugin_helpers/plugin_settings.ini plugin_settings.ini
+
+fi
+
 echo ""
 echo ""
 